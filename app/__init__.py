@@ -3,7 +3,8 @@ from flask_cors import CORS
 from flask_injector import FlaskInjector
 from injector import singleton
 
-from app.extensions import db, ma, api
+from app.extensions import api, db, entity_cache, facet_cache, ma, metrics, replicas, sql_instrumentation
+from app.utils.pool_metrics import use_instrumented_pool
 from config import config
 
 
@@ -13,36 +14,64 @@ def create_app(config_name="development"):
     if config_name == "development":
         app.config["DEBUG"] = True
 
+    use_instrumented_pool(app)
+    replicas.init_app(app)
     db.init_app(app)
     ma.init_app(app)
     api.init_app(app)
+    entity_cache.init_app(app)
+    facet_cache.init_app(app)
+    sql_instrumentation.init_app(app)
+    metrics.init_app(app)
     CORS(app)
 
+    from app.celery_app import celery_init_app
+
+    celery_init_app(app)
+
     from app.routes.companies import companies_blp
     from app.routes.jobs import jobs_blp
+    from app.routes.system import system_blp
 
     api.register_blueprint(jobs_blp)
     api.register_blueprint(companies_blp)
+    api.register_blueprint(system_blp)
 
     from app.utils.error_handlers import register_error_handlers
 
     register_error_handlers(app)
 
+    from app.cli import register_commands
+
+    register_commands(app)
+
     _configure_injector(app)
 
     return app
 
 
 def _configure_injector(app):
+    from app.repositories.company_deletion_repository import CompanyDeletionRepository
     from app.repositories.company_repository import CompanyRepository
     from app.repositories.job_repository import JobRepository
+    from app.repositories.job_stats_repository import JobStatsRepository
+    from app.repositories.partition_repository import PartitionRepository
     from app.services.company_service import CompanyService
     from app.services.job_service import JobService
+    from app.services.partition_service import PartitionService
+    from app.services.stats_service import StatsService
 
     def configure(binder):
         binder.bind(CompanyRepository, to=CompanyRepository, scope=singleton)
+        binder.bind(CompanyDeletionRepository, to=CompanyDeletionRepository, scope=singleton)
         binder.bind(JobRepository, to=JobRepository, scope=singleton)
+        binder.bind(JobStatsRepository, to=JobStatsRepository, scope=singleton)
+        binder.bind(PartitionRepository, to=PartitionRepository, scope=singleton)
         binder.bind(CompanyService, to=CompanyService, scope=singleton)
         binder.bind(JobService, to=JobService, scope=singleton)
+        binder.bind(StatsService, to=StatsService, scope=singleton)
+        binder.bind(PartitionService, to=PartitionService, scope=singleton)
 
-    FlaskInjector(app=app, modules=[configure])
+    flask_injector = FlaskInjector(app=app, modules=[configure])
+    # Lets code outside a request (Celery tasks, CLI commands) resolve services.
+    app.extensions["injector"] = flask_injector.injector
@@ -0,0 +1 @@
+# Entity caching between services and repositories
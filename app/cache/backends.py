@@ -0,0 +1,166 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class CacheBackend(ABC):
+    """Key/value store used by EntityCache.
+
+    Values are opaque bytes. Counters (``incr``/``get_counter``) back the
+    generation-based invalidation and must never be evicted, otherwise a
+    stale entry could become valid again. Invalidations reach only the
+    processes that share the backend's store.
+    """
+
+    @classmethod
+    def from_config(cls, config) -> "CacheBackend":
+        return cls()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    def get_counter(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def stats(self) -> Dict[str, int]:
+        return {}
+
+
+class NullCacheBackend(CacheBackend):
+    """Caches nothing; every lookup is a miss."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def incr(self, key):
+        return 0
+
+    def get_counter(self, key):
+        return 0
+
+    def clear(self):
+        pass
+
+
+class LRUCacheBackend(CacheBackend):
+    """In-process LRU with a size bound and a per-entry TTL.
+
+    Every process has its own copy. An invalidation reaches only the process
+    that made it: other API workers, and the API workers after a Celery task
+    writes, keep serving their entry until its TTL runs out.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # key -> (value, last touched); oldest touch first.
+        self._counters: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            max_size=config["ENTITY_CACHE_MAX_SIZE"],
+            ttl=config["ENTITY_CACHE_TTL"],
+        )
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            return self._touch_counter(key, 1)
+
+    def get_counter(self, key):
+        with self._lock:
+            return self._touch_counter(key)
+
+    def _touch_counter(self, key, increment: int = 0) -> int:
+        """Add ``increment`` to counter ``key`` and mark it used; returns its value.
+
+        Entries are stamped with a generation just before they are set, so
+        once a counter has been neither read nor bumped for two TTLs no
+        live entry carries it and it can start over from zero. Keeps the
+        counters bounded by the ids in recent use, not every id ever
+        invalidated. Call with the lock held.
+        """
+        now = time.monotonic()
+        value = self._counters.pop(key, (0, now))[0] + increment
+        self._counters[key] = (value, now)
+        horizon = now - 2 * self.ttl
+        while True:
+            oldest, (_, touched) = next(iter(self._counters.items()))
+            if touched >= horizon:
+                return value
+            del self._counters[oldest]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "counters": len(self._counters),
+            "max_size": self.max_size,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+BACKENDS = {
+    "lru": LRUCacheBackend,
+    "null": NullCacheBackend,
+}
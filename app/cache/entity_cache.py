@@ -0,0 +1,146 @@
+import pickle
+import threading
+from importlib import import_module
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from flask import current_app, has_app_context
+
+from app.cache.backends import BACKENDS, CacheBackend, NullCacheBackend
+from app.utils.replicas import use_primary
+
+Dependency = Tuple[str, int]
+
+
+def _load_backend_class(name: str):
+    if name in BACKENDS:
+        return BACKENDS[name]
+    module_name, _, class_name = name.partition(":")
+    return getattr(import_module(module_name), class_name)
+
+
+class EntityCache:
+    """Read-through cache of ORM entities keyed by (kind, id).
+
+    Each entry is a pickled snapshot of the entity (with its eager-loaded
+    relationships) stamped with the entity's ``version`` and with the
+    generation counters of the entity and everything it embeds. Writers
+    call ``invalidate``, which bumps the entity's generation; any entry
+    recorded under an older generation of itself or of a dependency is
+    treated as a miss. A company update therefore invalidates every cached
+    job that embeds that company without tracking which jobs those are.
+    """
+
+    def __init__(self, app=None):
+        self._null = NullCacheBackend()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend_class = _load_backend_class(app.config.get("ENTITY_CACHE_BACKEND", "null"))
+        app.extensions["entity_cache"] = {
+            "backend": backend_class.from_config(app.config),
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+        }
+
+    @property
+    def _state(self) -> Optional[dict]:
+        if not has_app_context():
+            return None
+        return current_app.extensions.get("entity_cache")
+
+    @property
+    def backend(self) -> CacheBackend:
+        state = self._state
+        return state["backend"] if state else self._null
+
+    @property
+    def enabled(self) -> bool:
+        return not isinstance(self.backend, NullCacheBackend)
+
+    def _count(self, counter: str) -> None:
+        state = self._state
+        if state is not None:
+            with self._lock:
+                state[counter] += 1
+
+    @staticmethod
+    def _key(kind: str, entity_id: int) -> str:
+        return f"{kind}:{entity_id}"
+
+    @staticmethod
+    def _generation_key(kind: str, entity_id: int) -> str:
+        return f"gen:{kind}:{entity_id}"
+
+    def _generation(self, kind: str, entity_id: int) -> int:
+        return self.backend.get_counter(self._generation_key(kind, entity_id))
+
+    def get_entry(self, kind: str, entity_id: int) -> Optional[dict]:
+        """Return the current (non-stale) entry for an entity, or None."""
+        raw = self.backend.get(self._key(kind, entity_id))
+        if raw is None:
+            return None
+        entry = pickle.loads(raw)
+        stamps = entry["generations"]
+        if any(self._generation(k, i) != gen for (k, i), gen in stamps.items()):
+            return None
+        return entry
+
+    def get_or_load(
+        self,
+        kind: str,
+        entity_id: int,
+        loader: Callable[[int], Any],
+        dependencies: Optional[Callable[[Any], Iterable[Dependency]]] = None,
+    ) -> Any:
+        """Return the entity from cache, merged into the current session, or load it."""
+        if not self.enabled:
+            return loader(entity_id)
+
+        from app.extensions import db
+
+        entry = self.get_entry(kind, entity_id)
+        if entry is not None:
+            self._count("hits")
+            return db.session.merge(pickle.loads(entry["payload"]), load=False)
+
+        self._count("misses")
+        generation = self._generation(kind, entity_id)
+        # An entry outlives any replica lag, so it is filled from the primary.
+        with use_primary():
+            entity = loader(entity_id)
+        if entity is not None:
+            stamps = {(kind, entity_id): generation}
+            for dep in dependencies(entity) if dependencies else ():
+                stamps[dep] = self._generation(*dep)
+            entry = {
+                "version": entity.version,
+                "generations": stamps,
+                "payload": pickle.dumps(entity),
+            }
+            self.backend.set(self._key(kind, entity_id), pickle.dumps(entry))
+        return entity
+
+    def invalidate(self, kind: str, entity_id: int) -> None:
+        """Drop an entity and make every entry embedding it stale."""
+        self.backend.incr(self._generation_key(kind, entity_id))
+        self.backend.delete(self._key(kind, entity_id))
+        self._count("invalidations")
+
+    def clear(self) -> None:
+        """Drop every entry, for bulk changes too broad to invalidate one by one."""
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        state = self._state or {"hits": 0, "misses": 0, "invalidations": 0}
+        lookups = state["hits"] + state["misses"]
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": state["hits"],
+            "misses": state["misses"],
+            "invalidations": state["invalidations"],
+            "hit_ratio": state["hits"] / lookups if lookups else 0.0,
+            **self.backend.stats(),
+        }
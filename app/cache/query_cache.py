@@ -0,0 +1,79 @@
+import pickle
+import threading
+from typing import Any, Callable, Hashable, Optional
+
+from flask import current_app, has_app_context
+
+from app.cache.backends import CacheBackend, LRUCacheBackend, NullCacheBackend
+
+
+class QueryCache:
+    """Short-lived read-through cache of aggregate query results.
+
+    Unlike EntityCache there is no invalidation: entries expire after
+    ``<PREFIX>_TTL`` seconds, which bounds how stale a result can be. Meant
+    for results that are expensive, requested repeatedly with the same
+    arguments and still useful when a few seconds old, such as search facet
+    counts. A TTL of 0 disables caching.
+    """
+
+    def __init__(self, name: str, config_prefix: str, app=None):
+        self.name = name
+        self.config_prefix = config_prefix
+        self._null = NullCacheBackend()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        ttl = app.config[f"{self.config_prefix}_TTL"]
+        backend = (
+            LRUCacheBackend(max_size=app.config[f"{self.config_prefix}_MAX_SIZE"], ttl=ttl)
+            if ttl > 0
+            else NullCacheBackend()
+        )
+        app.extensions[self.name] = {"backend": backend, "hits": 0, "misses": 0}
+
+    @property
+    def _state(self) -> Optional[dict]:
+        if not has_app_context():
+            return None
+        return current_app.extensions.get(self.name)
+
+    @property
+    def backend(self) -> CacheBackend:
+        state = self._state
+        return state["backend"] if state else self._null
+
+    def _count(self, counter: str) -> None:
+        state = self._state
+        if state is not None:
+            with self._lock:
+                state[counter] += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached result for ``key`` or compute and store it.
+
+        ``key`` must identify every input of ``compute``; its repr is the cache key.
+        """
+        cache_key = repr(key)
+        raw = self.backend.get(cache_key)
+        if raw is not None:
+            self._count("hits")
+            return pickle.loads(raw)
+        self._count("misses")
+        result = compute()
+        self.backend.set(cache_key, pickle.dumps(result))
+        return result
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        state = self._state or {"hits": 0, "misses": 0}
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": state["hits"],
+            "misses": state["misses"],
+            **self.backend.stats(),
+        }
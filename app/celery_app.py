@@ -0,0 +1,45 @@
+from celery import Celery, Task
+from flask import Flask
+
+
+def celery_init_app(app: Flask) -> Celery:
+    """Create the Celery app bound to ``app``; every task runs inside an app context."""
+
+    class FlaskTask(Task):
+        def __call__(self, *args, **kwargs):
+            with app.app_context():
+                return self.run(*args, **kwargs)
+
+    celery_app = Celery(app.name, task_cls=FlaskTask)
+    celery_app.conf.update(
+        broker_url=app.config["CELERY_BROKER_URL"],
+        result_backend=app.config["CELERY_RESULT_BACKEND"],
+        task_always_eager=app.config["CELERY_TASK_ALWAYS_EAGER"],
+        task_ignore_result=True,
+        beat_schedule=_beat_schedule(app),
+    )
+    celery_app.set_default()
+    app.extensions["celery"] = celery_app
+    return celery_app
+
+
+def _beat_schedule(app: Flask) -> dict:
+    schedule = {}
+    if app.config["JOB_STATS_REBUILD_INTERVAL"]:
+        # Corrects drift from job writes that bypass JobService (manual SQL, imports).
+        schedule["rebuild-job-stats"] = {
+            "task": "app.tasks.rebuild_job_stats",
+            "schedule": app.config["JOB_STATS_REBUILD_INTERVAL"],
+        }
+    if app.config["JOB_EXPIRY_SWEEP_INTERVAL"]:
+        schedule["expire-jobs"] = {
+            "task": "app.tasks.expire_jobs",
+            "schedule": app.config["JOB_EXPIRY_SWEEP_INTERVAL"],
+        }
+    if app.config["JOB_PARTITION_MAINTENANCE_INTERVAL"]:
+        # Months without a partition fill the default partition instead.
+        schedule["maintain-job-partitions"] = {
+            "task": "app.tasks.maintain_job_partitions",
+            "schedule": app.config["JOB_PARTITION_MAINTENANCE_INTERVAL"],
+        }
+    return schedule
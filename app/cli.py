@@ -0,0 +1,126 @@
+"""Flask CLI commands, e.g. ``flask stats rebuild`` (FLASK_APP set as in the README)."""
+import time
+from datetime import datetime, timedelta, timezone
+
+import click
+from flask import Flask, current_app
+from flask.cli import AppGroup, with_appcontext
+
+stats_cli = AppGroup("stats", help="Job statistics rollups.")
+jobs_cli = AppGroup("jobs", help="Job maintenance.")
+partitions_cli = AppGroup("partitions", help="Monthly job partitions and the archive tier.")
+
+
+@stats_cli.command("rebuild")
+def rebuild_stats() -> None:
+    """Recompute the statistics rollups from the job table (backfill)."""
+    from app.services.stats_service import StatsService
+
+    written = current_app.extensions["injector"].get(StatsService).rebuild()
+    for table, rows in written.items():
+        click.echo(f"{table}: {rows} rows")
+
+
+@jobs_cli.command("expire")
+def expire_jobs() -> None:
+    """Deactivate jobs past their expiry date now (what the scheduled sweeper does)."""
+    from app.services.job_service import JobService
+
+    result = current_app.extensions["injector"].get(JobService).expire_jobs()
+    click.echo(
+        f"Deactivated {result['deactivated']} jobs in {result['batches']} batches"
+        f" ({result['seconds']}s, {result['rows_per_sec']} rows/s)"
+    )
+
+
+@partitions_cli.command("list")
+def list_partitions() -> None:
+    """Show the monthly partitions of job and of archive.job."""
+    from app.repositories.partition_repository import PartitionRepository
+
+    repository = current_app.extensions["injector"].get(PartitionRepository)
+    for label, archived in (("job", False), ("archive.job", True)):
+        names = [name for name, _ in repository.find_partitions(archived=archived)]
+        click.echo(f"{label}: {', '.join(names) or '-'}")
+
+
+@partitions_cli.command("maintain")
+def maintain_partitions() -> None:
+    """Create partitions through JOB_PARTITION_MONTHS_AHEAD months ahead (also scheduled)."""
+    from app.services.partition_service import PartitionService
+
+    created = current_app.extensions["injector"].get(PartitionService).maintain()
+    click.echo(f"created: {', '.join(created) or 'none'}")
+
+
+@partitions_cli.command("archive")
+@click.option(
+    "--before",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Archive months ending on or before this date (default: JOB_ARCHIVE_AFTER_MONTHS months ago).",
+)
+@click.option("--yes", is_flag=True, help="Do not ask for confirmation.")
+def archive_partitions(before, yes) -> None:
+    """Detach old monthly partitions from job into archive.job."""
+    from app.services.partition_service import PartitionService, add_months, month_start
+    from app.services.stats_service import StatsService
+
+    if before is None:
+        this_month = month_start(datetime.now(timezone.utc).date())
+        before = add_months(this_month, -current_app.config["JOB_ARCHIVE_AFTER_MONTHS"])
+    else:
+        before = before.date()
+    if not yes:
+        click.confirm(f"Archive job partitions of months ending on or before {before}?", abort=True)
+    injector = current_app.extensions["injector"]
+    archived = injector.get(PartitionService).archive(before)
+    click.echo(f"archived: {', '.join(archived) or 'none'}")
+    if archived:
+        injector.get(StatsService).rebuild()
+        click.echo("statistics rollups rebuilt")
+
+
+@click.command("seed")
+@click.option("--companies", default=1000, show_default=True, help="Companies to add.")
+@click.option("--jobs", default=100_000, show_default=True, help="Jobs to add, spread over the new companies.")
+@click.option("--seed", "seed_value", default=42, show_default=True, help="Same seed, same rows.")
+@click.option(
+    "--as-of",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Postings fall in the year before this date (default: today, UTC).",
+)
+@click.option("--tail", default=1.16, show_default=True, help="Pareto shape of jobs per company; lower is more skewed.")
+@click.option("--truncate", is_flag=True, help="Delete all companies and jobs first.")
+@click.option("--yes", is_flag=True, help="Do not ask before truncating.")
+@with_appcontext
+def seed_command(companies, jobs, seed_value, as_of, tail, truncate, yes) -> None:
+    """Load synthetic companies and jobs with COPY (for load tests)."""
+    from app.extensions import db
+    from app.services.partition_service import PartitionService
+    from app.services.stats_service import StatsService
+    from app.utils import synthetic_data
+
+    if truncate and not yes:
+        click.confirm(f"Delete ALL companies and jobs in {db.engine.url.database}?", abort=True)
+    as_of = as_of.date() if as_of else datetime.now(timezone.utc).date()
+
+    # Postings fall in the year before as_of; give every month its partition.
+    current_app.extensions["injector"].get(PartitionService).ensure_partitions(as_of - timedelta(days=366), as_of)
+    started = time.perf_counter()
+    written = synthetic_data.load(companies, jobs, seed_value, as_of, truncate=truncate, tail=tail)
+    db.session.commit()
+    elapsed = time.perf_counter() - started
+    rows = sum(written.values())
+    click.echo(
+        f"company: {written['company']} rows, job: {written['job']} rows "
+        f"in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)"
+    )
+    current_app.extensions["injector"].get(StatsService).rebuild()
+    click.echo("statistics rollups rebuilt")
+
+
+def register_commands(app: Flask) -> None:
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(partitions_cli)
+    app.cli.add_command(seed_command)
@@ -10,13 +10,39 @@ class CompanyNotFoundException(Exception):
         self.company_id = company_id
 
 
+class CompanyDeletionNotFoundException(Exception):
+    def __init__(self, deletion_id: int):
+        super().__init__(f"Company deletion not found with id: {deletion_id}")
+        self.deletion_id = deletion_id
+
+
 class OptimisticLockException(Exception):
     pass
 
 
+class PreconditionFailedException(OptimisticLockException):
+    """The If-Match header names a version the resource no longer (or never) has."""
+
+
 class AuthenticationException(Exception):
     pass
 
 
 class InvalidFileException(Exception):
     pass
+
+
+class InvalidCursorException(Exception):
+    def __init__(self, cursor: str):
+        super().__init__(f"Invalid pagination cursor: {cursor}")
+        self.cursor = cursor
+
+
+class InvalidPayloadException(Exception):
+    pass
+
+
+class DuplicateCompanyException(Exception):
+    def __init__(self, name: str):
+        super().__init__(f"Company already exists with name: {name}")
+        self.name = name
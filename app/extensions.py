@@ -2,6 +2,20 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
 from flask_smorest import Api
 
-db = SQLAlchemy()
+from app.cache.entity_cache import EntityCache
+from app.cache.query_cache import QueryCache
+from app.utils.metrics import Metrics
+from app.utils.replicas import Replicas, RoutingSession
+from app.utils.sql_instrumentation import SqlInstrumentation
+
+# Instances stay usable after commit (no reload SELECT on next attribute access);
+# eager_defaults on the models keeps their state complete after a flush.
+# RoutingSession sends replica_read repository methods to SQLALCHEMY_REPLICAS.
+db = SQLAlchemy(session_options={"expire_on_commit": False, "class_": RoutingSession})
 ma = Marshmallow()
 api = Api()
+entity_cache = EntityCache()
+facet_cache = QueryCache("facet_cache", "FACET_CACHE")
+sql_instrumentation = SqlInstrumentation()
+metrics = Metrics()
+replicas = Replicas()
@@ -1,12 +1,27 @@
 from app.extensions import db
 from app.utils.datetime_utils import utc_now
 
+# Case- and whitespace-insensitive uniqueness key (see migrations/005_company_normalized_name.sql).
+NORMALIZED_NAME_SQL = r"lower(btrim(regexp_replace(name, '\s+', ' ', 'g')))"
+
+
+def normalized_name_expression(name):
+    """NORMALIZED_NAME_SQL applied to ``name``, as a SQL expression.
+
+    Names are normalized by Postgres only: a Python re-implementation
+    disagrees with it on non-ASCII whitespace and case folding.
+    """
+    return db.func.lower(db.func.btrim(db.func.regexp_replace(name, r"\s+", " ", "g")))
+
 
 class Company(db.Model):
     __tablename__ = "company"
 
     id = db.Column(db.BigInteger, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
+    normalized_name = db.Column(
+        db.String(255), db.Computed(NORMALIZED_NAME_SQL, persisted=True)
+    )
     description = db.Column(db.Text)
     website = db.Column(db.String(255))
     location = db.Column(db.String(255), nullable=False)
@@ -19,7 +34,16 @@ class Company(db.Model):
         back_populates="company",
         cascade="all, delete-orphan",
         lazy="dynamic",
+        # Jobs are removed by the job.company_id ON DELETE CASCADE, never loaded to be deleted.
+        passive_deletes=True,
+    )
+
+    __table_args__ = (
+        db.Index("uq_company_normalized_name", normalized_name, unique=True),
     )
+    # eager_defaults: server-generated values come back via RETURNING on flush,
+    # so saved instances need no refresh() round trip.
+    __mapper_args__ = {"version_id_col": version, "eager_defaults": True}
 
     def __repr__(self):
         return f"<Company(id={self.id}, name={self.name!r})>"
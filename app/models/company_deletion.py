@@ -0,0 +1,41 @@
+from app.extensions import db
+from app.models.enums import DeletionStatus
+from app.utils.datetime_utils import utc_now
+
+ACTIVE_STATUSES = (DeletionStatus.PENDING, DeletionStatus.RUNNING)
+
+
+class CompanyDeletion(db.Model):
+    """Progress of a background (chunked) company deletion.
+
+    Deliberately has no foreign key to company: the row outlives the
+    company it describes.
+    """
+
+    __tablename__ = "company_deletion"
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    company_id = db.Column(db.BigInteger, nullable=False)
+    status = db.Column(
+        db.Enum(DeletionStatus, native_enum=False, length=20),
+        default=DeletionStatus.PENDING,
+        nullable=False,
+    )
+    jobs_deleted = db.Column(db.Integer, default=0, nullable=False)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=utc_now, nullable=False)
+    updated_at = db.Column(db.DateTime, default=utc_now, onupdate=utc_now)
+    completed_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        # At most one pending/running deletion per company.
+        db.Index(
+            "uq_company_deletion_active",
+            company_id,
+            unique=True,
+            postgresql_where=status.in_([s.name for s in ACTIVE_STATUSES]),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<CompanyDeletion(id={self.id}, company_id={self.company_id}, status={self.status})>"
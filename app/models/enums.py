@@ -18,3 +18,10 @@ class RemoteOption(enum.Enum):
     REMOTE = "REMOTE"
     HYBRID = "HYBRID"
     ONSITE = "ONSITE"
+
+
+class DeletionStatus(enum.Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
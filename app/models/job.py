@@ -1,12 +1,19 @@
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
 from app.extensions import db
 from app.models.enums import ExperienceLevel, JobType, RemoteOption
+from app.models.migration_ddl import migration_ddl
 from app.utils.datetime_utils import utc_now
 
 
 class Job(db.Model):
     __tablename__ = "job"
 
-    id = db.Column(db.BigInteger, primary_key=True)
+    # The table is range-partitioned on posted_date, and a partitioned table's
+    # primary key must contain the partition key: (id, posted_date) in the
+    # database, id alone for the ORM (see __mapper_args__).
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=False)
     company_id = db.Column(
@@ -20,15 +27,48 @@ class Job(db.Model):
     job_type = db.Column(db.Enum(JobType), nullable=False)
     experience_level = db.Column(db.Enum(ExperienceLevel), nullable=False)
     remote_option = db.Column(db.Enum(RemoteOption), nullable=False)
-    posted_date = db.Column(db.DateTime, default=utc_now, nullable=False)
+    posted_date = db.Column(db.DateTime, default=utc_now, nullable=False, primary_key=True)
     expiry_date = db.Column(db.DateTime)
     is_active = db.Column(db.Boolean, default=True)
     application_url = db.Column(db.String(500))
     created_at = db.Column(db.DateTime, default=utc_now, nullable=False)
     updated_at = db.Column(db.DateTime, default=utc_now, onupdate=utc_now)
     version = db.Column(db.Integer, default=0, nullable=False)
+    # Maintained by database triggers (see migrations/003_job_search_vector.sql)
+    search_vector = db.deferred(db.Column(TSVECTOR))
 
     company = db.relationship("Company", back_populates="jobs")
 
+    # Mirrors migrations/009_job_active_feed_index.sql: the active-jobs feed
+    # (JobRepository.find_active_page) is answered by an index-only scan.
+    __table_args__ = (
+        db.Index(
+            "idx_job_active_feed",
+            posted_date.desc(),
+            id.desc(),
+            postgresql_include=[
+                "title", "company_id", "location", "salary_min", "salary_max", "job_type",
+                "experience_level", "remote_option", "expiry_date", "version", "updated_at",
+            ],
+            postgresql_where=is_active,
+        ),
+        {"postgresql_partition_by": "RANGE (posted_date)"},
+    )
+
+    # eager_defaults: server-generated values come back via RETURNING on flush,
+    # so saved instances need no refresh() round trip.
+    __mapper_args__ = {"primary_key": [id], "version_id_col": version, "eager_defaults": True}
+
     def __repr__(self):
         return f"<Job(id={self.id}, title={self.title!r})>"
+
+
+# Search-vector functions and triggers (migrations/003_job_search_vector.sql),
+# then the default partition, archive tier and partition functions
+# (migrations/010_job_partitioning.sql), for schemas built with create_all().
+for _migration in ("003_job_search_vector.sql", "010_job_partitioning.sql"):
+    event.listen(
+        Job.__table__,
+        "after_create",
+        migration_ddl(_migration).execute_if(dialect="postgresql"),
+    )
@@ -0,0 +1,58 @@
+from app.extensions import db
+from app.models.enums import ExperienceLevel
+
+
+# Rollups of the job table, maintained incrementally by JobStatsRepository and
+# rebuilt from scratch by ``flask stats rebuild``. Rows are keyed by company and
+# cascade with it, so deleting a company needs no further bookkeeping. Counters
+# are never deleted when they drop to zero; a rebuild removes such rows.
+
+
+class JobDailyStat(db.Model):
+    """Jobs posted per company and (UTC) day of posted_date."""
+
+    __tablename__ = "job_daily_stats"
+
+    company_id = db.Column(
+        db.BigInteger,
+        db.ForeignKey("company.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day = db.Column(db.Date, primary_key=True)
+    posted = db.Column(db.Integer, default=0, nullable=False)
+
+    __table_args__ = (db.Index("idx_job_daily_stats_day", day),)
+
+
+class CompanyJobStat(db.Model):
+    """Total and active (is_active) job counts per company."""
+
+    __tablename__ = "company_job_stats"
+
+    company_id = db.Column(
+        db.BigInteger,
+        db.ForeignKey("company.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    total_jobs = db.Column(db.Integer, default=0, nullable=False)
+    active_jobs = db.Column(db.Integer, default=0, nullable=False)
+
+
+class JobSalaryStat(db.Model):
+    """Histogram of active jobs' salary_min per company and experience level.
+
+    ``salary_bucket`` is the lower bound of a JOB_STATS_SALARY_BUCKET wide bucket.
+    """
+
+    __tablename__ = "job_salary_stats"
+
+    company_id = db.Column(
+        db.BigInteger,
+        db.ForeignKey("company.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    experience_level = db.Column(
+        db.Enum(ExperienceLevel, native_enum=False, length=50), primary_key=True
+    )
+    salary_bucket = db.Column(db.Numeric(10, 2), primary_key=True)
+    jobs = db.Column(db.Integer, default=0, nullable=False)
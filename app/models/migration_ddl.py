@@ -0,0 +1,31 @@
+"""DDL that SQLAlchemy cannot declare, read from the raw SQL migrations.
+
+Functions, triggers and partitions are defined once, in their migration,
+between ``-- create_all: begin`` and ``-- create_all: end`` lines. Models
+run those sections after create_all() builds their table (tests), so both
+schemas come from the same statements.
+"""
+from pathlib import Path
+
+from sqlalchemy import DDL
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+SECTION_BEGIN = "-- create_all: begin"
+SECTION_END = "-- create_all: end"
+
+
+def migration_ddl(filename: str) -> DDL:
+    """The create_all sections of ``migrations/<filename>``, in file order, as one DDL."""
+    sections, current = [], None
+    for line in (MIGRATIONS_DIR / filename).read_text().splitlines():
+        if line.strip() == SECTION_BEGIN:
+            current = []
+        elif line.strip() == SECTION_END and current is not None:
+            sections.append("\n".join(current))
+            current = None
+        elif current is not None:
+            current.append(line)
+    if current is not None or not sections:
+        raise ValueError(f"{filename} has no complete create_all section")
+    # DDL() formats its statement with %, so literal % signs are doubled.
+    return DDL("\n".join(sections).replace("%", "%%"))
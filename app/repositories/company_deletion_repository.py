@@ -0,0 +1,43 @@
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.company_deletion import ACTIVE_STATUSES, CompanyDeletion
+from app.repositories.unit_of_work import commit, rollback
+
+
+class CompanyDeletionRepository:
+    def find_by_id(self, deletion_id: int) -> Optional[CompanyDeletion]:
+        # Progress is written by a worker in another session; never serve a stale copy.
+        return db.session.get(CompanyDeletion, deletion_id, populate_existing=True)
+
+    def find_active(self, company_id: int) -> Optional[CompanyDeletion]:
+        result = db.session.execute(
+            select(CompanyDeletion).where(
+                CompanyDeletion.company_id == company_id,
+                CompanyDeletion.status.in_(ACTIVE_STATUSES),
+            )
+        )
+        return result.scalar_one_or_none()
+
+    def start(self, company_id: int) -> Tuple[CompanyDeletion, bool]:
+        """Return the company's active deletion, creating one if needed; second item is True if created."""
+        existing = self.find_active(company_id)
+        if existing is not None:
+            return existing, False
+        deletion = CompanyDeletion(company_id=company_id)
+        db.session.add(deletion)
+        try:
+            commit()
+        except IntegrityError:
+            # Lost a race against a concurrent request for the same company.
+            rollback()
+            return self.find_active(company_id), False
+        return deletion, True
+
+    def save(self, deletion: CompanyDeletion) -> CompanyDeletion:
+        db.session.add(deletion)
+        commit()
+        return deletion
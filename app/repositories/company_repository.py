@@ -1,29 +1,228 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import (
+    ARRAY,
+    String,
+    case,
+    cast,
+    delete,
+    exists,
+    func,
+    literal,
+    literal_column,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased, load_only
+from sqlalchemy.orm.util import identity_key
 
 from app.extensions import db
-from app.models.company import Company
+from app.models.company import Company, normalized_name_expression
+from app.repositories.pagination import SortKey, build_page, keyset_paginate
+from app.repositories.unit_of_work import commit, rollback
+from app.repositories.text_match import contains, fuzzy_match, set_similarity_threshold, suggest
+from app.utils.conditional import STAMP_FIELDS
+from app.utils.fieldsets import FieldSetPaths
+from app.utils.pagination import Page
+from app.utils.replicas import replica_read
+
+SORT_KEYS = {
+    "name": SortKey("name", Company.name, Company.id),
+    "-name": SortKey("-name", Company.name, Company.id, descending=True),
+    "created_at": SortKey("created_at", Company.created_at, Company.id),
+    "-created_at": SortKey("-created_at", Company.created_at, Company.id, descending=True),
+}
+
+# Core projection behind the fast list path (find_page(as_rows=True)).
+COMPANY_ROW_COLUMNS = tuple(
+    column for column in Company.__table__.c if column.key != "normalized_name"
+)
 
 
 class CompanyRepository:
+    @replica_read
     def find_all(self) -> List[Company]:
         result = db.session.execute(select(Company))
         return list(result.scalars().all())
 
+    @replica_read
+    def find_page(
+        self,
+        sort: str,
+        per_page: int,
+        cursor: Optional[str] = None,
+        location: Optional[str] = None,
+        fuzzy: bool = False,
+        similarity_threshold: Optional[float] = None,
+        as_rows: bool = False,
+        fieldset: FieldSetPaths = None,
+    ) -> Page:
+        """One keyset page of companies.
+
+        ``as_rows`` returns COMPANY_ROW_COLUMNS rows, not entities; a
+        ``fieldset`` narrows the SELECT to the columns it needs.
+        """
+        sort_key = SORT_KEYS[sort]
+        columns = COMPANY_ROW_COLUMNS
+        if fieldset is not None:
+            wanted = {*STAMP_FIELDS, sort_key.column.key, *fieldset}
+            columns = tuple(column for column in COMPANY_ROW_COLUMNS if column.key in wanted)
+        if as_rows:
+            stmt = select(*columns)
+        elif fieldset is not None:
+            stmt = select(Company).options(load_only(*(getattr(Company, column.key) for column in columns)))
+        else:
+            stmt = select(Company)
+        if location:
+            if fuzzy:
+                if similarity_threshold is not None:
+                    set_similarity_threshold(similarity_threshold)
+                stmt = stmt.where(fuzzy_match(Company.location, location))
+            else:
+                stmt = stmt.where(contains(Company.location, location))
+        stmt = keyset_paginate(stmt, sort_key, per_page, cursor)
+        result = db.session.execute(stmt)
+        companies = result.all() if as_rows else list(result.scalars().all())
+        return build_page(companies, sort_key, per_page)
+
+    def suggest_locations(self, term: str, limit: int, threshold: float) -> List[Tuple[str, float]]:
+        return suggest(Company.location, term, limit, threshold)
+
+    @replica_read
     def find_by_id(self, company_id: int) -> Optional[Company]:
         return db.session.get(Company, company_id)
 
+    def find_stamp(self, company_id: int) -> Optional[Tuple]:
+        """(id, version, updated_at) of a company, without loading the entity."""
+        row = db.session.execute(
+            select(Company.id, Company.version, Company.updated_at).where(Company.id == company_id)
+        ).first()
+        return tuple(row) if row else None
+
+    def find_existing_ids(self, company_ids) -> Set[int]:
+        if not company_ids:
+            return set()
+        return set(db.session.scalars(select(Company.id).where(Company.id.in_(company_ids))))
+
+    @replica_read
     def find_by_name(self, name: str) -> Optional[Company]:
-        result = db.session.execute(select(Company).where(Company.name == name))
+        """Look a company up by name, ignoring case and whitespace differences."""
+        result = db.session.execute(
+            select(Company).where(
+                Company.normalized_name == normalized_name_expression(literal(name, String))
+            )
+        )
         return result.scalar_one_or_none()
 
+    def normalize_names(self, names: List[str]) -> Dict[str, str]:
+        """Map each name to the normalized_name Postgres would store for it, in one round-trip."""
+        if not names:
+            return {}
+        submitted = func.unnest(cast(names, ARRAY(String))).table_valued("name")
+        rows = db.session.execute(
+            select(submitted.c.name, normalized_name_expression(submitted.c.name))
+        )
+        return dict(rows.all())
+
+    def upsert_many(self, rows: List[dict]) -> List[Tuple[int, str, bool]]:
+        """Insert or update companies keyed on normalized name in one statement.
+
+        ``rows`` must already be unique by normalized name (Postgres refuses to
+        update the same row twice in one INSERT ... ON CONFLICT). Missing
+        description/website keep their stored values, and version/updated_at
+        only move when a column actually changes. Returns
+        (id, normalized_name, inserted) per row.
+        """
+        stmt = insert(Company).values([{**row, "version": 1} for row in rows])
+        excluded = stmt.excluded
+        incoming = (
+            excluded.location,
+            func.coalesce(excluded.description, Company.description),
+            func.coalesce(excluded.website, Company.website),
+        )
+        changed = tuple_(Company.location, Company.description, Company.website).is_distinct_from(
+            tuple_(*incoming)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Company.normalized_name],
+            set_={
+                "location": incoming[0],
+                "description": incoming[1],
+                "website": incoming[2],
+                "version": case((changed, Company.version + 1), else_=Company.version),
+                "updated_at": case(
+                    (changed, func.timezone("utc", func.now())), else_=Company.updated_at
+                ),
+            },
+        ).returning(
+            Company.id,
+            Company.normalized_name,
+            # xmax is 0 for a freshly inserted tuple and set when ON CONFLICT updated it.
+            literal_column("xmax = 0").label("inserted"),
+        )
+        try:
+            result = [tuple(row) for row in db.session.execute(stmt)]
+            # Core DML bypasses the identity map; drop stale state of updated rows.
+            for company_id, _, inserted in result:
+                loaded = db.session.identity_map.get(identity_key(Company, company_id))
+                if loaded is not None and not inserted:
+                    db.session.expire(loaded)
+            commit()
+        except Exception:
+            rollback()
+            raise
+        return result
+
     def save(self, company: Company) -> Company:
         db.session.add(company)
-        db.session.commit()
-        db.session.refresh(company)
+        try:
+            commit()
+        except Exception:
+            rollback()
+            raise
         return company
 
+    def exists(self, company_id: int) -> bool:
+        return db.session.scalar(select(exists().where(Company.id == company_id)))
+
+    def update_versioned(
+        self, company_id: int, values: dict, expected_version: Optional[int] = None
+    ) -> Optional[Company]:
+        """Apply ``values`` and bump ``version`` in one UPDATE ... RETURNING.
+
+        Returns None when no row matched (missing company, or
+        ``expected_version`` is stale).
+        """
+        stmt = (
+            update(Company)
+            .where(Company.id == company_id)
+            .values(**values, version=Company.version + 1)
+        )
+        if expected_version is not None:
+            stmt = stmt.where(Company.version == expected_version)
+        # Selecting from the RETURNING CTE (rather than update().returning(Company))
+        # lets populate_existing refresh an instance already in the session.
+        updated = aliased(Company, stmt.returning(*Company.__table__.c).cte("updated_company"))
+        query = select(updated).execution_options(populate_existing=True)
+        try:
+            company = db.session.execute(query).scalar_one_or_none()
+            commit()
+        except Exception:
+            rollback()
+            raise
+        return company
+
+    def delete_by_id(self, company_id: int) -> int:
+        """Delete a company without loading it; its jobs go via ON DELETE CASCADE."""
+        result = db.session.execute(
+            delete(Company).where(Company.id == company_id),
+            execution_options={"synchronize_session": "fetch"},
+        )
+        commit()
+        return result.rowcount
+
     def delete(self, company: Company) -> None:
         db.session.delete(company)
-        db.session.commit()
+        commit()
@@ -1,19 +1,332 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import Row, and_, column, delete, exists, func, insert, literal, select, table, update
+from sqlalchemy.orm import aliased, contains_eager, joinedload, load_only
 
 from app.extensions import db
+from app.models.company import Company
+from app.models.enums import ExperienceLevel, JobType, RemoteOption
 from app.models.job import Job
+from app.repositories.pagination import (
+    SortKey,
+    build_page,
+    fetch_keyset_rows,
+    keyset_paginate,
+    keyset_segments,
+)
+from app.repositories.unit_of_work import commit, rollback
+from app.repositories.text_match import contains, fuzzy_match, set_similarity_threshold, suggest
+from app.utils.conditional import STAMP_FIELDS
+from app.utils.fieldsets import FieldSetPaths, includes, nested, top_level
+from app.utils.pagination import Page
+from app.utils.replicas import replica_read
+
+SORT_KEYS = {
+    "-posted_date": SortKey("-posted_date", Job.posted_date, Job.id, descending=True),
+    "posted_date": SortKey("posted_date", Job.posted_date, Job.id),
+    "-salary_min": SortKey("-salary_min", Job.salary_min, Job.id, descending=True, nulls_last=True),
+    "salary_min": SortKey("salary_min", Job.salary_min, Job.id, nulls_last=True),
+}
+
+# Columns of the company embedded in job responses (summary fields + stamp).
+COMPANY_SUMMARY_COLUMNS = ("id", "name", "location", "version", "updated_at")
+
+JOB_COLUMNS = tuple(column for column in Job.__table__.c if column.key != "search_vector")
+
+# Core projection behind the fast list path (find_page(as_rows=True)): every
+# job column but the search vector, plus the embedded company's columns
+# labelled "company__<name>" for the row serializer and response validators.
+JOB_COMPANY_ROW_COLUMNS = {
+    name: getattr(Company, name).label(f"company__{name}") for name in COMPANY_SUMMARY_COLUMNS
+}
+JOB_ROW_COLUMNS = (*JOB_COLUMNS, *JOB_COMPANY_ROW_COLUMNS.values())
+
+# archive.job (migrations/010_job_partitioning.sql): monthly partitions
+# detached from job, same columns. Not mapped; read as rows only.
+ARCHIVED_JOB = table("job", *(column(c.key, c.type) for c in JOB_COLUMNS), schema="archive")
+
+# The active-jobs feed projection: the key and INCLUDE columns of
+# idx_job_active_feed (see the Job model), so the feed never reads the heap.
+ACTIVE_FEED_COLUMNS = tuple(
+    Job.__table__.c[name]
+    for name in (
+        "id", "title", "company_id", "location", "salary_min", "salary_max", "job_type",
+        "experience_level", "remote_option", "posted_date", "expiry_date", "version", "updated_at",
+    )
+)
+
+
+def fieldset_columns(fieldset: FieldSetPaths, sort_key: SortKey) -> Tuple[Set[str], Set[str]]:
+    """Job and company column names needed to render a sparse fieldset.
+
+    The company set is empty when no company field is requested, so the
+    company need not be joined or loaded at all.
+    """
+    if fieldset is None:
+        return {column.key for column in JOB_COLUMNS}, set(COMPANY_SUMMARY_COLUMNS)
+    job_columns = {*STAMP_FIELDS, sort_key.column.key, *(top_level(fieldset) - {"company"})}
+    company_columns = set()
+    if includes(fieldset, "company"):
+        job_columns.add("company_id")
+        company_columns = {*STAMP_FIELDS, *(nested(fieldset, "company") or COMPANY_SUMMARY_COLUMNS)}
+    return job_columns, company_columns
+
+
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=25, MinWords=8, StartSel=<mark>, StopSel=</mark>"
+
+# Enum columns counted by search facets, keyed by their filter argument.
+FACET_COLUMNS = {
+    "job_type": Job.job_type,
+    "experience_level": Job.experience_level,
+    "remote_option": Job.remote_option,
+}
+
+
+class SearchHit:
+    def __init__(self, job: Job, rank: float, highlight: Optional[str] = None):
+        self.job = job
+        self.rank = rank
+        self.highlight = highlight
+
+
+def _band_label(lower: Optional[int], upper: Optional[int]) -> str:
+    if lower is None:
+        return f"<{upper}"
+    if upper is None:
+        return f"{lower}+"
+    return f"{lower}-{upper}"
+
+
+def _search_match(query: str):
+    return Job.search_vector.op("@@")(func.websearch_to_tsquery(SEARCH_CONFIG, query))
+
+
+def job_filter_clauses(
+    company_id: Optional[int] = None,
+    job_type: Optional[JobType] = None,
+    experience_level: Optional[ExperienceLevel] = None,
+    remote_option: Optional[RemoteOption] = None,
+    location: Optional[str] = None,
+    title: Optional[str] = None,
+    fuzzy: bool = False,
+) -> list:
+    clauses = []
+    match = fuzzy_match if fuzzy else contains
+    if location:
+        clauses.append(match(Job.location, location))
+    if title:
+        clauses.append(match(Job.title, title))
+    if company_id is not None:
+        clauses.append(Job.company_id == company_id)
+    if job_type is not None:
+        clauses.append(Job.job_type == job_type)
+    if experience_level is not None:
+        clauses.append(Job.experience_level == experience_level)
+    if remote_option is not None:
+        clauses.append(Job.remote_option == remote_option)
+    return clauses
 
 
 class JobRepository:
+    @replica_read
     def find_all(self) -> List[Job]:
         result = db.session.execute(
             select(Job).options(joinedload(Job.company))
         )
         return list(result.unique().scalars().all())
 
+    @replica_read
+    def find_page(
+        self,
+        sort: str,
+        per_page: int,
+        cursor: Optional[str] = None,
+        similarity_threshold: Optional[float] = None,
+        as_rows: bool = False,
+        fieldset: FieldSetPaths = None,
+        **filters,
+    ) -> Page:
+        """One keyset page of jobs with their companies.
+
+        With ``as_rows`` the page holds plain JOB_ROW_COLUMNS rows from a
+        join instead of ORM entities: no identity map, no relationship
+        loading, nothing to expire. A ``fieldset`` narrows the SELECT to
+        the columns it needs and drops the company join when no company
+        field is requested.
+        """
+        sort_key = SORT_KEYS[sort]
+        if filters.get("fuzzy") and similarity_threshold is not None:
+            set_similarity_threshold(similarity_threshold)
+        job_columns, company_columns = fieldset_columns(fieldset, sort_key)
+        if as_rows:
+            stmt = select(
+                *(column for column in JOB_COLUMNS if column.key in job_columns),
+                *(column for name, column in JOB_COMPANY_ROW_COLUMNS.items() if name in company_columns),
+            )
+            stmt = stmt.join_from(Job, Company) if company_columns else stmt.select_from(Job)
+        elif fieldset is None:
+            stmt = select(Job).options(joinedload(Job.company))
+        else:
+            options = [load_only(*(getattr(Job, name) for name in job_columns))]
+            if company_columns:
+                options.append(
+                    joinedload(Job.company).load_only(*(getattr(Company, name) for name in company_columns))
+                )
+            stmt = select(Job).options(*options)
+
+        def fetch(segment):
+            result = db.session.execute(segment)
+            return result.all() if as_rows else list(result.unique().scalars().all())
+
+        segments = keyset_segments(stmt.where(*job_filter_clauses(**filters)), sort_key, cursor)
+        return build_page(fetch_keyset_rows(segments, per_page, fetch), sort_key, per_page)
+
+    @replica_read
+    def find_active_page(self, per_page: int, cursor: Optional[str] = None) -> Page:
+        """One keyset page of active jobs, newest first, as ACTIVE_FEED_COLUMNS rows.
+
+        Predicate, order and columns are exactly those of the partial
+        covering index idx_job_active_feed: the page is an index-only range
+        scan (heap visits only for pages not yet marked all-visible by vacuum).
+        """
+        sort_key = SORT_KEYS["-posted_date"]
+        stmt = keyset_paginate(select(*ACTIVE_FEED_COLUMNS).where(Job.is_active), sort_key, per_page, cursor)
+        return build_page(db.session.execute(stmt).all(), sort_key, per_page)
+
+    @replica_read
+    def find_archived(self, job_id: int) -> Optional[Row]:
+        """An archived job as a JOB_ROW_COLUMNS row (job columns plus ``company__*``)."""
+        archived = ARCHIVED_JOB.c
+        stmt = (
+            select(*archived, *JOB_COMPANY_ROW_COLUMNS.values())
+            .join_from(ARCHIVED_JOB, Company, Company.id == archived.company_id)
+            .where(archived.id == job_id)
+        )
+        return db.session.execute(stmt).first()
+
+    def iter_all(self, batch_size: int) -> Iterator[Job]:
+        """Stream every job through a server-side cursor, ``batch_size`` rows at a time."""
+        stmt = (
+            select(Job)
+            .options(joinedload(Job.company))
+            .order_by(Job.id)
+            .execution_options(yield_per=batch_size)
+        )
+        yield from db.session.scalars(stmt)
+
+    @replica_read
+    def search(
+        self,
+        query: str,
+        page: int,
+        per_page: int,
+        highlight: bool = False,
+        similarity_threshold: Optional[float] = None,
+        **filters,
+    ) -> Tuple[List[SearchHit], int]:
+        """Rank matches with ts_rank; return one page of hits and the total match count.
+
+        The match, rank and total are computed in an inner query that only
+        touches the GIN index and the matching rows; the outer query joins the
+        page of ids back to job/company and builds highlight snippets for
+        those rows only.
+        """
+        if filters.get("fuzzy") and similarity_threshold is not None:
+            set_similarity_threshold(similarity_threshold)
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank(Job.search_vector, tsquery)
+        hits = (
+            select(Job.id, rank.label("rank"), func.count().over().label("total"))
+            .where(Job.search_vector.op("@@")(tsquery), *job_filter_clauses(**filters))
+            .order_by(rank.desc(), Job.id.desc())
+            .limit(per_page)
+            .offset((page - 1) * per_page)
+            .subquery()
+        )
+        snippet = (
+            func.ts_headline(SEARCH_CONFIG, Job.description, tsquery, HEADLINE_OPTIONS)
+            if highlight
+            else literal(None)
+        )
+        stmt = (
+            select(Job, hits.c.rank, hits.c.total, snippet)
+            .join(hits, Job.id == hits.c.id)
+            .options(joinedload(Job.company))
+            .order_by(hits.c.rank.desc(), hits.c.id.desc())
+        )
+        rows = db.session.execute(stmt).all()
+        if rows:
+            total = rows[0][2]
+        elif page > 1:
+            total = db.session.scalar(
+                select(func.count())
+                .select_from(Job)
+                .where(Job.search_vector.op("@@")(tsquery), *job_filter_clauses(**filters))
+            )
+        else:
+            total = 0
+        return [SearchHit(job, float(job_rank), text) for job, job_rank, _, text in rows], total
+
+    @replica_read
+    def facet_counts(
+        self,
+        query: str,
+        salary_bands: Sequence[int],
+        similarity_threshold: Optional[float] = None,
+        **filters,
+    ) -> Dict[str, List[dict]]:
+        """Count search matches per job type, experience level, remote option and salary band.
+
+        Every count is a ``count(*) FILTER (WHERE ...)`` aggregate over a
+        single scan of the matching rows. Each enum facet applies the other
+        facets' filters but not its own, so the counts show what choosing a
+        different value would return; salary bands apply all of them.
+        ``salary_bands`` are ascending salary_min boundaries.
+        """
+        if filters.get("fuzzy") and similarity_threshold is not None:
+            set_similarity_threshold(similarity_threshold)
+        selected = {name: filters.pop(name, None) for name in FACET_COLUMNS}
+
+        def other_facets(facet: Optional[str]) -> list:
+            return [
+                FACET_COLUMNS[name] == value
+                for name, value in selected.items()
+                if name != facet and value is not None
+            ]
+
+        buckets, aggregates = [], []
+        for facet, column in FACET_COLUMNS.items():
+            for member in column.type.enum_class:
+                buckets.append((facet, {"value": member.value}))
+                aggregates.append(func.count().filter(and_(column == member, *other_facets(facet))))
+        bounds = [None, *salary_bands, None]
+        for lower, upper in zip(bounds, bounds[1:]):
+            band = [Job.salary_min.is_not(None)]
+            if lower is not None:
+                band.append(Job.salary_min >= lower)
+            if upper is not None:
+                band.append(Job.salary_min < upper)
+            buckets.append(("salary_band", {"value": _band_label(lower, upper), "min": lower, "max": upper}))
+            aggregates.append(func.count().filter(and_(*band, *other_facets(None))))
+        buckets.append(("salary_band", {"value": "unspecified", "min": None, "max": None}))
+        aggregates.append(func.count().filter(and_(Job.salary_min.is_(None), *other_facets(None))))
+
+        stmt = select(*aggregates).where(_search_match(query), *job_filter_clauses(**filters))
+        counts = db.session.execute(stmt).one()
+        facets: Dict[str, List[dict]] = {name: [] for name in (*FACET_COLUMNS, "salary_band")}
+        for (facet, bucket), count in zip(buckets, counts):
+            facets[facet].append({**bucket, "count": count})
+        return facets
+
+    def suggest_values(
+        self, field: str, term: str, limit: int, threshold: float
+    ) -> List[Tuple[str, float]]:
+        column = {"location": Job.location, "title": Job.title}[field]
+        return suggest(column, term, limit, threshold)
+
+    @replica_read
     def find_by_id(self, job_id: int) -> Optional[Job]:
         result = db.session.execute(
             select(Job)
@@ -22,6 +335,19 @@ class JobRepository:
         )
         return result.unique().scalar_one_or_none()
 
+    def find_stamps(self, job_id: int) -> Optional[List[Tuple]]:
+        """(id, version, updated_at) of a job and its company, without loading either."""
+        row = db.session.execute(
+            select(
+                Job.id, Job.version, Job.updated_at,
+                Company.id, Company.version, Company.updated_at,
+            )
+            .join(Job.company)
+            .where(Job.id == job_id)
+        ).first()
+        return [tuple(row[:3]), tuple(row[3:])] if row else None
+
+    @replica_read
     def find_by_company_id(self, company_id: int) -> List[Job]:
         result = db.session.execute(
             select(Job)
@@ -30,12 +356,133 @@ class JobRepository:
         )
         return list(result.unique().scalars().all())
 
+    def count_for_company(self, company_id: int, limit: int) -> int:
+        """Number of the company's jobs, counting no further than ``limit``."""
+        capped = select(Job.id).where(Job.company_id == company_id).limit(limit).subquery()
+        return db.session.scalar(select(func.count()).select_from(capped))
+
+    def lock_chunk_for_company(self, company_id: int, limit: int) -> List[int]:
+        """Lock up to ``limit`` of the company's jobs; rows locked by others are skipped."""
+        return list(db.session.scalars(
+            select(Job.id)
+            .where(Job.company_id == company_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ))
+
+    def delete_many(self, job_ids: Sequence[int]) -> int:
+        """Delete ``job_ids`` in one statement; returns the number of rows deleted."""
+        if not job_ids:
+            return 0
+        result = db.session.execute(
+            delete(Job).where(Job.id.in_(job_ids)),
+            # "fetch" uses RETURNING on PostgreSQL: still one statement, and
+            # deleted jobs drop out of the identity map.
+            execution_options={"synchronize_session": "fetch"},
+        )
+        commit()
+        return result.rowcount
+
+    def lock_expired(self, now: datetime, limit: int) -> List[Tuple[int, datetime]]:
+        """Lock up to ``limit`` active jobs past their expiry date; rows locked by others are skipped.
+
+        Returns (id, posted_date) pairs, which let ``deactivate`` prune partitions.
+        """
+        return [tuple(row) for row in db.session.execute(
+            select(Job.id, Job.posted_date)
+            .where(Job.is_active.is_(True), Job.expiry_date <= now)
+            .order_by(Job.expiry_date, Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )]
+
+    def deactivate(self, jobs: Sequence[Tuple[int, datetime]], now: datetime) -> int:
+        """Mark ``jobs`` ((id, posted_date) pairs) inactive and bump their version in one UPDATE.
+
+        The posted_date range of the batch limits the UPDATE to the
+        partitions the batch spans; by id alone it would probe every one.
+        """
+        if not jobs:
+            return 0
+        posted = [posted_date for _, posted_date in jobs]
+        result = db.session.execute(
+            update(Job)
+            .where(
+                Job.id.in_([job_id for job_id, _ in jobs]),
+                Job.posted_date.between(min(posted), max(posted)),
+            )
+            .values(is_active=False, updated_at=now, version=Job.version + 1),
+            execution_options={"synchronize_session": "fetch"},
+        )
+        commit()
+        return result.rowcount
+
     def save(self, job: Job) -> Job:
         db.session.add(job)
-        db.session.commit()
-        db.session.refresh(job)
+        try:
+            commit()
+        except Exception:
+            rollback()
+            raise
+        return job
+
+    def save_all(self, jobs: List[Job]) -> List[Job]:
+        """Add several jobs in one flush (batched INSERT ... RETURNING)."""
+        db.session.add_all(jobs)
+        try:
+            commit()
+        except Exception:
+            rollback()
+            raise
+        return jobs
+
+    def insert_many(self, rows: List[dict]) -> List[int]:
+        """Insert ``rows`` in one transaction; return the new ids in input order.
+
+        Executed as batched multi-row INSERT ... RETURNING id (SQLAlchemy's
+        insertmanyvalues), so a chunk costs a handful of round trips rather
+        than one per row, and skips the identity map entirely.
+        """
+        stmt = insert(Job.__table__).returning(Job.id, sort_by_parameter_order=True)
+        try:
+            ids = list(db.session.scalars(stmt, rows))
+            commit()
+        except Exception:
+            rollback()
+            raise
+        return ids
+
+    def exists(self, job_id: int) -> bool:
+        return db.session.scalar(select(exists().where(Job.id == job_id)))
+
+    def update_versioned(
+        self, job_id: int, values: dict, expected_version: Optional[int] = None
+    ) -> Optional[Job]:
+        """Apply ``values`` and bump ``version`` in one statement; return the job with its company.
+
+        The UPDATE ... RETURNING runs as a CTE joined to company, so the
+        response payload needs no further SELECT. Returns None when no row
+        matched (missing job, or ``expected_version`` is stale).
+        """
+        stmt = update(Job).where(Job.id == job_id).values(**values, version=Job.version + 1)
+        if expected_version is not None:
+            stmt = stmt.where(Job.version == expected_version)
+        returned = [column for column in Job.__table__.c if column.key != "search_vector"]
+        updated = aliased(Job, stmt.returning(*returned).cte("updated_job"))
+        query = (
+            select(updated)
+            .join(updated.company)
+            .options(contains_eager(updated.company))
+            .execution_options(populate_existing=True)
+        )
+        try:
+            job = db.session.execute(query).unique().scalar_one_or_none()
+            commit()
+        except Exception:
+            rollback()
+            raise
         return job
 
     def delete(self, job: Job) -> None:
         db.session.delete(job)
-        db.session.commit()
+        commit()
@@ -0,0 +1,158 @@
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from flask import current_app
+from sqlalchemy import Date, cast, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+
+from app.extensions import db
+from app.models.enums import ExperienceLevel
+from app.models.job import Job
+from app.models.job_stats import CompanyJobStat, JobDailyStat, JobSalaryStat
+from app.repositories.unit_of_work import commit
+
+# Job columns the rollups are computed from; an update touching none of them
+# leaves every rollup unchanged.
+STATS_FIELDS = frozenset({"company_id", "posted_date", "is_active", "experience_level", "salary_min"})
+
+ROLLUP_MODELS = (JobDailyStat, CompanyJobStat, JobSalaryStat)
+
+
+class JobStatsRepository:
+    """Rollup tables of the job table (see app.models.job_stats).
+
+    Every rollup is defined once, in ``_rollups``, as an aggregate over a set
+    of job rows. ``rebuild`` inserts it over all jobs; ``add_jobs`` and
+    ``remove_jobs`` upsert it over just the jobs a write touches, adding
+    their counts (after an insert or update) or subtracting them (before an
+    update or delete). Incremental maintenance and rebuilds therefore share
+    the same SQL and cannot disagree.
+    """
+
+    def _rollups(self, jobs, sign: int = 1):
+        """(model, key columns, counter columns, aggregate query) per rollup of ``jobs``."""
+        width = current_app.config["JOB_STATS_SALARY_BUCKET"]
+        day = cast(jobs.c.posted_date, Date)
+        bucket = func.floor(jobs.c.salary_min / width) * width
+
+        def signed(count):
+            return count if sign > 0 else -count
+
+        # Grouped rows come out in key order, so concurrent upserts lock
+        # counter rows in a consistent order and cannot deadlock each other.
+        return [
+            (
+                JobDailyStat,
+                ["company_id", "day"],
+                ["posted"],
+                select(jobs.c.company_id, day, signed(func.count()))
+                .group_by(jobs.c.company_id, day)
+                .order_by(jobs.c.company_id, day),
+            ),
+            (
+                CompanyJobStat,
+                ["company_id"],
+                ["total_jobs", "active_jobs"],
+                select(
+                    jobs.c.company_id,
+                    signed(func.count()),
+                    signed(func.count().filter(jobs.c.is_active.is_(True))),
+                )
+                .group_by(jobs.c.company_id)
+                .order_by(jobs.c.company_id),
+            ),
+            (
+                JobSalaryStat,
+                ["company_id", "experience_level", "salary_bucket"],
+                ["jobs"],
+                select(jobs.c.company_id, jobs.c.experience_level, bucket, signed(func.count()))
+                .where(jobs.c.is_active.is_(True), jobs.c.salary_min.is_not(None))
+                .group_by(jobs.c.company_id, jobs.c.experience_level, bucket)
+                .order_by(jobs.c.company_id, jobs.c.experience_level, bucket),
+            ),
+        ]
+
+    @staticmethod
+    def _source(*criteria):
+        return select(
+            Job.company_id, Job.posted_date, Job.is_active, Job.experience_level, Job.salary_min
+        ).where(*criteria)
+
+    def add_jobs(self, job_ids: Sequence[int]) -> None:
+        """Count the current state of ``job_ids`` into the rollups."""
+        self._apply(job_ids, 1)
+
+    def remove_jobs(self, job_ids: Sequence[int]) -> None:
+        """Take the current state of ``job_ids`` out of the rollups."""
+        self._apply(job_ids, -1)
+
+    def _apply(self, job_ids: Sequence[int], sign: int) -> None:
+        if not job_ids:
+            return
+        # FOR UPDATE: the counted state must be the one the caller's write
+        # (UPDATE/DELETE) then replaces, not one a concurrent writer changes.
+        jobs = self._source(Job.id.in_(job_ids)).with_for_update().subquery("jobs")
+        for model, keys, counters, query in self._rollups(jobs, sign):
+            stmt = insert(model.__table__).from_select(keys + counters, query)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=keys,
+                set_={name: model.__table__.c[name] + stmt.excluded[name] for name in counters},
+            )
+            db.session.execute(stmt)
+        commit()
+
+    def rebuild(self) -> Dict[str, int]:
+        """Recompute every rollup from the job table; returns rows written per table.
+
+        Holds an EXCLUSIVE lock on the rollup tables until commit: reads go
+        on, but job writes wait for the rebuild instead of applying a delta
+        it has already counted (or is about to miss).
+        """
+        tables = ", ".join(model.__tablename__ for model in ROLLUP_MODELS)
+        db.session.execute(text(f"LOCK TABLE {tables} IN EXCLUSIVE MODE"))
+        written = {}
+        for model, keys, counters, query in self._rollups(self._source().subquery("jobs")):
+            db.session.execute(delete(model.__table__))
+            result = db.session.execute(insert(model.__table__).from_select(keys + counters, query))
+            written[model.__tablename__] = result.rowcount
+        commit()
+        return written
+
+    def postings_per_day(self, since: date, company_id: Optional[int] = None) -> List[Tuple[date, int]]:
+        return self._postings(JobDailyStat.day, since, company_id)
+
+    def postings_per_week(self, since: date, company_id: Optional[int] = None) -> List[Tuple[date, int]]:
+        """Postings per ISO week (keyed by its Monday), from days on or after ``since``."""
+        return self._postings(cast(func.date_trunc("week", JobDailyStat.day), Date), since, company_id)
+
+    def _postings(self, period, since: date, company_id: Optional[int]) -> List[Tuple[date, int]]:
+        query = select(period, func.sum(JobDailyStat.posted)).where(JobDailyStat.day >= since)
+        if company_id is not None:
+            query = query.where(JobDailyStat.company_id == company_id)
+        return [tuple(row) for row in db.session.execute(query.group_by(period).order_by(period))]
+
+    def job_counts(self, company_id: Optional[int] = None) -> Tuple[int, int]:
+        """(total, active) job counts, for one company or all."""
+        query = select(
+            func.coalesce(func.sum(CompanyJobStat.total_jobs), 0),
+            func.coalesce(func.sum(CompanyJobStat.active_jobs), 0),
+        )
+        if company_id is not None:
+            query = query.where(CompanyJobStat.company_id == company_id)
+        return tuple(db.session.execute(query).one())
+
+    def salary_histogram(
+        self, company_id: Optional[int] = None
+    ) -> List[Tuple[ExperienceLevel, Decimal, int]]:
+        """Non-empty (experience level, bucket lower bound, jobs) rows in ascending order."""
+        jobs = func.sum(JobSalaryStat.jobs)
+        query = select(JobSalaryStat.experience_level, JobSalaryStat.salary_bucket, jobs)
+        if company_id is not None:
+            query = query.where(JobSalaryStat.company_id == company_id)
+        query = (
+            query.group_by(JobSalaryStat.experience_level, JobSalaryStat.salary_bucket)
+            .having(jobs > 0)
+            .order_by(JobSalaryStat.experience_level, JobSalaryStat.salary_bucket)
+        )
+        return [tuple(row) for row in db.session.execute(query)]
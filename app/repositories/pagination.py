@@ -0,0 +1,133 @@
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy import Select, and_, tuple_
+
+from app.exceptions.custom_exceptions import InvalidCursorException
+from app.utils.pagination import Page, decode_cursor, encode_cursor
+
+
+class SortKey:
+    """A keyset sort order: ``column`` with ``id`` as the tie-breaker.
+
+    Both columns are ordered in the same direction so that a composite
+    ``(column, id)`` b-tree index can serve the sort in either direction and
+    the cursor predicate becomes a single index range condition. Rows whose
+    sort column is NULL cannot be ordered by a row comparison, so sorts over
+    nullable columns are declared with ``nulls_last``: rows with a value come
+    first, then the NULL rows ordered by ``id`` alone (see keyset_segments).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        column,
+        id_column,
+        descending: bool = False,
+        nulls_last: bool = False,
+    ):
+        self.name = name
+        self.column = column
+        self.id_column = id_column
+        self.descending = descending
+        self.nulls_last = nulls_last
+
+    def order_by(self):
+        if self.descending:
+            return self.column.desc(), self.id_column.desc()
+        return self.column.asc(), self.id_column.asc()
+
+    def id_order_by(self):
+        return self.id_column.desc() if self.descending else self.id_column.asc()
+
+    def after_id(self, row_id: int):
+        return self.id_column < row_id if self.descending else self.id_column > row_id
+
+    def after(self, value: Any, row_id: int):
+        # The plain bound on the column is implied by the row comparison, but
+        # only it lets Postgres prune partitions keyed on the column (job is
+        # partitioned by posted_date).
+        key = tuple_(self.column, self.id_column)
+        if self.descending:
+            return and_(self.column <= value, key < tuple_(value, row_id))
+        return and_(self.column >= value, key > tuple_(value, row_id))
+
+    def parse(self, raw: Any, cursor: str) -> Any:
+        if raw is None and self.nulls_last:
+            return None
+        python_type = self.column.type.python_type
+        try:
+            if python_type is datetime:
+                return datetime.fromisoformat(raw)
+            if python_type is Decimal:
+                return Decimal(raw)
+        except (TypeError, ValueError, InvalidOperation):
+            raise InvalidCursorException(cursor)
+        if not isinstance(raw, python_type):
+            raise InvalidCursorException(cursor)
+        return raw
+
+    def value_of(self, entity) -> Any:
+        return getattr(entity, self.column.key)
+
+
+def keyset_segments(stmt: Select, sort_key: SortKey, cursor: Optional[str] = None) -> List[Select]:
+    """Ordered statements whose results, concatenated, continue the listing after ``cursor``.
+
+    One statement for most sorts. A ``nulls_last`` sort has two segments:
+    the rows with a value, keyset-paged on (column, id), then the NULL rows,
+    keyset-paged on id. A cursor taken in the NULL segment skips the first.
+    """
+    value = row_id = None
+    if cursor:
+        raw_value, row_id = decode_cursor(cursor, sort_key.name)
+        value = sort_key.parse(raw_value, cursor)
+    if not sort_key.nulls_last:
+        if cursor:
+            stmt = stmt.where(sort_key.after(value, row_id))
+        return [stmt.order_by(*sort_key.order_by())]
+
+    nulls = stmt.where(sort_key.column.is_(None))
+    if cursor and value is None:
+        return [nulls.where(sort_key.after_id(row_id)).order_by(sort_key.id_order_by())]
+    present = stmt.where(sort_key.column.is_not(None))
+    if cursor:
+        present = present.where(sort_key.after(value, row_id))
+    return [present.order_by(*sort_key.order_by()), nulls.order_by(sort_key.id_order_by())]
+
+
+def keyset_paginate(
+    stmt: Select, sort_key: SortKey, per_page: int, cursor: Optional[str] = None
+) -> Select:
+    """Apply keyset ordering, the cursor predicate and a one-row lookahead limit.
+
+    For sorts with a single segment; ``nulls_last`` sorts go through fetch_keyset_rows.
+    """
+    (segment,) = keyset_segments(stmt, sort_key, cursor)
+    return segment.limit(per_page + 1)
+
+
+def fetch_keyset_rows(
+    segments: List[Select], per_page: int, fetch: Callable[[Select], List[Any]]
+) -> List[Any]:
+    """Up to ``per_page`` + 1 rows (the lookahead) from ``segments`` in order.
+
+    A later segment is queried only when the earlier ones run short.
+    """
+    rows: List[Any] = []
+    for segment in segments:
+        rows.extend(fetch(segment.limit(per_page + 1 - len(rows))))
+        if len(rows) > per_page:
+            break
+    return rows
+
+
+def build_page(rows: List[Any], sort_key: SortKey, per_page: int) -> Page:
+    """Trim the lookahead row and derive the next cursor from the last item."""
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor(sort_key.name, sort_key.value_of(last), last.id)
+    return Page(items=items, per_page=per_page, sort=sort_key.name, next_cursor=next_cursor)
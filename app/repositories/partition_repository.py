@@ -0,0 +1,61 @@
+import re
+from datetime import date
+from typing import List, Tuple
+
+from sqlalchemy import func, select, text
+
+from app.extensions import db
+from app.repositories.unit_of_work import commit, rollback
+
+MONTHLY_PARTITION = re.compile(r"job_p(\d{4})(\d{2})")
+
+# Monthly partitions of job and of archive.job, by name.
+PARTITIONS_SQL = text(
+    "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid"
+    " WHERE i.inhparent = CAST(:parent AS regclass) ORDER BY c.relname"
+)
+
+
+def partition_month(name: str) -> date:
+    year, month = MONTHLY_PARTITION.fullmatch(name).groups()
+    return date(int(year), int(month), 1)
+
+
+class PartitionRepository:
+    """Monthly range partitions of job (``job_pYYYYMM``) and the archive tier.
+
+    Partitions are created and archived by the SQL functions of
+    migrations/010_job_partitioning.sql, each call in its own transaction.
+    """
+
+    def find_partitions(self, archived: bool = False) -> List[Tuple[str, date]]:
+        """(name, month) of the monthly partitions of job, or of archive.job, oldest first."""
+        parent = "archive.job" if archived else "job"
+        names = db.session.scalars(PARTITIONS_SQL, {"parent": parent})
+        return [(name, partition_month(name)) for name in names if MONTHLY_PARTITION.fullmatch(name)]
+
+    def create_partition(self, month: date) -> bool:
+        """Create the partition for ``month``; False when it exists already (or was archived)."""
+        try:
+            created = db.session.scalar(select(func.job_create_partition(month)))
+            commit()
+        except Exception:
+            rollback()
+            raise
+        return created
+
+    def archive_partition(self, name: str, lock_timeout_ms: int) -> None:
+        """Detach partition ``name`` from job and attach it to archive.job.
+
+        DETACH needs an ACCESS EXCLUSIVE lock on job; ``lock_timeout_ms``
+        bounds how long job traffic can queue behind the wait for it.
+        """
+        try:
+            db.session.execute(
+                text("SELECT set_config('lock_timeout', :timeout, true)"), {"timeout": f"{lock_timeout_ms}ms"}
+            )
+            db.session.execute(select(func.job_archive_partition(name)))
+            commit()
+        except Exception:
+            rollback()
+            raise
@@ -0,0 +1,51 @@
+from typing import List, Tuple
+
+from sqlalchemy import func, select
+
+from app.extensions import db
+
+LIKE_ESCAPE = "\\"
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so user input only ever matches literally."""
+    return (
+        term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+
+
+def contains(column, term: str):
+    """Case-insensitive substring match; served by a gin_trgm_ops index."""
+    return column.ilike(f"%{escape_like(term)}%", escape=LIKE_ESCAPE)
+
+
+def fuzzy_match(column, term: str):
+    """pg_trgm word-similarity match (``term <% column``); tolerant of typos."""
+    return column.op("%>")(term)
+
+
+def set_similarity_threshold(threshold: float) -> None:
+    """SET LOCAL the cut-off used by the indexable ``%>`` operator for this transaction."""
+    db.session.execute(
+        select(func.set_config("pg_trgm.word_similarity_threshold", str(threshold), True))
+    )
+
+
+def suggest(column, term: str, limit: int, threshold: float) -> List[Tuple[str, float]]:
+    """Distinct values of ``column`` most similar to ``term``, best first.
+
+    Candidates are found through the trigram index with ``%>`` and then
+    scored with word_similarity().
+    """
+    set_similarity_threshold(threshold)
+    score = func.max(func.word_similarity(term, column)).label("score")
+    stmt = (
+        select(column, score)
+        .where(fuzzy_match(column, term))
+        .group_by(column)
+        .order_by(score.desc(), column)
+        .limit(limit)
+    )
+    return [(value, float(value_score)) for value, value_score in db.session.execute(stmt)]
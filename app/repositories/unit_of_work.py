@@ -0,0 +1,94 @@
+from functools import wraps
+from typing import Callable
+
+from flask import has_app_context
+
+from app.extensions import db
+
+_DEPTH = "unit_of_work_depth"
+_ON_COMMIT = "unit_of_work_on_commit"
+
+
+class UnitOfWork:
+    """One database transaction around a service operation.
+
+    While a unit of work is active, repository writes only flush (so ids
+    and server defaults come back through RETURNING) and the outermost
+    unit commits once when the block exits, or rolls everything back on
+    error. Nested units join the enclosing transaction; use ``savepoint()``
+    where part of the work may fail without abandoning the rest.
+
+        with UnitOfWork() as uow:
+            company = company_repository.save(company)
+            with uow.savepoint():
+                job_repository.save_all(jobs)
+    """
+
+    def __enter__(self) -> "UnitOfWork":
+        info = db.session.info
+        info[_DEPTH] = info.get(_DEPTH, 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        info = db.session.info
+        info[_DEPTH] -= 1
+        if info[_DEPTH] > 0:
+            return False
+        callbacks = info.pop(_ON_COMMIT, [])
+        if exc_type is not None:
+            db.session.rollback()
+            return False
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        for callback in callbacks:
+            callback()
+        return False
+
+    @staticmethod
+    def savepoint():
+        """SAVEPOINT context: an exception inside rolls back to it and propagates."""
+        return db.session.begin_nested()
+
+
+def transactional(func: Callable) -> Callable:
+    """Run a service method inside a UnitOfWork."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with UnitOfWork():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def in_unit_of_work() -> bool:
+    return has_app_context() and db.session.info.get(_DEPTH, 0) > 0
+
+
+def commit() -> None:
+    """Commit now, or only flush when an enclosing UnitOfWork will commit."""
+    if in_unit_of_work():
+        db.session.flush()
+    else:
+        db.session.commit()
+
+
+def rollback() -> None:
+    """Roll back now, unless an enclosing UnitOfWork owns the transaction."""
+    if not in_unit_of_work():
+        db.session.rollback()
+
+
+def on_commit(callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the current unit of work commits (immediately if none is active).
+
+    Used for side effects such as cache invalidation that must not run
+    before the data they describe is visible to other sessions.
+    """
+    if in_unit_of_work():
+        db.session.info.setdefault(_ON_COMMIT, []).append(callback)
+    else:
+        callback()
@@ -1,13 +1,33 @@
+from flask import current_app, url_for
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from injector import inject
 
 from app.schemas.company_schema import (
     CompanyCreateSchema,
+    CompanyDeleteArgsSchema,
+    CompanyDeletionSchema,
+    CompanyFieldsArgsSchema,
+    CompanyListArgsSchema,
     CompanySchema,
     CompanyUpdateSchema,
+    CompanyUpsertResultSchema,
 )
+from app.schemas.job_schema import CompanyWithJobsCreateSchema, CompanyWithJobsSchema
+from app.schemas.stats_schema import CompanyStatsSchema, StatsArgsSchema
+from app.schemas.suggestion_schema import SuggestArgsSchema, SuggestionSchema
 from app.services.company_service import CompanyService
+from app.services.stats_service import StatsService
+from app.utils.conditional import (
+    collection_validators,
+    entity_validators,
+    expected_version,
+    is_conditional,
+    not_modified,
+    stamp_of,
+)
+from app.utils.fast_json import rows_response, schema_response
+from app.utils.pagination import pagination_headers
 
 
 companies_blp = Blueprint(
@@ -24,10 +44,26 @@ class CompanyList(MethodView):
     def __init__(self, company_service: CompanyService):
         self.company_service = company_service
 
+    @companies_blp.arguments(CompanyListArgsSchema, location="query")
     @companies_blp.response(200, CompanySchema(many=True))
-    def get(self):
-        companies = self.company_service.get_all_companies()
-        return companies
+    def get(self, args):
+        """List companies; ``fields`` (e.g. ``id,name``) narrows both payload and query"""
+        fast = current_app.config["FAST_READ_PATH"]
+        fieldset = args.get("fieldset")
+        page = self.company_service.get_companies_page(as_rows=fast, **args)
+        validators = collection_validators(
+            [stamp_of(company) for company in page.items],
+            sorted(args.items()),
+            page.next_cursor,
+        )
+        if validators.matches():
+            return not_modified(validators)
+        headers = {**pagination_headers(page), **validators.headers}
+        if fast:
+            return rows_response(CompanySchema(only=fieldset), page.items), 200, headers
+        if fieldset:
+            return schema_response(CompanySchema(many=True, only=fieldset), page.items), 200, headers
+        return page.items, 200, headers
 
     @companies_blp.arguments(CompanyCreateSchema)
     @companies_blp.response(201, CompanySchema)
@@ -36,24 +72,110 @@ class CompanyList(MethodView):
         return company, 201
 
 
+@companies_blp.route("/with-jobs")
+class CompanyWithJobs(MethodView):
+    @inject
+    def __init__(self, company_service: CompanyService):
+        self.company_service = company_service
+
+    @companies_blp.arguments(CompanyWithJobsCreateSchema)
+    @companies_blp.response(201, CompanyWithJobsSchema)
+    def post(self, data, **_):
+        """Create a company together with its initial jobs in one transaction"""
+        return self.company_service.create_company_with_jobs(data), 201
+
+
+@companies_blp.route("/bulk")
+class CompanyBulk(MethodView):
+    @inject
+    def __init__(self, company_service: CompanyService):
+        self.company_service = company_service
+
+    @companies_blp.arguments(CompanyCreateSchema(many=True))
+    @companies_blp.response(200, CompanyUpsertResultSchema)
+    def put(self, companies, **_):
+        """Create or update companies by (normalized) name; returns the name-to-id mapping"""
+        return self.company_service.upsert_companies(companies)
+
+
+@companies_blp.route("/suggest")
+class CompanySuggest(MethodView):
+    @inject
+    def __init__(self, company_service: CompanyService):
+        self.company_service = company_service
+
+    @companies_blp.arguments(SuggestArgsSchema, location="query")
+    @companies_blp.response(200, SuggestionSchema(many=True))
+    def get(self, args):
+        """Suggest existing company locations similar to a (misspelled) term"""
+        return self.company_service.suggest_locations(**args)
+
+
 @companies_blp.route("/<int:company_id>")
 class CompanyDetail(MethodView):
     @inject
     def __init__(self, company_service: CompanyService):
         self.company_service = company_service
 
+    @companies_blp.arguments(CompanyFieldsArgsSchema, location="query")
     @companies_blp.response(200, CompanySchema)
-    def get(self, company_id):
+    def get(self, args, company_id):
+        if is_conditional():
+            validators = self.company_service.get_company_validators(company_id)
+            if validators.matches():
+                return not_modified(validators)
         company = self.company_service.get_company_by_id(company_id)
-        return company
+        headers = entity_validators(stamp_of(company)).headers
+        if args.get("fieldset"):
+            # The entity comes whole from the entity cache; only the payload is narrowed.
+            return schema_response(CompanySchema(only=args["fieldset"]), company), 200, headers
+        return company, 200, headers
 
     @companies_blp.arguments(CompanyUpdateSchema)
     @companies_blp.response(200, CompanySchema)
     def patch(self, company_data, company_id, **_):
-        company = self.company_service.update_company(company_id, company_data)
-        return company
+        """Partial update; send the ETag from GET as If-Match to guard against lost updates"""
+        company = self.company_service.update_company(
+            company_id, company_data, expected_version()
+        )
+        return company, 200, entity_validators(stamp_of(company)).headers
 
+    @companies_blp.arguments(CompanyDeleteArgsSchema, location="query")
     @companies_blp.response(204)
-    def delete(self, company_id):
-        self.company_service.delete_company(company_id)
-        return "", 204
+    @companies_blp.alt_response(202, schema=CompanyDeletionSchema)
+    def delete(self, args, company_id):
+        """Delete a company and its jobs
+
+        Large companies (or ``?async=true``) are deleted in the background:
+        the response is 202 with a status resource in Location.
+        """
+        deletion = self.company_service.delete_company(company_id, **args)
+        if deletion is None:
+            return "", 204
+        location = url_for("companies.CompanyDeletionStatus", deletion_id=deletion.id)
+        return CompanyDeletionSchema().dump(deletion), 202, {"Location": location}
+
+
+@companies_blp.route("/<int:company_id>/stats")
+class CompanyStats(MethodView):
+    @inject
+    def __init__(self, stats_service: StatsService):
+        self.stats_service = stats_service
+
+    @companies_blp.arguments(StatsArgsSchema, location="query")
+    @companies_blp.response(200, CompanyStatsSchema)
+    def get(self, args, company_id):
+        """A company's job counts, postings per day and week, and salary percentiles"""
+        return self.stats_service.get_company_stats(company_id, **args)
+
+
+@companies_blp.route("/deletions/<int:deletion_id>")
+class CompanyDeletionStatus(MethodView):
+    @inject
+    def __init__(self, company_service: CompanyService):
+        self.company_service = company_service
+
+    @companies_blp.response(200, CompanyDeletionSchema)
+    def get(self, deletion_id):
+        """Progress of a background company deletion"""
+        return self.company_service.get_deletion(deletion_id)
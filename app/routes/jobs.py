@@ -1,14 +1,57 @@
+from flask import Response, current_app, request, stream_with_context
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from injector import inject
 
 from app.schemas.job_schema import (
+    ActiveJobSchema,
+    BulkJobResultSchema,
     JobCreateSchema,
     JobDetailSchema,
+    JobActiveArgsSchema,
+    JobExportArgsSchema,
+    JobFieldsArgsSchema,
+    JobListArgsSchema,
     JobSchema,
+    JobSearchArgsSchema,
+    JobSuggestArgsSchema,
     JobUpdateSchema,
+    PaginatedJobSearchSchema,
 )
+from app.schemas.stats_schema import JobStatsSchema, StatsArgsSchema
+from app.schemas.suggestion_schema import SuggestionSchema
 from app.services.job_service import JobService
+from app.services.stats_service import StatsService
+from app.utils.conditional import (
+    collection_validators,
+    conditional_response,
+    entity_validators,
+    expected_version,
+    is_conditional,
+    not_modified,
+    stamp_of,
+)
+from app.utils.export import EXPORT_MIMETYPES, iter_csv, iter_ndjson
+from app.utils.fast_json import row_response, rows_response, schema_response
+from app.utils.fieldsets import includes
+from app.utils.ingest import NDJSON_MIMETYPES, iter_json_array, iter_ndjson_records
+from app.utils.pagination import pagination_headers
+
+
+def _job_stamps(jobs, with_company=True):
+    if not with_company:
+        return [stamp_of(job) for job in jobs]
+    return [stamp for job in jobs for stamp in (stamp_of(job), stamp_of(job.company))]
+
+
+def _job_row_stamps(rows, with_company=True):
+    if not with_company:
+        return [stamp_of(row) for row in rows]
+    return [
+        stamp
+        for row in rows
+        for stamp in (stamp_of(row), (row.company__id, row.company__version, row.company__updated_at))
+    ]
 
 
 jobs_blp = Blueprint(
@@ -25,10 +68,25 @@ class JobList(MethodView):
     def __init__(self, job_service: JobService):
         self.job_service = job_service
 
+    @jobs_blp.arguments(JobListArgsSchema, location="query")
     @jobs_blp.response(200, JobSchema(many=True))
-    def get(self):
-        jobs = self.job_service.get_all_jobs()
-        return jobs
+    def get(self, args):
+        """List jobs; ``fields`` (e.g. ``id,title,company.name``) narrows both payload and query"""
+        fast = current_app.config["FAST_READ_PATH"]
+        fieldset = args.get("fieldset")
+        page = self.job_service.get_jobs_page(as_rows=fast, **args)
+        stamp_rows = _job_row_stamps if fast else _job_stamps
+        validators = collection_validators(
+            stamp_rows(page.items, includes(fieldset, "company")), sorted(args.items()), page.next_cursor
+        )
+        if validators.matches():
+            return not_modified(validators)
+        headers = {**pagination_headers(page), **validators.headers}
+        if fast:
+            return rows_response(JobSchema(only=fieldset), page.items), 200, headers
+        if fieldset:
+            return schema_response(JobSchema(many=True, only=fieldset), page.items), 200, headers
+        return page.items, 200, headers
 
     @jobs_blp.arguments(JobCreateSchema)
     @jobs_blp.response(201, JobSchema)
@@ -37,22 +95,155 @@ class JobList(MethodView):
         return job, 201
 
 
+@jobs_blp.route("/active")
+class ActiveJobList(MethodView):
+    @inject
+    def __init__(self, job_service: JobService):
+        self.job_service = job_service
+
+    @jobs_blp.arguments(JobActiveArgsSchema, location="query")
+    @jobs_blp.response(200, ActiveJobSchema(many=True))
+    def get(self, args):
+        """List active jobs, newest first; a lean projection served from a covering index"""
+        page = self.job_service.get_active_jobs_page(**args)
+        validators = collection_validators(
+            [stamp_of(row) for row in page.items], sorted(args.items()), page.next_cursor
+        )
+        if validators.matches():
+            return not_modified(validators)
+        headers = {**pagination_headers(page), **validators.headers}
+        return rows_response(ActiveJobSchema(), page.items), 200, headers
+
+
+@jobs_blp.route("/bulk")
+class JobBulk(MethodView):
+    @inject
+    def __init__(self, job_service: JobService):
+        self.job_service = job_service
+
+    @jobs_blp.response(200, BulkJobResultSchema)
+    def post(self):
+        """Create many jobs from a streamed JSON array or NDJSON body, with a result per row"""
+        parse = iter_ndjson_records if request.mimetype in NDJSON_MIMETYPES else iter_json_array
+        return self.job_service.bulk_create_jobs(parse(request.stream))
+
+
+@jobs_blp.route("/search")
+class JobSearch(MethodView):
+    @inject
+    def __init__(self, job_service: JobService):
+        self.job_service = job_service
+
+    @jobs_blp.arguments(JobSearchArgsSchema, location="query")
+    @jobs_blp.response(200, PaginatedJobSearchSchema)
+    def get(self, args):
+        """Full-text search over title, company, location and description
+
+        With ``facets=true`` the response also carries counts per job type,
+        experience level, remote option and salary band for the same filters.
+        """
+        result = self.job_service.search_jobs(**args)
+        validators = collection_validators(
+            _job_stamps(hit.job for hit in result["items"]),
+            sorted(args.items()),
+            result["pagination"]["total"],
+            result.get("facets"),
+        )
+        return conditional_response(validators, result)
+
+
+@jobs_blp.route("/suggest")
+class JobSuggest(MethodView):
+    @inject
+    def __init__(self, job_service: JobService):
+        self.job_service = job_service
+
+    @jobs_blp.arguments(JobSuggestArgsSchema, location="query")
+    @jobs_blp.response(200, SuggestionSchema(many=True))
+    def get(self, args):
+        """Suggest existing locations or titles similar to a (misspelled) term"""
+        return self.job_service.suggest(**args)
+
+
+@jobs_blp.route("/stats")
+class JobStats(MethodView):
+    @inject
+    def __init__(self, stats_service: StatsService):
+        self.stats_service = stats_service
+
+    @jobs_blp.arguments(StatsArgsSchema, location="query")
+    @jobs_blp.response(200, JobStatsSchema)
+    def get(self, args):
+        """Job counts, postings per day and week, and salary percentiles by experience level"""
+        return self.stats_service.get_job_stats(**args)
+
+
+@jobs_blp.route("/export")
+class JobExport(MethodView):
+    @inject
+    def __init__(self, job_service: JobService):
+        self.job_service = job_service
+
+    @jobs_blp.arguments(JobExportArgsSchema, location="query")
+    @jobs_blp.response(200)
+    def get(self, args):
+        """Stream the full job catalogue as NDJSON or CSV"""
+        export_format = args["format"]
+        serialize = iter_csv if export_format == "csv" else iter_ndjson
+        chunks = serialize(
+            self.job_service.export_jobs(),
+            JobSchema(),
+            current_app.config["EXPORT_BATCH_SIZE"],
+        )
+        return Response(
+            stream_with_context(chunks),
+            mimetype=EXPORT_MIMETYPES[export_format],
+            headers={"Content-Disposition": f"attachment; filename=jobs.{export_format}"},
+        )
+
+
+@jobs_blp.route("/archive/<int:job_id>")
+class ArchivedJobDetail(MethodView):
+    @inject
+    def __init__(self, job_service: JobService):
+        self.job_service = job_service
+
+    @jobs_blp.response(200, JobDetailSchema)
+    def get(self, job_id):
+        """An archived job (its month was moved out of the job table by `flask partitions archive`)"""
+        row = self.job_service.get_archived_job(job_id)
+        validators = entity_validators(
+            stamp_of(row), (row.company__id, row.company__version, row.company__updated_at)
+        )
+        return conditional_response(validators, row_response(JobDetailSchema(), row))
+
+
 @jobs_blp.route("/<int:job_id>")
 class JobDetail(MethodView):
     @inject
     def __init__(self, job_service: JobService):
         self.job_service = job_service
 
+    @jobs_blp.arguments(JobFieldsArgsSchema, location="query")
     @jobs_blp.response(200, JobDetailSchema)
-    def get(self, job_id):
+    def get(self, args, job_id):
+        if is_conditional():
+            validators = self.job_service.get_job_validators(job_id)
+            if validators.matches():
+                return not_modified(validators)
         job = self.job_service.get_job_by_id(job_id)
-        return job
+        headers = entity_validators(stamp_of(job), stamp_of(job.company)).headers
+        if args.get("fieldset"):
+            # The entity comes whole from the entity cache; only the payload is narrowed.
+            return schema_response(JobDetailSchema(only=args["fieldset"]), job), 200, headers
+        return job, 200, headers
 
     @jobs_blp.arguments(JobUpdateSchema)
     @jobs_blp.response(200, JobSchema)
     def patch(self, job_data, job_id, **_):
-        job = self.job_service.update_job(job_id, job_data)
-        return job
+        """Partial update; send the ETag from GET as If-Match to guard against lost updates"""
+        job = self.job_service.update_job(job_id, job_data, expected_version())
+        return job, 200, entity_validators(stamp_of(job), stamp_of(job.company)).headers
 
     @jobs_blp.response(204)
     def delete(self, job_id):
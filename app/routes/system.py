@@ -0,0 +1,40 @@
+from flask import current_app
+from flask.views import MethodView
+from flask_smorest import Blueprint
+
+from app.extensions import db, entity_cache
+from app.schemas.system_schema import CacheStatsSchema, PoolStatsSchema, ReplicaStatusSchema
+from app.utils.pool_metrics import pool_stats
+
+
+system_blp = Blueprint(
+    "system",
+    "system",
+    url_prefix="/api/system",
+    description="Operational introspection",
+)
+
+
+@system_blp.route("/cache")
+class CacheStats(MethodView):
+    @system_blp.response(200, CacheStatsSchema)
+    def get(self):
+        """Entity cache hit, miss and eviction counters"""
+        return entity_cache.stats()
+
+
+@system_blp.route("/pool")
+class PoolStats(MethodView):
+    @system_blp.response(200, PoolStatsSchema)
+    def get(self):
+        """Connection pool occupancy, checkout latency and wait counters of this worker"""
+        return pool_stats(db.engine.pool)
+
+
+@system_blp.route("/replicas")
+class ReplicaStatus(MethodView):
+    @system_blp.response(200, ReplicaStatusSchema(many=True))
+    def get(self):
+        """Health and lag of the read replicas as seen by this worker"""
+        replica_set = current_app.extensions.get("replicas")
+        return replica_set.status() if replica_set else []
@@ -1,5 +1,11 @@
 from marshmallow import Schema, fields, validate
 
+from app.models.enums import DeletionStatus
+from app.schemas.fieldset_schema import FieldSet
+from app.schemas.pagination_schema import CursorPaginationArgsSchema
+
+COMPANY_SORT_OPTIONS = ["name", "-name", "created_at", "-created_at"]
+
 
 class CompanySummarySchema(Schema):
     id = fields.Integer(dump_only=True)
@@ -30,3 +36,34 @@ class CompanyUpdateSchema(Schema):
     description = fields.String(allow_none=True)
     website = fields.Url(allow_none=True)
     location = fields.String(validate=validate.Length(min=1, max=255))
+
+
+class CompanyDeleteArgsSchema(Schema):
+    background = fields.Boolean(data_key="async", load_default=False)
+
+
+class CompanyDeletionSchema(Schema):
+    id = fields.Integer(dump_only=True)
+    company_id = fields.Integer(dump_only=True)
+    status = fields.Enum(DeletionStatus, by_value=True, dump_only=True)
+    jobs_deleted = fields.Integer(dump_only=True)
+    error = fields.String(allow_none=True, dump_only=True)
+    created_at = fields.DateTime(dump_only=True)
+    updated_at = fields.DateTime(dump_only=True)
+    completed_at = fields.DateTime(allow_none=True, dump_only=True)
+
+
+class CompanyUpsertResultSchema(Schema):
+    ids = fields.Dict(keys=fields.String(), values=fields.Integer())
+    created = fields.Integer()
+    updated = fields.Integer()
+
+
+class CompanyFieldsArgsSchema(Schema):
+    fieldset = FieldSet(CompanySchema)
+
+
+class CompanyListArgsSchema(CursorPaginationArgsSchema, CompanyFieldsArgsSchema):
+    sort = fields.String(load_default="name", validate=validate.OneOf(COMPANY_SORT_OPTIONS))
+    location = fields.String(validate=validate.Length(min=1, max=255))
+    fuzzy = fields.Boolean(load_default=False)
@@ -0,0 +1,44 @@
+from typing import FrozenSet, Type
+
+from marshmallow import Schema, ValidationError, fields
+from webargs.fields import DelimitedList
+
+
+def field_paths(schema: Schema) -> FrozenSet[str]:
+    """Names a client may request from ``schema``: dump fields and dotted nested fields."""
+    paths = set()
+    for name, field in schema.dump_fields.items():
+        paths.add(name)
+        if isinstance(field, fields.Nested):
+            paths.update(f"{name}.{nested}" for nested in field_paths(field.schema))
+    return frozenset(paths)
+
+
+class FieldSet(DelimitedList):
+    """Sparse fieldset query argument: ``?fields=id,title,company.name``.
+
+    Deserializes to a tuple of field paths of ``schema_class`` (usable as
+    marshmallow ``only=``); absent when the client sent no ``fields``.
+    """
+
+    def __init__(self, schema_class: Type[Schema], **kwargs):
+        self.schema_class = schema_class
+        self._paths = None
+        kwargs.setdefault("data_key", "fields")
+        super().__init__(fields.String(), **kwargs)
+
+    @property
+    def paths(self) -> FrozenSet[str]:
+        if self._paths is None:
+            self._paths = field_paths(self.schema_class())
+        return self._paths
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        names = [name.strip() for name in super()._deserialize(value, attr, data, **kwargs)]
+        names = [name for name in names if name]
+        if not names:
+            raise ValidationError("At least one field is required.")
+        unknown = sorted(set(names) - self.paths)
+        if unknown:
+            raise ValidationError(f"Unknown field(s): {', '.join(unknown)}.")
+        return tuple(dict.fromkeys(names))
@@ -1,12 +1,20 @@
 from marshmallow import Schema, fields, validate, validates_schema, ValidationError
 
 from app.models.enums import ExperienceLevel, JobType, RemoteOption
-from app.schemas.company_schema import CompanySummarySchema
+from app.schemas.company_schema import CompanyCreateSchema, CompanySchema, CompanySummarySchema
+from app.schemas.fieldset_schema import FieldSet
+from app.schemas.suggestion_schema import SuggestArgsSchema
+from app.schemas.pagination_schema import (
+    CursorPaginationArgsSchema,
+    PageArgsSchema,
+    PaginationSchema,
+)
 from app.utils.datetime_utils import utc_now
 
 ENUM_JOB_TYPE = [e.value for e in JobType]
 ENUM_EXPERIENCE_LEVEL = [e.value for e in ExperienceLevel]
 ENUM_REMOTE_OPTION = [e.value for e in RemoteOption]
+JOB_SORT_OPTIONS = ["-posted_date", "posted_date", "-salary_min", "salary_min"]
 
 
 class JobSchema(Schema):
@@ -34,6 +42,81 @@ class JobDetailSchema(JobSchema):
     pass
 
 
+class ActiveJobSchema(JobSchema):
+    """An active-jobs feed item: the columns idx_job_active_feed covers."""
+
+    class Meta:
+        fields = (
+            "id", "title", "company_id", "location", "salary_min", "salary_max", "job_type",
+            "experience_level", "remote_option", "posted_date", "expiry_date", "version", "updated_at",
+        )
+
+
+class JobTextFilterArgsSchema(Schema):
+    location = fields.String(validate=validate.Length(min=1, max=255))
+    title = fields.String(validate=validate.Length(min=1, max=255))
+    fuzzy = fields.Boolean(load_default=False)
+
+
+class JobFieldsArgsSchema(Schema):
+    fieldset = FieldSet(JobSchema)
+
+
+class JobListArgsSchema(CursorPaginationArgsSchema, JobTextFilterArgsSchema, JobFieldsArgsSchema):
+    sort = fields.String(load_default="-posted_date", validate=validate.OneOf(JOB_SORT_OPTIONS))
+
+
+class JobActiveArgsSchema(CursorPaginationArgsSchema):
+    pass
+
+
+class JobSuggestArgsSchema(SuggestArgsSchema):
+    field = fields.String(load_default="location", validate=validate.OneOf(["location", "title"]))
+
+
+class JobSearchArgsSchema(PageArgsSchema, JobTextFilterArgsSchema):
+    q = fields.String(required=True, validate=validate.Length(min=1, max=255))
+    company_id = fields.Integer()
+    job_type = fields.String(validate=validate.OneOf(ENUM_JOB_TYPE))
+    experience_level = fields.String(validate=validate.OneOf(ENUM_EXPERIENCE_LEVEL))
+    remote_option = fields.String(validate=validate.OneOf(ENUM_REMOTE_OPTION))
+    highlight = fields.Boolean(load_default=False)
+    facets = fields.Boolean(load_default=False)
+
+
+class JobSearchHitSchema(Schema):
+    job = fields.Nested(JobSchema)
+    rank = fields.Float()
+    highlight = fields.String(allow_none=True)
+
+
+class FacetBucketSchema(Schema):
+    value = fields.String()
+    count = fields.Integer()
+
+
+class SalaryBandBucketSchema(FacetBucketSchema):
+    min = fields.Integer(allow_none=True)
+    max = fields.Integer(allow_none=True)
+
+
+class JobSearchFacetsSchema(Schema):
+    job_type = fields.List(fields.Nested(FacetBucketSchema))
+    experience_level = fields.List(fields.Nested(FacetBucketSchema))
+    remote_option = fields.List(fields.Nested(FacetBucketSchema))
+    salary_band = fields.List(fields.Nested(SalaryBandBucketSchema))
+
+
+class PaginatedJobSearchSchema(Schema):
+    items = fields.List(fields.Nested(JobSearchHitSchema))
+    pagination = fields.Nested(PaginationSchema)
+    facets = fields.Nested(JobSearchFacetsSchema)
+
+
+class JobExportArgsSchema(Schema):
+    format = fields.String(load_default="ndjson", validate=validate.OneOf(["ndjson", "csv"]))
+
+
 class JobCreateSchema(Schema):
     title = fields.String(required=True, validate=validate.Length(min=1, max=255))
     description = fields.String(required=True)
@@ -59,6 +142,47 @@ class JobCreateSchema(Schema):
             raise ValidationError({"expiry_date": "expiry_date must be in the future"})
 
 
+class CompanyJobCreateSchema(JobCreateSchema):
+    """A job created together with its company (company_id is not known yet)."""
+
+    class Meta:
+        exclude = ("company_id",)
+
+
+class CompanyJobSchema(JobSchema):
+    class Meta:
+        exclude = ("company",)
+
+
+class CompanyWithJobsCreateSchema(CompanyCreateSchema):
+    jobs = fields.List(
+        fields.Nested(CompanyJobCreateSchema),
+        required=True,
+        validate=validate.Length(min=1, max=1000),
+    )
+
+
+class CompanyWithJobsSchema(Schema):
+    company = fields.Nested(CompanySchema)
+    jobs = fields.List(fields.Nested(CompanyJobSchema))
+
+
+class BulkJobRowResultSchema(Schema):
+    index = fields.Integer()
+    status = fields.String()
+    id = fields.Integer()
+    errors = fields.Dict()
+
+
+class BulkJobResultSchema(Schema):
+    received = fields.Integer()
+    created = fields.Integer()
+    rejected = fields.Integer()
+    truncated = fields.Boolean()
+    error = fields.String(allow_none=True)
+    results = fields.List(fields.Nested(BulkJobRowResultSchema))
+
+
 class JobUpdateSchema(Schema):
     title = fields.String(validate=validate.Length(min=1, max=255))
     description = fields.String()
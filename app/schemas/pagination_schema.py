@@ -0,0 +1,29 @@
+from marshmallow import Schema, fields, validate
+
+
+class CursorPaginationArgsSchema(Schema):
+    cursor = fields.String(load_default=None)
+    per_page = fields.Integer(load_default=None, validate=validate.Range(min=1))
+
+
+class CursorPaginationSchema(Schema):
+    per_page = fields.Integer()
+    sort = fields.String()
+    has_next = fields.Boolean()
+    next_cursor = fields.String(allow_none=True)
+
+
+class PageArgsSchema(Schema):
+    page = fields.Integer(load_default=1, validate=validate.Range(min=1))
+    per_page = fields.Integer(load_default=None, validate=validate.Range(min=1))
+
+
+class PaginationSchema(Schema):
+    page = fields.Integer()
+    per_page = fields.Integer()
+    total = fields.Integer()
+    pages = fields.Integer()
+    has_prev = fields.Boolean()
+    has_next = fields.Boolean()
+    prev_num = fields.Integer(allow_none=True)
+    next_num = fields.Integer(allow_none=True)
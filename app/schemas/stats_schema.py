@@ -0,0 +1,35 @@
+from marshmallow import Schema, fields, validate
+
+from app.models.enums import ExperienceLevel
+
+
+class StatsArgsSchema(Schema):
+    days = fields.Integer(load_default=30, validate=validate.Range(min=1, max=366))
+    weeks = fields.Integer(load_default=12, validate=validate.Range(min=1, max=104))
+
+
+class PostingCountSchema(Schema):
+    period = fields.Date(metadata={"description": "Day, or Monday of the ISO week (UTC)"})
+    count = fields.Integer()
+
+
+class SalaryPercentilesSchema(Schema):
+    experience_level = fields.Enum(ExperienceLevel, by_value=True)
+    jobs = fields.Integer(metadata={"description": "Active jobs with a salary_min"})
+    percentiles = fields.Dict(
+        keys=fields.String(),
+        values=fields.Decimal(as_string=True),
+        metadata={"description": "salary_min percentiles, e.g. p50, interpolated within buckets"},
+    )
+
+
+class JobStatsSchema(Schema):
+    total_jobs = fields.Integer()
+    active_jobs = fields.Integer()
+    postings_per_day = fields.List(fields.Nested(PostingCountSchema))
+    postings_per_week = fields.List(fields.Nested(PostingCountSchema))
+    salary_percentiles = fields.List(fields.Nested(SalaryPercentilesSchema))
+
+
+class CompanyStatsSchema(JobStatsSchema):
+    company_id = fields.Integer()
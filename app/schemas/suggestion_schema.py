@@ -0,0 +1,11 @@
+from marshmallow import Schema, fields, validate
+
+
+class SuggestArgsSchema(Schema):
+    q = fields.String(required=True, validate=validate.Length(min=1, max=255))
+    limit = fields.Integer(load_default=5, validate=validate.Range(min=1, max=20))
+
+
+class SuggestionSchema(Schema):
+    value = fields.String()
+    score = fields.Float()
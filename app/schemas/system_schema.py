@@ -0,0 +1,42 @@
+from marshmallow import Schema, fields
+
+
+class CacheStatsSchema(Schema):
+    backend = fields.String()
+    hits = fields.Integer()
+    misses = fields.Integer()
+    invalidations = fields.Integer()
+    hit_ratio = fields.Float()
+    size = fields.Integer()
+    max_size = fields.Integer()
+    evictions = fields.Integer()
+    expirations = fields.Integer()
+
+
+class CheckoutBucketSchema(Schema):
+    le = fields.Float(allow_none=True, metadata={"description": "Upper bound in ms; null for the overflow bucket"})
+    count = fields.Integer()
+
+
+class PoolStatsSchema(Schema):
+    pid = fields.Integer(metadata={"description": "Worker process the pool belongs to"})
+    pool_class = fields.String()
+    pool_size = fields.Integer()
+    max_overflow = fields.Integer()
+    timeout = fields.Float()
+    checked_out = fields.Integer(metadata={"description": "Connections in use"})
+    checked_in = fields.Integer(metadata={"description": "Idle connections in the pool"})
+    overflow = fields.Integer(metadata={"description": "Open connections beyond pool_size"})
+    checkouts = fields.Integer()
+    waits = fields.Integer(metadata={"description": "Checkouts that had to wait for a connection"})
+    timeouts = fields.Integer(metadata={"description": "Checkouts that gave up after the pool timeout"})
+    connects = fields.Integer(metadata={"description": "New database connections opened"})
+    checkout_ms_avg = fields.Float()
+    checkout_ms_max = fields.Float()
+    checkout_ms_buckets = fields.List(fields.Nested(CheckoutBucketSchema))
+
+
+class ReplicaStatusSchema(Schema):
+    bind = fields.String(metadata={"description": "SQLALCHEMY_BINDS key of the replica"})
+    up = fields.Boolean(metadata={"description": "False while a failed replica sits out"})
+    lag_seconds = fields.Float(allow_none=True, metadata={"description": "Replay lag at the last check"})
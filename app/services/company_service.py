@@ -1,25 +1,97 @@
-from typing import List
+from functools import partial
+from typing import List, Optional, Sequence
 
+from flask import current_app
 from injector import inject
-from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.exc import IntegrityError
 
 from app.exceptions.custom_exceptions import (
+    CompanyDeletionNotFoundException,
     CompanyNotFoundException,
+    DuplicateCompanyException,
+    InvalidPayloadException,
     OptimisticLockException,
+    PreconditionFailedException,
 )
+from app.extensions import entity_cache
 from app.models.company import Company
+from app.models.company_deletion import ACTIVE_STATUSES, CompanyDeletion
+from app.models.enums import DeletionStatus
+from app.models.job import Job
+from app.repositories.company_deletion_repository import CompanyDeletionRepository
 from app.repositories.company_repository import CompanyRepository
+from app.repositories.job_repository import JobRepository
+from app.repositories.job_stats_repository import JobStatsRepository
+from app.repositories.unit_of_work import UnitOfWork, on_commit, transactional
+from app.services.job_service import job_values
+from app.tasks import delete_company_in_chunks
+from app.utils.conditional import Validators, entity_validators
+from app.utils.datetime_utils import utc_now
+from app.utils.pagination import Page, resolve_per_page
 
 
 class CompanyService:
     @inject
-    def __init__(self, company_repository: CompanyRepository):
+    def __init__(
+        self,
+        company_repository: CompanyRepository,
+        job_repository: JobRepository,
+        deletion_repository: CompanyDeletionRepository,
+        stats_repository: JobStatsRepository,
+    ):
         self.company_repository = company_repository
+        self.job_repository = job_repository
+        self.deletion_repository = deletion_repository
+        self.stats_repository = stats_repository
 
     def get_all_companies(self) -> List[Company]:
         return self.company_repository.find_all()
 
+    def get_companies_page(
+        self,
+        sort: str = "name",
+        cursor: Optional[str] = None,
+        per_page: Optional[int] = None,
+        location: Optional[str] = None,
+        fuzzy: bool = False,
+        as_rows: bool = False,
+        fieldset: Optional[Sequence[str]] = None,
+    ) -> Page:
+        return self.company_repository.find_page(
+            sort=sort,
+            per_page=resolve_per_page(per_page),
+            cursor=cursor,
+            location=location,
+            fuzzy=fuzzy,
+            similarity_threshold=current_app.config["TRGM_SIMILARITY_THRESHOLD"],
+            as_rows=as_rows,
+            fieldset=fieldset,
+        )
+
+    def suggest_locations(self, q: str, limit: int = 5) -> List[dict]:
+        """Return "did you mean" candidates for a company location filter."""
+        matches = self.company_repository.suggest_locations(
+            q, limit, current_app.config["TRGM_SIMILARITY_THRESHOLD"]
+        )
+        return [{"value": value, "score": score} for value, score in matches]
+
     def get_company_by_id(self, company_id: int) -> Company:
+        company = entity_cache.get_or_load(
+            "company", company_id, self.company_repository.find_by_id
+        )
+        if not company:
+            raise CompanyNotFoundException(company_id)
+        return company
+
+    def get_company_validators(self, company_id: int) -> Validators:
+        """Validators for a company detail response, from a version-only query."""
+        stamp = self.company_repository.find_stamp(company_id)
+        if not stamp:
+            raise CompanyNotFoundException(company_id)
+        return entity_validators(stamp)
+
+    def _find_company(self, company_id: int) -> Company:
+        # Writes always start from the database, never from a cached snapshot.
         company = self.company_repository.find_by_id(company_id)
         if not company:
             raise CompanyNotFoundException(company_id)
@@ -32,18 +104,150 @@ class CompanyService:
             website=data.get("website"),
             location=data["location"],
         )
-        return self.company_repository.save(company)
-
-    def update_company(self, company_id: int, data: dict) -> Company:
-        company = self.get_company_by_id(company_id)
-        for key, value in data.items():
-            if hasattr(company, key):
-                setattr(company, key, value)
         try:
             return self.company_repository.save(company)
-        except StaleDataError:
+        except IntegrityError:
+            raise DuplicateCompanyException(data["name"])
+
+    @transactional
+    def create_company_with_jobs(self, data: dict) -> dict:
+        """Create a company and its initial jobs with a single COMMIT.
+
+        The company INSERT is flushed first (its id comes back via
+        RETURNING), then all jobs go out in one batched INSERT.
+        """
+        company = self.create_company(data)
+        jobs = [
+            Job(**job_values({**job, "company_id": company.id}), company=company)
+            for job in data["jobs"]
+        ]
+        self.job_repository.save_all(jobs)
+        self.stats_repository.add_jobs([job.id for job in jobs])
+        return {"company": company, "jobs": jobs}
+
+    def upsert_companies(self, companies: List[dict]) -> dict:
+        """Create or update companies keyed on normalized name in one statement.
+
+        Returns the id for every submitted name. When a name appears more
+        than once, the last occurrence supplies the values. Existing
+        companies keep their stored spelling of the name.
+        """
+        if len(companies) > current_app.config["COMPANY_UPSERT_MAX_ROWS"]:
+            raise InvalidPayloadException(
+                f"At most {current_app.config['COMPANY_UPSERT_MAX_ROWS']} companies per request"
+            )
+        if not companies:
+            return {"ids": {}, "created": 0, "updated": 0}
+        keys = self.company_repository.normalize_names([data["name"] for data in companies])
+        latest = {keys[data["name"]]: data for data in companies}
+
+        rows = [
+            {
+                "name": data["name"],
+                "description": data.get("description"),
+                "website": data.get("website"),
+                "location": data["location"],
+            }
+            for data in latest.values()
+        ]
+        returned = self.company_repository.upsert_many(rows)
+        ids = {key: company_id for company_id, key, _ in returned}
+        for company_id, _, inserted in returned:
+            if not inserted:
+                on_commit(partial(entity_cache.invalidate, "company", company_id))
+        created = sum(1 for _, _, inserted in returned if inserted)
+        return {
+            "ids": {data["name"]: ids[keys[data["name"]]] for data in companies},
+            "created": created,
+            "updated": len(returned) - created,
+        }
+
+    def update_company(
+        self, company_id: int, data: dict, expected_version: Optional[int] = None
+    ) -> Company:
+        """Apply a partial update in a single versioned UPDATE (see JobService.update_job)."""
+        values = {key: value for key, value in data.items() if hasattr(Company, key)}
+        try:
+            company = self.company_repository.update_versioned(company_id, values, expected_version)
+        except IntegrityError:
+            # The only constraint a partial update can violate is the unique name.
+            if "name" in data:
+                raise DuplicateCompanyException(data["name"])
+            raise
+        if company is None:
+            if not self.company_repository.exists(company_id):
+                raise CompanyNotFoundException(company_id)
+            if expected_version is not None:
+                raise PreconditionFailedException()
             raise OptimisticLockException()
+        # Also makes cached jobs embedding this company stale.
+        on_commit(partial(entity_cache.invalidate, "company", company_id))
+        return company
+
+    def delete_company(self, company_id: int, background: bool = False) -> Optional[CompanyDeletion]:
+        """Delete a company; its jobs and statistics rollups go with it through ON DELETE CASCADE.
 
-    def delete_company(self, company_id: int) -> None:
-        company = self.get_company_by_id(company_id)
-        self.company_repository.delete(company)
+        Companies with more than COMPANY_DELETE_SYNC_MAX_JOBS jobs (or any
+        company when ``background`` is set) are handed to a background task
+        that deletes in short chunks; the returned CompanyDeletion tracks it.
+        Returns None when the company was deleted inline.
+        """
+        company = self._find_company(company_id)
+        limit = current_app.config["COMPANY_DELETE_SYNC_MAX_JOBS"]
+        if not background and self.job_repository.count_for_company(company_id, limit + 1) <= limit:
+            self.company_repository.delete(company)
+            on_commit(partial(entity_cache.invalidate, "company", company_id))
+            return None
+
+        deletion, created = self.deletion_repository.start(company_id)
+        if created:
+            delete_company_in_chunks.delay(deletion.id)
+        return deletion
+
+    def get_deletion(self, deletion_id: int) -> CompanyDeletion:
+        deletion = self.deletion_repository.find_by_id(deletion_id)
+        if not deletion:
+            raise CompanyDeletionNotFoundException(deletion_id)
+        return deletion
+
+    def run_deletion(self, deletion_id: int) -> Optional[CompanyDeletion]:
+        """Worker side of a background deletion.
+
+        Jobs are deleted COMPANY_DELETE_CHUNK_SIZE at a time with
+        FOR UPDATE SKIP LOCKED, each chunk and its progress update in one
+        short transaction, so no lock is held for long and concurrent
+        writers are never waited on. Each chunk leaves the statistics
+        rollups in the same transaction, so they stay exact while the
+        deletion runs or if it fails. The company row (and any job skipped
+        because it was locked, with its rollups) goes last.
+        """
+        deletion = self.deletion_repository.find_by_id(deletion_id)
+        if deletion is None or deletion.status not in ACTIVE_STATUSES:
+            return deletion
+        company_id = deletion.company_id
+        chunk_size = current_app.config["COMPANY_DELETE_CHUNK_SIZE"]
+        deletion.status = DeletionStatus.RUNNING
+        self.deletion_repository.save(deletion)
+
+        try:
+            while True:
+                with UnitOfWork():
+                    job_ids = self.job_repository.lock_chunk_for_company(company_id, chunk_size)
+                    self.stats_repository.remove_jobs(job_ids)
+                    deletion.jobs_deleted += self.job_repository.delete_many(job_ids)
+                    self.deletion_repository.save(deletion)
+                if len(job_ids) < chunk_size:
+                    break
+            with UnitOfWork():
+                self.company_repository.delete_by_id(company_id)
+                deletion.status = DeletionStatus.COMPLETED
+                deletion.completed_at = utc_now()
+                self.deletion_repository.save(deletion)
+        except Exception as error:
+            current_app.logger.exception("Deletion %s of company %s failed", deletion_id, company_id)
+            deletion.status = DeletionStatus.FAILED
+            deletion.error = str(error)
+            self.deletion_repository.save(deletion)
+        finally:
+            entity_cache.invalidate("company", company_id)
+        return deletion
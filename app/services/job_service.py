@@ -1,17 +1,50 @@
-from typing import List
+import time
+from functools import partial
+from itertools import count
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
+from flask import current_app
 from injector import inject
-from sqlalchemy.orm.exc import StaleDataError
+from marshmallow import ValidationError
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from app.exceptions.custom_exceptions import (
     CompanyNotFoundException,
+    InvalidPayloadException,
     JobNotFoundException,
     OptimisticLockException,
+    PreconditionFailedException,
 )
+from app.extensions import entity_cache, facet_cache
 from app.models.enums import ExperienceLevel, JobType, RemoteOption
 from app.models.job import Job
 from app.repositories.company_repository import CompanyRepository
 from app.repositories.job_repository import JobRepository
+from app.repositories.job_stats_repository import STATS_FIELDS, JobStatsRepository
+from app.repositories.unit_of_work import UnitOfWork, on_commit, transactional
+from app.schemas.job_schema import JobCreateSchema
+from app.utils.conditional import Validators, entity_validators
+from app.utils.datetime_utils import utc_now
+from app.utils.ingest import MalformedRecord
+from app.utils.pagination import Page, offset_pagination, resolve_per_page
+
+
+def job_values(data: dict) -> dict:
+    """Column values for a new job from validated JobCreateSchema data."""
+    return {
+        "title": data["title"],
+        "description": data["description"],
+        "company_id": data["company_id"],
+        "location": data["location"],
+        "salary_min": data.get("salary_min"),
+        "salary_max": data.get("salary_max"),
+        "job_type": JobType[data["job_type"]],
+        "experience_level": ExperienceLevel[data["experience_level"]],
+        "remote_option": RemoteOption[data["remote_option"]],
+        "expiry_date": data.get("expiry_date"),
+        "application_url": data.get("application_url"),
+    }
 
 
 class JobService:
@@ -20,63 +53,329 @@ class JobService:
         self,
         job_repository: JobRepository,
         company_repository: CompanyRepository,
+        stats_repository: JobStatsRepository,
     ):
         self.job_repository = job_repository
         self.company_repository = company_repository
+        self.stats_repository = stats_repository
 
     def get_all_jobs(self) -> List[Job]:
         return self.job_repository.find_all()
 
+    def get_jobs_page(
+        self,
+        sort: str = "-posted_date",
+        cursor: Optional[str] = None,
+        per_page: Optional[int] = None,
+        location: Optional[str] = None,
+        title: Optional[str] = None,
+        fuzzy: bool = False,
+        as_rows: bool = False,
+        fieldset: Optional[Sequence[str]] = None,
+    ) -> Page:
+        return self.job_repository.find_page(
+            sort=sort,
+            per_page=resolve_per_page(per_page),
+            cursor=cursor,
+            similarity_threshold=current_app.config["TRGM_SIMILARITY_THRESHOLD"],
+            as_rows=as_rows,
+            fieldset=fieldset,
+            location=location,
+            title=title,
+            fuzzy=fuzzy,
+        )
+
+    def get_active_jobs_page(self, cursor: Optional[str] = None, per_page: Optional[int] = None) -> Page:
+        return self.job_repository.find_active_page(resolve_per_page(per_page), cursor)
+
+    def suggest(self, q: str, field: str = "location", limit: int = 5) -> List[dict]:
+        """Return "did you mean" candidates for a location or title filter."""
+        matches = self.job_repository.suggest_values(
+            field, q, limit, current_app.config["TRGM_SIMILARITY_THRESHOLD"]
+        )
+        return [{"value": value, "score": score} for value, score in matches]
+
+    def search_jobs(
+        self,
+        q: str,
+        company_id: Optional[int] = None,
+        job_type: Optional[str] = None,
+        experience_level: Optional[str] = None,
+        remote_option: Optional[str] = None,
+        location: Optional[str] = None,
+        title: Optional[str] = None,
+        fuzzy: bool = False,
+        page: int = 1,
+        per_page: Optional[int] = None,
+        highlight: bool = False,
+        facets: bool = False,
+    ) -> dict:
+        per_page = resolve_per_page(per_page)
+        threshold = current_app.config["TRGM_SIMILARITY_THRESHOLD"]
+        filters = dict(
+            location=location,
+            title=title,
+            fuzzy=fuzzy,
+            company_id=company_id,
+            job_type=JobType[job_type] if job_type else None,
+            experience_level=ExperienceLevel[experience_level] if experience_level else None,
+            remote_option=RemoteOption[remote_option] if remote_option else None,
+        )
+        hits, total = self.job_repository.search(
+            q,
+            page=page,
+            per_page=per_page,
+            highlight=highlight,
+            similarity_threshold=threshold,
+            **filters,
+        )
+        result = {"items": hits, "pagination": offset_pagination(page, per_page, total)}
+        if facets:
+            result["facets"] = self.get_search_facets(q, threshold, filters)
+        return result
+
+    def get_search_facets(self, q: str, similarity_threshold: float, filters: dict) -> dict:
+        """Facet counts for a search, cached for FACET_CACHE_TTL seconds per filter combination.
+
+        The key leaves out paging and highlighting, so paging through one
+        result set computes the facets once.
+        """
+        salary_bands = tuple(current_app.config["FACET_SALARY_BANDS"])
+        key = ("jobs", q, sorted(filters.items()), salary_bands, similarity_threshold)
+        return facet_cache.get_or_compute(
+            key,
+            lambda: self.job_repository.facet_counts(
+                q, salary_bands, similarity_threshold=similarity_threshold, **filters
+            ),
+        )
+
+    def export_jobs(self) -> Iterator[Job]:
+        return self.job_repository.iter_all(current_app.config["EXPORT_BATCH_SIZE"])
+
     def get_job_by_id(self, job_id: int) -> Job:
+        job = entity_cache.get_or_load(
+            "job",
+            job_id,
+            self.job_repository.find_by_id,
+            dependencies=lambda loaded: [("company", loaded.company_id)],
+        )
+        if not job:
+            raise JobNotFoundException(job_id)
+        return job
+
+    def get_archived_job(self, job_id: int) -> Row:
+        row = self.job_repository.find_archived(job_id)
+        if row is None:
+            raise JobNotFoundException(job_id)
+        return row
+
+    def get_job_validators(self, job_id: int) -> Validators:
+        """Validators for a job detail response, from a version-only query."""
+        stamps = self.job_repository.find_stamps(job_id)
+        if not stamps:
+            raise JobNotFoundException(job_id)
+        return entity_validators(*stamps)
+
+    def _find_job(self, job_id: int) -> Job:
+        # Writes always start from the database, never from a cached snapshot.
         job = self.job_repository.find_by_id(job_id)
         if not job:
             raise JobNotFoundException(job_id)
         return job
 
+    @transactional
     def create_job(self, data: dict) -> Job:
         company = self.company_repository.find_by_id(data["company_id"])
         if not company:
             raise CompanyNotFoundException(data["company_id"])
 
-        job = Job(
-            title=data["title"],
-            description=data["description"],
-            company_id=data["company_id"],
-            location=data["location"],
-            salary_min=data.get("salary_min"),
-            salary_max=data.get("salary_max"),
-            job_type=JobType[data["job_type"]],
-            experience_level=ExperienceLevel[data["experience_level"]],
-            remote_option=RemoteOption[data["remote_option"]],
-            expiry_date=data.get("expiry_date"),
-            application_url=data.get("application_url"),
-        )
-        return self.job_repository.save(job)
+        job = self.job_repository.save(Job(**job_values(data), company=company))
+        self.stats_repository.add_jobs([job.id])
+        return job
+
+    def bulk_create_jobs(self, records: Iterable[Any]) -> dict:
+        """Validate and insert a stream of job payloads, reporting a result per row.
+
+        Rows are validated one by one and written in chunks of
+        BULK_CHUNK_SIZE, each chunk in its own transaction after a single
+        query resolving its (not yet seen) company ids. A chunk that fails
+        to insert is rejected as a whole; earlier chunks stay committed.
+        Reading stops after BULK_MAX_ROWS rows (the result is marked
+        ``truncated``) or at a syntax error in the body (reported in
+        ``error``; raised as a 400 if no row was read yet).
+        """
+        max_rows = current_app.config["BULK_MAX_ROWS"]
+        chunk_size = current_app.config["BULK_CHUNK_SIZE"]
+        schema = JobCreateSchema()
+        known_companies: Set[int] = set()
+        results: List[dict] = []
+        chunk: List[Tuple[int, dict]] = []
+        truncated = False
 
-    def update_job(self, job_id: int, data: dict) -> Job:
-        job = self.get_job_by_id(job_id)
+        payload_error = None
+        records = iter(records)
+        for index in count():
+            try:
+                record = next(records)
+            except StopIteration:
+                break
+            except InvalidPayloadException as exc:
+                if index == 0:
+                    raise
+                # Rows parsed before the syntax error are still processed and reported.
+                payload_error = str(exc)
+                break
+            if index >= max_rows:
+                truncated = True
+                break
+            if isinstance(record, MalformedRecord):
+                results.append(_rejected(index, {"_schema": [record.message]}))
+                continue
+            try:
+                data = schema.load(record)
+            except ValidationError as error:
+                results.append(_rejected(index, error.messages))
+                continue
+            chunk.append((index, data))
+            if len(chunk) >= chunk_size:
+                results.extend(self._insert_chunk(chunk, known_companies))
+                chunk = []
+        if chunk:
+            results.extend(self._insert_chunk(chunk, known_companies))
+
+        results.sort(key=lambda result: result["index"])
+        created = sum(1 for result in results if result["status"] == "created")
+        return {
+            "received": len(results),
+            "created": created,
+            "rejected": len(results) - created,
+            "truncated": truncated,
+            "error": payload_error,
+            "results": results,
+        }
+
+    def _insert_chunk(self, chunk: List[Tuple[int, dict]], known_companies: Set[int]) -> List[dict]:
+        unseen = {data["company_id"] for _, data in chunk} - known_companies
+        known_companies |= self.company_repository.find_existing_ids(unseen)
+
+        results, rows = [], []
+        for index, data in chunk:
+            if data["company_id"] not in known_companies:
+                message = str(CompanyNotFoundException(data["company_id"]))
+                results.append(_rejected(index, {"company_id": [message]}))
+            else:
+                rows.append((index, {**job_values(data), "version": 1}))
+        if not rows:
+            return results
+
+        try:
+            with UnitOfWork():
+                ids = self.job_repository.insert_many([values for _, values in rows])
+                self.stats_repository.add_jobs(ids)
+        except SQLAlchemyError as error:
+            # e.g. a referenced company deleted since it was resolved.
+            message = f"Chunk rejected: {error.__class__.__name__}"
+            return results + [_rejected(index, {"_schema": [message]}) for index, _ in rows]
+        return results + [
+            {"index": index, "status": "created", "id": job_id}
+            for (index, _), job_id in zip(rows, ids)
+        ]
 
-        if "company_id" in data:
-            company = self.company_repository.find_by_id(data["company_id"])
-            if not company:
-                raise CompanyNotFoundException(data["company_id"])
+    def update_job(
+        self, job_id: int, data: dict, expected_version: Optional[int] = None
+    ) -> Job:
+        """Apply a partial update in a single versioned UPDATE.
 
+        ``expected_version`` (from If-Match) turns the update into a
+        compare-and-set; a stale version raises PreconditionFailedException.
+        Updates to columns the statistics rollups are computed from move the
+        job's counts in the same transaction.
+        """
         enum_keys = {
             "job_type": JobType,
             "experience_level": ExperienceLevel,
             "remote_option": RemoteOption,
         }
-        for key, value in data.items():
-            if key in enum_keys:
-                setattr(job, key, enum_keys[key][value])
-            elif hasattr(job, key):
-                setattr(job, key, value)
+        values = {
+            key: enum_keys[key][value] if key in enum_keys else value
+            for key, value in data.items()
+            if hasattr(Job, key)
+        }
 
-        try:
-            return self.job_repository.save(job)
-        except StaleDataError:
-            raise OptimisticLockException()
+        counted = not STATS_FIELDS.isdisjoint(values)
+        with UnitOfWork():
+            if counted:
+                self.stats_repository.remove_jobs([job_id])
+            try:
+                job = self.job_repository.update_versioned(job_id, values, expected_version)
+            except IntegrityError:
+                # The only constraint a partial update can violate is the company FK.
+                if "company_id" in data:
+                    raise CompanyNotFoundException(data["company_id"])
+                raise
+            if job is None:
+                if not self.job_repository.exists(job_id):
+                    raise JobNotFoundException(job_id)
+                if expected_version is not None:
+                    raise PreconditionFailedException()
+                raise OptimisticLockException()
+            if counted:
+                self.stats_repository.add_jobs([job_id])
+            on_commit(partial(entity_cache.invalidate, "job", job_id))
+        return job
 
+    @transactional
     def delete_job(self, job_id: int) -> None:
-        job = self.get_job_by_id(job_id)
+        job = self._find_job(job_id)
+        self.stats_repository.remove_jobs([job_id])
         self.job_repository.delete(job)
+        on_commit(partial(entity_cache.invalidate, "job", job_id))
+
+    def expire_jobs(self) -> dict:
+        """Deactivate active jobs whose expiry date has passed (the sweeper task).
+
+        Works JOB_EXPIRY_BATCH_SIZE jobs at a time, each batch locked with
+        FOR UPDATE SKIP LOCKED and committed in its own short transaction
+        together with its statistics deltas, so API writes are never waited
+        on: a job someone is editing is left for the next sweep. Stops after
+        JOB_EXPIRY_MAX_BATCHES batches. Returns the throughput figures.
+
+        Cache invalidations reach other processes only through a shared
+        ENTITY_CACHE_BACKEND; with "lru", API workers serve a swept job as
+        active until their entry's ENTITY_CACHE_TTL runs out.
+        """
+        batch_size = current_app.config["JOB_EXPIRY_BATCH_SIZE"]
+        max_batches = current_app.config["JOB_EXPIRY_MAX_BATCHES"]
+        now = utc_now()
+        started = time.perf_counter()
+        deactivated = batches = 0
+        while batches < max_batches:
+            with UnitOfWork():
+                locked = self.job_repository.lock_expired(now, batch_size)
+                job_ids = [job_id for job_id, _ in locked]
+                if job_ids:
+                    self.stats_repository.remove_jobs(job_ids)
+                    self.job_repository.deactivate(locked, now)
+                    self.stats_repository.add_jobs(job_ids)
+                    on_commit(partial(_invalidate_jobs, job_ids))
+            if job_ids:
+                deactivated += len(job_ids)
+                batches += 1
+            if len(job_ids) < batch_size:
+                break
+        seconds = time.perf_counter() - started
+        return {
+            "deactivated": deactivated,
+            "batches": batches,
+            "seconds": round(seconds, 3),
+            "rows_per_sec": round(deactivated / seconds, 1) if seconds else 0.0,
+        }
+
+
+def _invalidate_jobs(job_ids: Sequence[int]) -> None:
+    for job_id in job_ids:
+        entity_cache.invalidate("job", job_id)
+
+
+def _rejected(index: int, errors: dict) -> dict:
+    return {"index": index, "status": "rejected", "errors": errors}
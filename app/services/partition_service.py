@@ -0,0 +1,64 @@
+from datetime import date
+from typing import List
+
+from flask import current_app
+from injector import inject
+
+from app.extensions import entity_cache
+from app.repositories.partition_repository import PartitionRepository
+from app.utils.datetime_utils import utc_now
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class PartitionService:
+    @inject
+    def __init__(self, partition_repository: PartitionRepository):
+        self.partition_repository = partition_repository
+
+    def ensure_partitions(self, first: date, last: date) -> List[str]:
+        """Create the monthly partitions from ``first``'s month through ``last``'s; returns the new ones."""
+        created = []
+        month = month_start(first)
+        while month <= last:
+            if self.partition_repository.create_partition(month):
+                created.append(f"job_p{month:%Y%m}")
+            month = add_months(month, 1)
+        return created
+
+    def maintain(self) -> List[str]:
+        """Make sure partitions exist from this month to JOB_PARTITION_MONTHS_AHEAD ahead."""
+        this_month = month_start(utc_now().date())
+        return self.ensure_partitions(
+            this_month, add_months(this_month, current_app.config["JOB_PARTITION_MONTHS_AHEAD"])
+        )
+
+    def archive(self, before: date) -> List[str]:
+        """Move the partitions of months ending on or before ``before`` to archive.job.
+
+        Archived jobs leave the job table, and with it every list, search,
+        statistic and ``/api/jobs/<id>``; ``/api/jobs/archive/<id>`` still
+        finds them. Run ``StatsService.rebuild`` afterwards.
+
+        Clearing the entity cache reaches other processes only through a
+        shared ENTITY_CACHE_BACKEND. With "lru", ``flask partitions archive``
+        clears only its own cache, and API workers still serve an archived
+        job from ``/api/jobs/<id>`` until their entry's ENTITY_CACHE_TTL
+        runs out.
+        """
+        archived = []
+        for name, month in self.partition_repository.find_partitions():
+            if add_months(month, 1) > before:
+                break
+            self.partition_repository.archive_partition(name, current_app.config["JOB_ARCHIVE_LOCK_TIMEOUT_MS"])
+            archived.append(name)
+        if archived:
+            entity_cache.clear()
+        return archived
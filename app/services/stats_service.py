@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from flask import current_app
+from injector import inject
+
+from app.exceptions.custom_exceptions import CompanyNotFoundException
+from app.repositories.company_repository import CompanyRepository
+from app.repositories.job_stats_repository import JobStatsRepository
+from app.repositories.unit_of_work import transactional
+from app.utils.datetime_utils import utc_now
+
+CENTS = Decimal("0.01")
+
+
+def histogram_percentiles(
+    buckets: Sequence[Tuple[Decimal, int]], width: int, percentiles: Iterable[int]
+) -> Dict[str, Decimal]:
+    """Percentiles of values binned into ``width`` wide (lower bound, count) buckets.
+
+    Values are assumed evenly spread within a bucket, so a percentile is
+    interpolated linearly inside the bucket it falls in; the error is at
+    most one bucket width.
+    """
+    total = sum(count for _, count in buckets)
+    result = {}
+    for percentile in percentiles:
+        rank = Decimal(total * percentile) / 100
+        seen = 0
+        for lower, count in buckets:
+            if seen + count >= rank:
+                break
+            seen += count
+        value = Decimal(lower) + Decimal(width) * (rank - seen) / count
+        result[f"p{percentile}"] = value.quantize(CENTS)
+    return result
+
+
+def _series(points: Sequence[Tuple[date, int]], start: date, end: date, step: timedelta) -> List[dict]:
+    """One entry per period from ``start`` to ``end``, zero where nothing was posted."""
+    counts = dict(points)
+    series = []
+    period = start
+    while period <= end:
+        series.append({"period": period, "count": counts.get(period, 0)})
+        period += step
+    return series
+
+
+class StatsService:
+    """Job statistics read from the rollup tables, in time proportional to their size."""
+
+    @inject
+    def __init__(self, stats_repository: JobStatsRepository, company_repository: CompanyRepository):
+        self.stats_repository = stats_repository
+        self.company_repository = company_repository
+
+    def get_job_stats(self, days: int, weeks: int, company_id: Optional[int] = None) -> dict:
+        """Job counts, postings over the last ``days`` days and ``weeks`` ISO weeks, salary percentiles."""
+        today = utc_now().date()
+        first_day = today - timedelta(days=days - 1)
+        first_week = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+        total, active = self.stats_repository.job_counts(company_id)
+        return {
+            "total_jobs": total,
+            "active_jobs": active,
+            "postings_per_day": _series(
+                self.stats_repository.postings_per_day(first_day, company_id),
+                first_day, today, timedelta(days=1),
+            ),
+            "postings_per_week": _series(
+                self.stats_repository.postings_per_week(first_week, company_id),
+                first_week, today, timedelta(weeks=1),
+            ),
+            "salary_percentiles": self._salary_percentiles(company_id),
+        }
+
+    def get_company_stats(self, company_id: int, days: int, weeks: int) -> dict:
+        if not self.company_repository.exists(company_id):
+            raise CompanyNotFoundException(company_id)
+        return {"company_id": company_id, **self.get_job_stats(days, weeks, company_id)}
+
+    def _salary_percentiles(self, company_id: Optional[int]) -> List[dict]:
+        width = current_app.config["JOB_STATS_SALARY_BUCKET"]
+        percentiles = current_app.config["JOB_STATS_PERCENTILES"]
+        rows = self.stats_repository.salary_histogram(company_id)
+        result = []
+        for level, level_rows in groupby(rows, key=lambda row: row[0]):
+            buckets = [(bucket, jobs) for _, bucket, jobs in level_rows]
+            result.append({
+                "experience_level": level,
+                "jobs": sum(jobs for _, jobs in buckets),
+                "percentiles": histogram_percentiles(buckets, width, percentiles),
+            })
+        return result
+
+    @transactional
+    def rebuild(self) -> Dict[str, int]:
+        """Recompute all rollups from the job table (backfills, drift after out-of-band writes)."""
+        return self.stats_repository.rebuild()
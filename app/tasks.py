@@ -0,0 +1,54 @@
+"""Celery tasks.
+
+Worker entry point: ``celery -A app.tasks.celery worker`` (see docker-compose.yml).
+The worker builds its app with the config named by FLASK_CONFIG
+(``production`` by default; ``development`` turns on DEBUG and SQL echo).
+"""
+import os
+
+from celery import shared_task
+from flask import current_app
+
+
+@shared_task
+def delete_company_in_chunks(deletion_id: int) -> None:
+    from app.services.company_service import CompanyService
+
+    current_app.extensions["injector"].get(CompanyService).run_deletion(deletion_id)
+
+
+@shared_task
+def rebuild_job_stats() -> None:
+    from app.services.stats_service import StatsService
+
+    written = current_app.extensions["injector"].get(StatsService).rebuild()
+    current_app.logger.info("Rebuilt job statistics rollups: %s", written)
+
+
+@shared_task
+def expire_jobs() -> dict:
+    from app.services.job_service import JobService
+
+    result = current_app.extensions["injector"].get(JobService).expire_jobs()
+    current_app.logger.info(
+        "Expired %(deactivated)s jobs in %(batches)s batches (%(seconds)ss, %(rows_per_sec)s rows/s)", result
+    )
+    return result
+
+
+@shared_task
+def maintain_job_partitions() -> None:
+    from app.services.partition_service import PartitionService
+
+    created = current_app.extensions["injector"].get(PartitionService).maintain()
+    current_app.logger.info("Created job partitions: %s", created or "none")
+
+
+def __getattr__(name):
+    # Build the worker's Flask app lazily, so that importing this module to
+    # enqueue a task from the web app does not create a second app.
+    if name == "celery":
+        from app import create_app
+
+        return create_app(os.environ.get("FLASK_CONFIG", "production")).extensions["celery"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,115 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+from flask import Response, request
+from werkzeug.http import http_date, quote_etag
+
+from app.exceptions.custom_exceptions import PreconditionFailedException
+
+# (id, version, updated_at) of one row contributing to a response body.
+Stamp = Tuple[int, int, Optional[datetime]]
+# Attributes stamp_of reads; narrowed (sparse fieldset) loads always include them.
+STAMP_FIELDS = ("id", "version", "updated_at")
+
+
+@dataclass(frozen=True)
+class Validators:
+    """ETag / Last-Modified pair describing one representation."""
+
+    etag: str
+    last_modified: Optional[datetime] = None
+    weak: bool = False
+
+    @property
+    def headers(self) -> dict:
+        headers = {"ETag": quote_etag(self.etag, self.weak)}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = http_date(self.last_modified)
+        return headers
+
+    def matches(self) -> bool:
+        """True when the client's cached copy (If-None-Match / If-Modified-Since) is current."""
+        if request.if_none_match:
+            # If-None-Match always uses the weak comparison (RFC 9110, 13.1.2).
+            return request.if_none_match.contains_weak(self.etag)
+        since = request.if_modified_since
+        if since is None or self.last_modified is None:
+            return False
+        return self.last_modified.replace(microsecond=0) <= since
+
+
+def stamp_of(entity: Any) -> Stamp:
+    return entity.id, entity.version, entity.updated_at
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # DateTime columns are stored without a zone and always hold UTC.
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def _digest(parts: Iterable[Any]) -> str:
+    return hashlib.sha1(repr(tuple(parts)).encode("utf-8")).hexdigest()
+
+
+def _latest(stamps: Sequence[Stamp]) -> Optional[datetime]:
+    updated = [_as_utc(updated_at) for _, _, updated_at in stamps if updated_at is not None]
+    return max(updated) if updated else None
+
+
+def entity_validators(*stamps: Stamp) -> Validators:
+    """Strong validators for a single entity plus any rows embedded in its payload.
+
+    The tag is the entity's version followed by the versions of embedded rows
+    (``"3"`` for a company, ``"3-7"`` for a job and its company), so it can be
+    sent back verbatim in If-Match.
+    """
+    etag = "-".join(str(version) for _, version, _ in stamps)
+    return Validators(etag=etag, last_modified=_latest(stamps))
+
+
+def expected_version() -> Optional[int]:
+    """Version named by the request's If-Match header; None when absent or ``*``.
+
+    Only the leading part of the tag is used, so a job PATCH is not rejected
+    because its embedded company changed in the meantime.
+    """
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+    versions = {tag.split("-", 1)[0] for tag in if_match.as_set()}
+    if len(versions) != 1 or not next(iter(versions)).isdigit():
+        # Weak, foreign or conflicting tags can never match the current version.
+        raise PreconditionFailedException()
+    return int(versions.pop())
+
+
+def collection_validators(stamps: Sequence[Stamp], *key: Any) -> Validators:
+    """Weak validators for a list or search page.
+
+    ``key`` identifies the query (query string, totals) so different pages or
+    filters never share a tag; the row count, latest ``updated_at`` and row
+    ids cover inserts, edits and deletes within the page.
+    """
+    latest = _latest(stamps)
+    parts = (key, len(stamps), latest, tuple(row_id for row_id, _, _ in stamps))
+    return Validators(etag=_digest(parts), last_modified=latest, weak=True)
+
+
+def is_conditional() -> bool:
+    """True when the request carries a validator worth checking before loading data."""
+    return bool(request.if_none_match) or request.if_modified_since is not None
+
+
+def not_modified(validators: Validators) -> Response:
+    return Response(status=304, headers=validators.headers)
+
+
+def conditional_response(validators: Validators, body: Any, headers: Optional[dict] = None):
+    """Answer 304 when the client's copy is current; otherwise ``body`` with validators attached."""
+    if validators.matches():
+        return not_modified(validators)
+    return body, 200, {**(headers or {}), **validators.headers}
@@ -5,9 +5,14 @@ from marshmallow import ValidationError
 from sqlalchemy.orm.exc import StaleDataError
 
 from app.exceptions.custom_exceptions import (
+    CompanyDeletionNotFoundException,
     CompanyNotFoundException,
+    DuplicateCompanyException,
+    InvalidCursorException,
+    InvalidPayloadException,
     JobNotFoundException,
     OptimisticLockException,
+    PreconditionFailedException,
 )
 
 
@@ -20,6 +25,22 @@ def register_error_handlers(app):
     def handle_company_not_found(error):
         return jsonify({"message": str(error), "status": 404}), 404
 
+    @app.errorhandler(CompanyDeletionNotFoundException)
+    def handle_company_deletion_not_found(error):
+        return jsonify({"message": str(error), "status": 404}), 404
+
+    @app.errorhandler(DuplicateCompanyException)
+    def handle_duplicate_company(error):
+        return jsonify({"message": str(error), "status": 409}), 409
+
+    @app.errorhandler(InvalidCursorException)
+    def handle_invalid_cursor(error):
+        return jsonify({"message": str(error), "status": 400}), 400
+
+    @app.errorhandler(InvalidPayloadException)
+    def handle_invalid_payload(error):
+        return jsonify({"message": str(error), "status": 400}), 400
+
     @app.errorhandler(ValidationError)
     def handle_validation_error(error):
         return (
@@ -33,6 +54,13 @@ def register_error_handlers(app):
             400,
         )
 
+    @app.errorhandler(PreconditionFailedException)
+    def handle_precondition_failed(error):
+        return (
+            jsonify({"message": "If-Match does not match the current version", "status": 412}),
+            412,
+        )
+
     @app.errorhandler(OptimisticLockException)
     @app.errorhandler(StaleDataError)
     def handle_optimistic_lock(error):
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from typing import Any, Iterable, Iterator, List
+
+from marshmallow import Schema
+
+EXPORT_MIMETYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _flatten(data: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def _drain(buffer: io.StringIO) -> str:
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return value
+
+
+def csv_columns(schema: Schema) -> List[str]:
+    """Column names for ``schema`` with nested schemas flattened to dotted keys."""
+    columns = []
+    for name, field in schema.fields.items():
+        nested = getattr(field, "schema", None)
+        if nested is not None:
+            columns.extend(f"{name}.{column}" for column in csv_columns(nested))
+        else:
+            columns.append(name)
+    return columns
+
+
+def iter_ndjson(items: Iterable[Any], schema: Schema, chunk_size: int) -> Iterator[str]:
+    """Yield newline-delimited JSON, one object per item, ``chunk_size`` lines per chunk."""
+    lines = []
+    for item in items:
+        lines.append(json.dumps(schema.dump(item), separators=(",", ":")))
+        if len(lines) >= chunk_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def iter_csv(items: Iterable[Any], schema: Schema, chunk_size: int) -> Iterator[str]:
+    """Yield a header row and then CSV rows, ``chunk_size`` rows per chunk."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=csv_columns(schema), extrasaction="ignore")
+    writer.writeheader()
+    yield _drain(buffer)
+    rows = 0
+    for item in items:
+        writer.writerow(_flatten(schema.dump(item)))
+        rows += 1
+        if rows >= chunk_size:
+            yield _drain(buffer)
+            rows = 0
+    if rows:
+        yield _drain(buffer)
@@ -0,0 +1,135 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Sequence
+
+from flask import Response, current_app
+from marshmallow import Schema, fields
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib encoder produces the same bytes
+    orjson = None
+
+RowSerializer = Callable[[Sequence[Any]], dict]
+
+# Compiled serializers, least recently used first. Sparse fieldsets (?fields=)
+# make the key space as large as the clients want, so the cache is bounded.
+SERIALIZER_CACHE_SIZE = 256
+_serializers: "OrderedDict[tuple, RowSerializer]" = OrderedDict()
+_serializers_lock = threading.Lock()
+
+
+def _column(index: Dict[str, int], key: str, field_name: str) -> str:
+    if key not in index:
+        raise TypeError(f"Row has no column {key!r} for field {field_name!r}")
+    return f"row[{index[key]}]"
+
+
+def _value_source(field: fields.Field, name: str, index: Dict[str, int], prefix: str, sort_keys: bool) -> str:
+    """Python expression reproducing ``field``'s marshmallow output from a row."""
+    if isinstance(field, fields.Nested):
+        nested_prefix = f"{prefix}{name}__"
+        body, first = _dict_source(field.schema, index, nested_prefix, sort_keys)
+        return f"(None if {first} is None else {body})"
+    value = _column(index, f"{prefix}{name}", name)
+    if isinstance(field, fields.Decimal) and field.as_string and field.places is None:
+        return f"(None if {value} is None else format({value}, 'f'))"
+    if type(field) is fields.DateTime and field.format in (None, "iso"):
+        return f"(None if {value} is None else {value}.isoformat())"
+    if isinstance(field, fields.Enum):
+        attr = "value" if field.by_value else "name"
+        return f"(None if {value} is None else {value}.{attr})"
+    if isinstance(field, (fields.Integer, fields.String, fields.Boolean)) and not getattr(field, "as_string", False):
+        return value
+    raise TypeError(f"{type(field).__name__} field {name!r} has no row serializer")
+
+
+def _dict_source(schema: Schema, index: Dict[str, int], prefix: str, sort_keys: bool):
+    items = [
+        (field.data_key or name, _value_source(field, name, index, prefix, sort_keys))
+        for name, field in schema.dump_fields.items()
+    ]
+    if sort_keys:
+        items.sort()
+    body = "{" + ", ".join(f"{key!r}: {source}" for key, source in items) + "}"
+    first_name = next(iter(schema.dump_fields))
+    return body, _column(index, f"{prefix}{first_name}", first_name)
+
+
+def compile_row_serializer(schema: Schema, keys: Sequence[str], sort_keys: bool = True) -> RowSerializer:
+    """Build a function turning one projected row into ``schema.dump(entity)``.
+
+    ``keys`` are the row's column labels; nested schema fields read columns
+    labelled ``<field>__<column>`` (``company__name``). The function is
+    generated as a single dict display, so dumping a row costs one call
+    instead of a marshmallow field walk. Schemas using field types or
+    options without a row equivalent raise TypeError here rather than
+    producing different output.
+    """
+    index = {key: position for position, key in enumerate(keys)}
+    body, _ = _dict_source(schema, index, "", sort_keys)
+    source = f"def serialize(row):\n    return {body}\n"
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, f"<row serializer for {type(schema).__name__}>", "exec"), namespace)
+    return namespace["serialize"]
+
+
+def row_serializer(schema: Schema, keys: Sequence[str]) -> RowSerializer:
+    """Cached compile_row_serializer for the app's key ordering (LRU of SERIALIZER_CACHE_SIZE)."""
+    sort_keys = current_app.json.sort_keys
+    cache_key = (type(schema), tuple(schema.dump_fields), tuple(keys), sort_keys)
+    with _serializers_lock:
+        serializer = _serializers.get(cache_key)
+        if serializer is not None:
+            _serializers.move_to_end(cache_key)
+            return serializer
+    serializer = compile_row_serializer(schema, keys, sort_keys)
+    with _serializers_lock:
+        _serializers[cache_key] = serializer
+        while len(_serializers) > SERIALIZER_CACHE_SIZE:
+            _serializers.popitem(last=False)
+    return serializer
+
+
+def dumps(payload: Any) -> bytes:
+    """Encode JSON-native ``payload`` exactly as ``flask.jsonify`` would, plus its newline.
+
+    orjson is used when installed and its output is byte-identical: compact
+    output with nothing that ``ensure_ascii`` would escape (non-ASCII and
+    DEL), or any compact output when the app does not escape. Keys are not
+    re-sorted; row serializers already emit them in order.
+    """
+    provider = current_app.json
+    indent = (provider.compact is None and current_app.debug) or provider.compact is False
+    if orjson is not None and not indent:
+        data = orjson.dumps(payload)
+        if not provider.ensure_ascii or (data.isascii() and b"\x7f" not in data):
+            return data + b"\n"
+    text = json.dumps(
+        payload,
+        ensure_ascii=provider.ensure_ascii,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+    )
+    return f"{text}\n".encode("utf-8")
+
+
+def rows_response(schema: Schema, rows: Sequence[Any]) -> Response:
+    """JSON array response for projected rows, matching ``schema.dump(many=True)`` + jsonify."""
+    payload = []
+    if rows:
+        serialize = row_serializer(schema, rows[0]._fields)
+        payload = [serialize(row) for row in rows]
+    return current_app.response_class(dumps(payload), mimetype=current_app.json.mimetype)
+
+
+def row_response(schema: Schema, row: Any) -> Response:
+    """JSON object response for one projected row, matching ``schema.dump`` + jsonify."""
+    payload = row_serializer(schema, row._fields)(row)
+    return current_app.response_class(dumps(payload), mimetype=current_app.json.mimetype)
+
+
+def schema_response(schema: Schema, obj: Any) -> Response:
+    """``jsonify(schema.dump(obj))`` for responses whose schema is chosen per request (sparse fieldsets)."""
+    return current_app.json.response(schema.dump(obj))
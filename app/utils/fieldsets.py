@@ -0,0 +1,22 @@
+from typing import Optional, Sequence, Set
+
+# A sparse fieldset: dotted field paths from ?fields=, or None for every field.
+FieldSetPaths = Optional[Sequence[str]]
+
+
+def includes(fieldset: FieldSetPaths, name: str) -> bool:
+    """True when field ``name`` (whole or any of its nested fields) is part of the response."""
+    return fieldset is None or any(path.partition(".")[0] == name for path in fieldset)
+
+
+def top_level(fieldset: Sequence[str]) -> Set[str]:
+    """Top-level field names of a fieldset (``company.name`` counts as ``company``)."""
+    return {path.partition(".")[0] for path in fieldset}
+
+
+def nested(fieldset: Sequence[str], name: str) -> Optional[Set[str]]:
+    """Fields requested inside ``name``; None when ``name`` itself is requested whole."""
+    if name in fieldset:
+        return None
+    prefix = f"{name}."
+    return {path[len(prefix):] for path in fieldset if path.startswith(prefix)}
@@ -0,0 +1,105 @@
+import codecs
+import json
+from typing import IO, Any, Iterator
+
+from app.exceptions.custom_exceptions import InvalidPayloadException
+
+NDJSON_MIMETYPES = {"application/x-ndjson", "application/jsonl", "application/ndjson"}
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+class MalformedRecord:
+    """Placeholder for an NDJSON line that is not valid JSON; reported as a rejected row."""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+def _iter_text(stream: IO[bytes], chunk_size: int) -> Iterator[str]:
+    decode = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            tail = decode.decode(b"", final=True)
+            if tail:
+                yield tail
+            return
+        yield decode.decode(chunk)
+
+
+def iter_ndjson_records(stream: IO[bytes], chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Parse one JSON value per line; blank lines are skipped, bad lines become MalformedRecord."""
+    pending = ""
+    for text in _iter_text(stream, chunk_size):
+        pending += text
+        *lines, pending = pending.split("\n")
+        yield from _parse_lines(lines)
+    yield from _parse_lines([pending])
+
+
+def _parse_lines(lines) -> Iterator[Any]:
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            yield MalformedRecord(f"Invalid JSON: {error}")
+
+
+def iter_json_array(stream: IO[bytes], chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without buffering the whole body.
+
+    A syntax error in the array itself cannot be attributed to a row, so it
+    raises InvalidPayloadException after the elements parsed so far.
+    """
+    chunks = _iter_text(stream, chunk_size)
+    buffer, pos, exhausted = "", 0, False
+    expect = "["
+
+    def fill() -> bool:
+        nonlocal buffer, pos, exhausted
+        if exhausted:
+            return False
+        buffer, pos = buffer[pos:], 0
+        for text in chunks:
+            buffer += text
+            return True
+        exhausted = True
+        return False
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        if pos == len(buffer):
+            if fill():
+                continue
+            raise InvalidPayloadException("Unexpected end of JSON array")
+
+        char = buffer[pos]
+        if expect == "[":
+            if char != "[":
+                raise InvalidPayloadException("Request body must be a JSON array or NDJSON")
+            pos, expect = pos + 1, "value"
+        elif expect == "separator" or (expect == "value" and char == "]"):
+            if char == "]":
+                return
+            if char != ",":
+                raise InvalidPayloadException(f"Expected ',' or ']' at offset {pos}")
+            pos, expect = pos + 1, "element"
+        else:
+            try:
+                value, end = _decoder.raw_decode(buffer, pos)
+            except ValueError as error:
+                # The element may simply be cut off at the end of the buffer.
+                if fill():
+                    continue
+                raise InvalidPayloadException(f"Invalid JSON: {error}")
+            if end == len(buffer) and not exhausted and isinstance(value, (int, float)):
+                # A number at the very end of the buffer may continue in the next chunk.
+                if fill():
+                    continue
+            pos, expect = end, "separator"
+            yield value
@@ -0,0 +1,175 @@
+"""Prometheus metrics: RED metrics per endpoint, DB pool gauges, cache counters.
+
+With several worker processes per host, set PROMETHEUS_MULTIPROC_DIR to
+an empty directory shared by the workers *before* they start (it is read
+when prometheus_client is imported). Every process then writes its
+samples to files there, and ``/metrics`` served by any worker aggregates
+all of them. Gauges only sum the processes that are still alive. A
+process manager should call
+``prometheus_client.multiprocess.mark_process_dead(pid)`` when a worker
+exits (gunicorn: ``child_exit``), and the directory should be emptied on
+restart.
+"""
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from flask import Flask, Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+from app.utils.pool_metrics import InstrumentedQueuePool
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by endpoint and status code.",
+    ["method", "blueprint", "endpoint", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent in the view and response hooks, by endpoint (streamed bodies excluded).",
+    ["method", "blueprint", "endpoint"],
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests being handled.",
+    ["blueprint"],
+    multiprocess_mode="livesum",
+)
+POOL_SIZE = Gauge(
+    "db_pool_size", "Configured pool_size, summed over processes.", multiprocess_mode="livesum"
+)
+POOL_MAX_OVERFLOW = Gauge(
+    "db_pool_max_overflow", "Configured max_overflow, summed over processes.", multiprocess_mode="livesum"
+)
+POOL_OPEN = Gauge(
+    "db_pool_connections_open", "Open database connections.", multiprocess_mode="livesum"
+)
+POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use", "Connections checked out of the pool.", multiprocess_mode="livesum"
+)
+POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connections checked out of the pool.")
+POOL_WAITS = Counter(
+    "db_pool_checkout_waits_total", "Checkouts that found no idle connection and no overflow headroom."
+)
+POOL_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after pool_timeout."
+)
+CACHE_HITS = Counter("cache_hits_total", "Cache lookups answered from the cache.", ["cache"])
+CACHE_MISSES = Counter("cache_misses_total", "Cache lookups that went to the database.", ["cache"])
+
+# Last per-process totals already added to the Prometheus counters.
+# Synced from after_request, so threads of one worker share it.
+_synced: Dict[str, int] = {}
+_synced_lock = threading.Lock()
+
+
+def _label(value: Optional[str]) -> str:
+    return value or "none"
+
+
+def _sync_counter(key: str, total: int, counter) -> None:
+    """Add the growth of a per-process running ``total`` to ``counter``.
+
+    A total below the last synced value means its source started over
+    (e.g. the pool was recreated), so all of it is new.
+    """
+    with _synced_lock:
+        last = _synced.get(key, 0)
+        counter.inc(total - last if total >= last else total)
+        _synced[key] = total
+
+
+class Metrics:
+    """Request, DB pool and cache metrics served at ``/metrics`` (when METRICS_ENABLED)."""
+
+    def __init__(self, app: Optional[Flask] = None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        if not app.config["METRICS_ENABLED"]:
+            return
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._teardown)
+        app.add_url_rule("/metrics", "metrics", self.metrics_view)
+
+        from app.extensions import db
+
+        with app.app_context():
+            self._watch_pool(db.engine)
+
+    @staticmethod
+    def _watch_pool(engine) -> None:
+        # Pool events on the engine follow its pool across dispose()/recreate().
+        event.listen(engine, "connect", lambda *_: POOL_OPEN.inc())
+        event.listen(engine, "close", lambda *_: POOL_OPEN.dec())
+        event.listen(engine, "close_detached", lambda *_: POOL_OPEN.dec())
+        event.listen(engine, "checkout", lambda *_: POOL_IN_USE.inc())
+        event.listen(engine, "checkin", lambda *_: POOL_IN_USE.dec())
+
+    @staticmethod
+    def _start() -> None:
+        if request.endpoint == "metrics":
+            return
+        g.metrics_started = time.perf_counter()
+        IN_FLIGHT.labels(_label(request.blueprint)).inc()
+
+    @staticmethod
+    def _finish(response):
+        started = g.get("metrics_started")
+        if started is None:
+            return response
+        blueprint = _label(request.blueprint)
+        endpoint = _label(request.endpoint)
+        REQUEST_LATENCY.labels(request.method, blueprint, endpoint).observe(time.perf_counter() - started)
+        REQUESTS.labels(request.method, blueprint, endpoint, str(response.status_code)).inc()
+        Metrics._sync_process_counters()
+        return response
+
+    @staticmethod
+    def _teardown(exc) -> None:
+        # Runs even when the request failed before after_request hooks.
+        if g.pop("metrics_started", None) is not None:
+            IN_FLIGHT.labels(_label(request.blueprint)).dec()
+
+    @staticmethod
+    def _sync_process_counters() -> None:
+        from app.extensions import db, entity_cache, facet_cache
+
+        for name, cache in (("entity", entity_cache), ("facet", facet_cache)):
+            stats = cache.stats()
+            _sync_counter(f"cache.{name}.hits", stats["hits"], CACHE_HITS.labels(name))
+            _sync_counter(f"cache.{name}.misses", stats["misses"], CACHE_MISSES.labels(name))
+        pool = db.engine.pool
+        if isinstance(pool, QueuePool):
+            # Set by every worker itself: values a preloading parent sets do not count for its children.
+            POOL_SIZE.set(pool.size())
+            POOL_MAX_OVERFLOW.set(max(pool._max_overflow, 0))
+        if isinstance(pool, InstrumentedQueuePool):
+            pool_metrics = pool.metrics()
+            _sync_counter("pool.checkouts", pool_metrics["checkouts"], POOL_CHECKOUTS)
+            _sync_counter("pool.waits", pool_metrics["waits"], POOL_WAITS)
+            _sync_counter("pool.timeouts", pool_metrics["timeouts"], POOL_TIMEOUTS)
+
+    @staticmethod
+    def metrics_view() -> Response:
+        """All processes' metrics in the Prometheus text exposition format."""
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
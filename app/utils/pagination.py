@@ -0,0 +1,89 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+from flask import current_app
+
+from app.exceptions.custom_exceptions import InvalidCursorException
+
+
+@dataclass
+class Page:
+    """One page of a keyset-paginated listing."""
+
+    items: List[Any]
+    per_page: int
+    sort: str
+    next_cursor: Optional[str] = None
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def metadata(self) -> dict:
+        return {
+            "per_page": self.per_page,
+            "sort": self.sort,
+            "has_next": self.has_next,
+            "next_cursor": self.next_cursor,
+            **self.extra,
+        }
+
+
+def resolve_per_page(per_page: Optional[int]) -> int:
+    """Clamp a requested page size to DEFAULT_PAGE_SIZE / MAX_PAGE_SIZE."""
+    if per_page is None:
+        return current_app.config["DEFAULT_PAGE_SIZE"]
+    return max(1, min(per_page, current_app.config["MAX_PAGE_SIZE"]))
+
+
+def offset_pagination(page: int, per_page: int, total: int) -> dict:
+    """Page-number pagination metadata for ranked results (search)."""
+    pages = -(-total // per_page) if total else 0
+    return {
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "pages": pages,
+        "has_prev": page > 1,
+        "has_next": page < pages,
+        "prev_num": page - 1 if page > 1 else None,
+        "next_num": page + 1 if page < pages else None,
+    }
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(sort: str, value: Any, row_id: int) -> str:
+    """Build an opaque cursor pointing just after (value, row_id) for the given sort."""
+    payload = json.dumps([sort, _encode_value(value), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """Return the raw (value, row_id) stored in a cursor issued for ``sort``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursorException(cursor)
+    if cursor_sort != sort or not isinstance(row_id, int):
+        raise InvalidCursorException(cursor)
+    return value, row_id
+
+
+def pagination_headers(page: Page) -> dict:
+    """Response headers carrying page metadata, so list bodies stay plain arrays."""
+    return {"X-Pagination": json.dumps(page.metadata)}
@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool, QueuePool
+
+# Upper bounds (ms) of the checkout latency histogram buckets; a last bucket catches the rest.
+CHECKOUT_BUCKETS_MS = (1, 5, 25, 100, 500, 2500)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout latency, waits, timeouts and new connections.
+
+    Counters live on the pool, so they are per process (every worker has
+    its own pool) and start over when the engine is disposed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "connects": 0,
+            "checkout_ms_total": 0.0,
+            "checkout_ms_max": 0.0,
+        }
+        self._checkout_buckets = [0] * (len(CHECKOUT_BUCKETS_MS) + 1)
+
+    def _must_wait(self) -> bool:
+        # Mirrors QueuePool._do_get: no idle connection and no overflow headroom left.
+        return (
+            self.checkedin() == 0
+            and self._max_overflow > -1
+            and self._overflow >= self._max_overflow
+        )
+
+    def connect(self):
+        waited = self._must_wait()
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self._record(waited, timed_out=True)
+            raise
+        self._record(waited, elapsed_ms=(time.perf_counter() - started) * 1000)
+        return connection
+
+    def _create_connection(self):
+        with self._metrics_lock:
+            self._metrics["connects"] += 1
+        return super()._create_connection()
+
+    def _record(self, waited: bool, elapsed_ms: Optional[float] = None, timed_out: bool = False) -> None:
+        with self._metrics_lock:
+            metrics = self._metrics
+            if waited:
+                metrics["waits"] += 1
+            if timed_out:
+                metrics["timeouts"] += 1
+                return
+            metrics["checkouts"] += 1
+            metrics["checkout_ms_total"] += elapsed_ms
+            metrics["checkout_ms_max"] = max(metrics["checkout_ms_max"], elapsed_ms)
+            bucket = next(
+                (i for i, bound in enumerate(CHECKOUT_BUCKETS_MS) if elapsed_ms <= bound),
+                len(CHECKOUT_BUCKETS_MS),
+            )
+            self._checkout_buckets[bucket] += 1
+
+    def metrics(self) -> dict:
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+            buckets = list(self._checkout_buckets)
+        checkouts = metrics.pop("checkouts")
+        total_ms = metrics.pop("checkout_ms_total")
+        return {
+            "checkouts": checkouts,
+            **metrics,
+            "checkout_ms_avg": total_ms / checkouts if checkouts else 0.0,
+            "checkout_ms_buckets": [
+                {"le": bound, "count": count}
+                for bound, count in zip(CHECKOUT_BUCKETS_MS + (None,), buckets)
+            ],
+        }
+
+
+def use_instrumented_pool(app) -> None:
+    """Make the app's engines use InstrumentedQueuePool unless the config picks a pool class."""
+    options = app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {})
+    if "poolclass" not in options:
+        # A copy: the dict belongs to the config class, shared by every app.
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {**options, "poolclass": InstrumentedQueuePool}
+
+
+def pool_stats(pool: Pool) -> dict:
+    """Current pool occupancy plus, for an InstrumentedQueuePool, its counters."""
+    stats = {"pid": os.getpid(), "pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            pool_size=pool.size(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            # QueuePool counts overflow from -pool_size; only connections beyond pool_size count here.
+            overflow=max(pool.overflow(), 0),
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(pool.metrics())
+    return stats
@@ -0,0 +1,217 @@
+"""Read-replica routing for repository reads.
+
+SQLALCHEMY_REPLICAS lists replica URIs; each becomes a Flask-SQLAlchemy
+bind (``replica_0``, ``replica_1``, ...) with the primary's engine options.
+Repository methods decorated with ``replica_read`` run on a replica when
+all of these hold, and on the primary otherwise:
+
+* the request is a GET or HEAD (writes, Celery tasks and CLI commands
+  read from the primary);
+* no UnitOfWork is active and nothing was written in this session yet,
+  so a request reads its own writes;
+* no ``use_primary()`` block is active;
+* a replica is healthy: it answers, and lags the primary by at most
+  REPLICA_MAX_LAG seconds.
+
+A session keeps the replica it was given, so one request sees one
+snapshot of the data. Requests are spread over the replicas round-robin.
+A replica that fails a lag check or a query sits out for
+REPLICA_RETRY_AFTER seconds; a read that failed on it is retried once on
+the primary.
+"""
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional
+
+from flask import Flask, current_app, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+READ_METHODS = ("GET", "HEAD")
+
+_READING = "replica_reading"
+_REPLICA = "replica_bind"
+_PRIMARY = "replica_primary_depth"
+_WROTE = "replica_wrote"
+
+# Replay lag; a replica that has replayed everything it received counts as current
+# (an idle primary would otherwise look further and further behind).
+LAG_SQL = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+class ReplicaSet:
+    """Round-robin over replica binds, skipping replicas that are down or lagging."""
+
+    def __init__(self, keys: List[str], max_lag: float, check_interval: float, retry_after: float):
+        self.keys = keys
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+        self._order = itertools.cycle(keys)
+        self._lock = threading.Lock()
+        self._down_until: Dict[str, float] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._lag: Dict[str, float] = {}
+
+    def choose(self, engines) -> Optional[str]:
+        """Bind key of the next healthy replica, or None to use the primary."""
+        for _ in range(len(self.keys)):
+            with self._lock:
+                key = next(self._order)
+            if self._healthy(key, engines[key]):
+                return key
+        return None
+
+    def mark_down(self, key: str) -> None:
+        with self._lock:
+            self._down_until[key] = time.monotonic() + self.retry_after
+            self._checked_at.pop(key, None)
+
+    def _healthy(self, key: str, engine) -> bool:
+        now = time.monotonic()
+        if self._down_until.get(key, 0) > now:
+            return False
+        if now - self._checked_at.get(key, float("-inf")) >= self.check_interval:
+            try:
+                with engine.connect() as connection:
+                    lag = float(connection.execute(LAG_SQL).scalar_one())
+            except DBAPIError:
+                self.mark_down(key)
+                return False
+            with self._lock:
+                self._lag[key] = lag
+                self._checked_at[key] = now
+        return self._lag[key] <= self.max_lag
+
+    def status(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "bind": key,
+                "up": self._down_until.get(key, 0) <= now,
+                "lag_seconds": self._lag.get(key),
+            }
+            for key in self.keys
+        ]
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends ``replica_read`` statements to a replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get(_READING) and not self._flushing:
+            key = self.info.get(_REPLICA)
+            if key is None:
+                key = self.info[_REPLICA] = current_app.extensions["replicas"].choose(self._db.engines)
+            if key is not None:
+                return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session, flush_context) -> None:
+    session.info[_WROTE] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _on_execute(state) -> None:
+    if not state.is_select:
+        state.session.info[_WROTE] = True
+
+
+def _replicas() -> Optional[ReplicaSet]:
+    return current_app.extensions.get("replicas") if has_app_context() else None
+
+
+def _may_use_replica(session) -> bool:
+    from app.repositories.unit_of_work import in_unit_of_work
+
+    return (
+        not in_unit_of_work()
+        and not session.info.get(_WROTE)
+        and not session.info.get(_PRIMARY)
+    )
+
+
+def replica_read(method: Callable) -> Callable:
+    """Run a read-only repository method on a replica when the rules above allow it."""
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        replica_set = _replicas()
+        if replica_set is None or not has_request_context() or request.method not in READ_METHODS:
+            return method(*args, **kwargs)
+
+        from app.extensions import db
+
+        session = db.session()
+        if session.info.get(_READING) or not _may_use_replica(session):
+            return method(*args, **kwargs)
+        session.info[_READING] = True
+        try:
+            return method(*args, **kwargs)
+        except OperationalError:
+            key = session.info.pop(_REPLICA, None)
+            if key is None:
+                raise
+            replica_set.mark_down(key)
+            session.rollback()
+        finally:
+            session.info[_READING] = False
+        with use_primary():
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """Read from the primary inside the block, even in ``replica_read`` methods."""
+    if _replicas() is None:
+        yield
+        return
+
+    from app.extensions import db
+
+    info = db.session.info
+    info[_PRIMARY] = info.get(_PRIMARY, 0) + 1
+    try:
+        yield
+    finally:
+        info[_PRIMARY] -= 1
+
+
+class Replicas:
+    """Registers SQLALCHEMY_REPLICAS as binds; call ``init_app`` before ``db.init_app``."""
+
+    def __init__(self, app: Optional[Flask] = None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        uris = app.config["SQLALCHEMY_REPLICAS"]
+        if not uris:
+            return
+        binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+        keys = []
+        for number, uri in enumerate(uris):
+            key = f"replica_{number}"
+            binds[key] = {**app.config["SQLALCHEMY_ENGINE_OPTIONS"], "url": uri}
+            keys.append(key)
+        app.config["SQLALCHEMY_BINDS"] = binds
+        app.extensions["replicas"] = ReplicaSet(
+            keys,
+            max_lag=app.config["REPLICA_MAX_LAG"],
+            check_interval=app.config["REPLICA_CHECK_INTERVAL"],
+            retry_after=app.config["REPLICA_RETRY_AFTER"],
+        )
@@ -0,0 +1,156 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from flask import Flask, current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("app.sql")
+
+_IN_LIST = re.compile(r"\(\s*%\(\w+\)s(?:\s*,\s*%\(\w+\)s)*\s*\)")
+_SPACE = re.compile(r"\s+")
+_local = threading.local()
+
+
+def statement_shape(statement: str) -> str:
+    """SQL text with whitespace collapsed and expanded IN lists reduced to one placeholder.
+
+    Statements are already parameterized, so equal shapes differ at most in
+    their parameter values.
+    """
+    return _IN_LIST.sub("(?)", _SPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """Statements executed during one request (or one ``capture_queries`` block)."""
+
+    def __init__(self, keep_statements: bool = False):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest: Optional[Tuple[float, str]] = None
+        self.shapes: Counter = Counter()
+        self.statements: Optional[List[str]] = [] if keep_statements else None
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if self.slowest is None or elapsed_ms > self.slowest[0]:
+            self.slowest = (elapsed_ms, statement)
+        if statement.lstrip()[:6].upper() == "SELECT":
+            self.shapes[statement_shape(statement)] += 1
+        if self.statements is not None:
+            self.statements.append(statement)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """SELECT shapes run at least ``threshold`` times: likely N+1 queries."""
+        return [(shape, runs) for shape, runs in self.shapes.most_common() if runs >= threshold]
+
+    def server_timing(self) -> str:
+        timing = f'db;dur={self.total_ms:.2f};desc="{self.count} queries"'
+        if self.slowest is not None:
+            timing += f", db-slowest;dur={self.slowest[0]:.2f}"
+        return timing
+
+
+def _collectors() -> List[QueryStats]:
+    collectors = []
+    if has_app_context() and "query_stats" in g:
+        collectors.append(g.query_stats)
+    collectors.extend(getattr(_local, "captures", ()))
+    return collectors
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_started"].pop()) * 1000
+    for stats in _collectors():
+        stats.record(statement, elapsed_ms)
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute.
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryStats]:
+    """Record every statement this thread executes inside the block, requests included.
+
+        with capture_queries() as stats:
+            client.get("/api/jobs/")
+        assert stats.count <= 2
+    """
+    stats = QueryStats(keep_statements=True)
+    captures = _local.__dict__.setdefault("captures", [])
+    captures.append(stats)
+    try:
+        yield stats
+    finally:
+        captures.remove(stats)
+
+
+class SqlInstrumentation:
+    """Per-request query count, DB time and slowest statement, with N+1 warnings.
+
+    Timings come from SQLAlchemy cursor events on every engine. When
+    SQL_INSTRUMENTATION is on, each request gets a ``Server-Timing`` header
+    (if SERVER_TIMING_HEADER is set) and an ``app.sql`` log line; SELECT
+    shapes repeated SQL_N_PLUS_ONE_THRESHOLD times or more raise it to a
+    warning. Queries a streamed response body runs after the view returns
+    are not included.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(Engine, "handle_error", _handle_error)
+        if app.config["SQL_INSTRUMENTATION"]:
+            app.before_request(self._start)
+            app.after_request(self._finish)
+
+    @staticmethod
+    def _start() -> None:
+        g.query_stats = QueryStats()
+
+    @staticmethod
+    def _finish(response):
+        stats = g.pop("query_stats", None)
+        if stats is None:
+            return response
+        if current_app.config["SERVER_TIMING_HEADER"]:
+            response.headers.add("Server-Timing", stats.server_timing())
+
+        repeated = stats.repeated(current_app.config["SQL_N_PLUS_ONE_THRESHOLD"])
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": stats.count,
+            "db_ms": round(stats.total_ms, 2),
+            "slowest_ms": round(stats.slowest[0], 2) if stats.slowest else 0,
+            "n_plus_one": len(repeated),
+        }
+        message = " ".join(f"{key}={value}" for key, value in fields.items())
+        if stats.slowest:
+            fields["slowest_sql"] = statement_shape(stats.slowest[1])[:500]
+        if repeated:
+            fields["repeated_sql"] = [{"sql": shape[:500], "runs": runs} for shape, runs in repeated]
+            logger.warning("sql %s (likely N+1: %s)", message, repeated[0][0][:200], extra={"sql": fields})
+        else:
+            logger.info("sql %s", message, extra={"sql": fields})
+        return response
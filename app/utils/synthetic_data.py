@@ -0,0 +1,351 @@
+"""Synthetic companies and jobs for load tests, streamed into Postgres with COPY.
+
+Rows are generated column-wise in fixed chunks (one ``random.choices`` call
+per column and chunk instead of per-row branching) and rendered straight
+into COPY text format, so nothing passes through the ORM. The output
+depends only on the seed, the row counts and ``as_of``; timestamps are
+naive UTC like the rest of the schema.
+"""
+import random
+import re
+import threading
+from datetime import date, timedelta
+from itertools import accumulate
+from queue import Empty, Full, Queue
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+from sqlalchemy import text
+
+from app.extensions import db
+from app.models.enums import ExperienceLevel, JobType, RemoteOption
+
+CHUNK_ROWS = 10_000
+DAY_SECONDS = 86_400
+
+COMPANY_COLUMNS = ("name", "description", "website", "location", "created_at", "updated_at", "version")
+JOB_COLUMNS = (
+    "title", "description", "company_id", "location", "salary_min", "salary_max",
+    "job_type", "experience_level", "remote_option", "posted_date", "expiry_date",
+    "is_active", "created_at", "updated_at", "version", "search_vector",
+)
+
+# (value, relative weight)
+JOB_TYPES = ((JobType.FULL_TIME, 70), (JobType.CONTRACT, 15), (JobType.PART_TIME, 10), (JobType.INTERNSHIP, 5))
+EXPERIENCE_LEVELS = ((ExperienceLevel.ENTRY, 25), (ExperienceLevel.MID, 45), (ExperienceLevel.SENIOR, 30))
+REMOTE_OPTIONS = ((RemoteOption.ONSITE, 45), (RemoteOption.HYBRID, 35), (RemoteOption.REMOTE, 20))
+LOCATIONS = (
+    ("New York", 14), ("San Francisco", 12), ("London", 10), ("Berlin", 8), ("Toronto", 6),
+    ("Austin", 6), ("Seattle", 6), ("Paris", 5), ("Amsterdam", 4), ("Madrid", 3),
+    ("Dublin", 3), ("Singapore", 3), ("Sydney", 2), ("Remote", 18),
+)
+ROLES = (
+    "Backend Engineer", "Frontend Engineer", "Full Stack Developer", "Data Engineer",
+    "Data Scientist", "Machine Learning Engineer", "DevOps Engineer", "Site Reliability Engineer",
+    "Mobile Developer", "QA Engineer", "Security Engineer", "Product Manager",
+    "Product Designer", "Engineering Manager", "Technical Writer", "Solutions Architect",
+)
+TITLE_PREFIXES = {ExperienceLevel.ENTRY: "Junior ", ExperienceLevel.MID: "", ExperienceLevel.SENIOR: "Senior "}
+# Yearly salary_min range per level; salary_max adds 5-40% on top.
+SALARY_RANGES = {
+    ExperienceLevel.ENTRY: (40_000, 75_000),
+    ExperienceLevel.MID: (65_000, 130_000),
+    ExperienceLevel.SENIOR: (110_000, 220_000),
+}
+SALARY_SHARE = 0.8  # jobs that publish a salary
+EXPIRY_DAYS = (30, 45, 60, 90)
+COMPANY_WORDS = (
+    "Acme", "Apex", "Blue", "Bright", "Cedar", "Cobalt", "Delta", "Ember", "Falcon", "Granite",
+    "Harbor", "Iris", "Juniper", "Keystone", "Lumen", "Maple", "Nimbus", "Orbit", "Pioneer", "Quartz",
+)
+COMPANY_SUFFIXES = ("Labs", "Systems", "Software", "Analytics", "Health", "Logistics", "Networks", "Studio")
+INDUSTRIES = ("fintech", "healthcare", "logistics", "e-commerce", "developer tools", "media", "education", "energy")
+SENTENCES = (
+    "You will design, build and operate services used by millions of people.",
+    "We value clear writing, small pull requests and thoughtful code review.",
+    "The team owns its roadmap and ships to production several times a day.",
+    "Experience with Python, PostgreSQL and cloud infrastructure is a plus.",
+    "You will mentor colleagues and help shape our engineering practices.",
+    "We offer flexible hours, a learning budget and generous parental leave.",
+    "Our stack includes Flask, React, Kubernetes and a fair amount of SQL.",
+    "You enjoy working closely with product, design and customer support.",
+)
+
+
+def _split(pairs):
+    values, weights = zip(*pairs)
+    return values, list(accumulate(weights))
+
+
+class SyntheticData:
+    """Deterministic generator of COPY-format company and job rows.
+
+    Postings are spread over the ``days`` days before ``as_of``. Text values
+    never contain tabs, newlines or backslashes, so they need no COPY
+    escaping.
+    """
+
+    def __init__(self, seed: int, as_of: date, days: int = 365, tail: float = 1.16):
+        self.random = random.Random(seed)
+        self.as_of = as_of
+        self.days = days
+        self.tail = tail  # Pareto shape of jobs per company: lower means a heavier tail
+        self.descriptions = [" ".join(self.random.sample(SENTENCES, 3)) for _ in range(64)]
+        # Timestamps are assembled from cached day and time-of-day strings.
+        first_day = as_of - timedelta(days=days)
+        self._dates = [(first_day + timedelta(days=n)).isoformat() for n in range(days + max(EXPIRY_DAYS) + 1)]
+        self._times = [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in range(DAY_SECONDS)]
+        self._salaries = {level: self._salary_pool(*bounds) for level, bounds in SALARY_RANGES.items()}
+
+    @staticmethod
+    def _salary_pool(low: int, high: int) -> Tuple[List[str], List[int]]:
+        """Every "salary_min<TAB>salary_max" for a level, and cumulative weights for choices()."""
+        ranges = [
+            f"{minimum}\t{(minimum * (100 + raise_pct) // 100 + 500) // 1000 * 1000}"
+            for minimum in range(low, high + 1, 1000)
+            for raise_pct in range(5, 41)
+        ]
+        # The last entry is a job without a published salary.
+        weights = [SALARY_SHARE / len(ranges)] * len(ranges) + [1 - SALARY_SHARE]
+        return ranges + ["\\N\t\\N"], list(accumulate(weights))
+
+    def _timestamps(self, size: int) -> List[Tuple[int, str]]:
+        """(day index, time of day) of ``size`` random instants in the posting window."""
+        span = self.days * DAY_SECONDS
+        seconds = [int(draw * span) for draw in [self.random.random() for _ in range(size)]]
+        return [(second // DAY_SECONDS, self._times[second % DAY_SECONDS]) for second in seconds]
+
+    def companies(self, count: int, first_number: int = 1) -> Iterator[str]:
+        """Chunks of company rows; ``first_number`` keeps names unique when appending."""
+        rng = self.random
+        locations, location_weights = _split(pair for pair in LOCATIONS if pair[0] != "Remote")
+        for start in range(0, count, CHUNK_ROWS):
+            size = min(CHUNK_ROWS, count - start)
+            words = rng.choices(COMPANY_WORDS, k=size)
+            suffixes = rng.choices(COMPANY_SUFFIXES, k=size)
+            industries = rng.choices(INDUSTRIES, k=size)
+            cities = rng.choices(locations, cum_weights=location_weights, k=size)
+            created = [f"{self._dates[day]} {clock}" for day, clock in self._timestamps(size)]
+            yield "".join(
+                f"{word} {suffix} {number}\tA {industry} company based in {city}.\t"
+                f"https://{word.lower()}-{suffix.lower()}-{number}.example.com\t{city}\t{at}\t{at}\t0\n"
+                for number, word, suffix, industry, city, at in zip(
+                    range(first_number + start, first_number + start + size),
+                    words, suffixes, industries, cities, created,
+                )
+            )
+
+    def company_weights(self, count: int) -> List[float]:
+        """Cumulative Pareto weights: a few companies get most of the jobs."""
+        return list(accumulate(self.random.paretovariate(self.tail) for _ in range(count)))
+
+    def job_texts(self) -> Set[str]:
+        """Every title, location and description a job can get."""
+        titles = {TITLE_PREFIXES[level] + role for level, _ in EXPERIENCE_LEVELS for role in ROLES}
+        return titles | {location for location, _ in LOCATIONS} | set(self.descriptions)
+
+    def jobs(
+        self,
+        count: int,
+        company_ids: Sequence[int],
+        search_vector: Callable[[str, int, str, str], str],
+    ) -> Iterator[str]:
+        """Chunks of job rows spread over ``company_ids`` with heavy-tailed sizes.
+
+        ``search_vector(title, company_id, location, description)`` renders
+        the search_vector column.
+        """
+        rng = self.random
+        cum_company_weights = self.company_weights(len(company_ids))
+        job_types, job_type_weights = _split(JOB_TYPES)
+        levels, level_weights = _split(EXPERIENCE_LEVELS)
+        remote_options, remote_weights = _split(REMOTE_OPTIONS)
+        locations, location_weights = _split(LOCATIONS)
+        titles = {level: [TITLE_PREFIXES[level] + role for role in ROLES] for level in levels}
+        dates = self._dates
+        for start in range(0, count, CHUNK_ROWS):
+            size = min(CHUNK_ROWS, count - start)
+            companies = rng.choices(company_ids, cum_weights=cum_company_weights, k=size)
+            types = [job_type.value for job_type in rng.choices(job_types, cum_weights=job_type_weights, k=size)]
+            row_levels = rng.choices(levels, cum_weights=level_weights, k=size)
+            remotes = [remote.value for remote in rng.choices(remote_options, cum_weights=remote_weights, k=size)]
+            cities = rng.choices(locations, cum_weights=location_weights, k=size)
+            roles = rng.choices(range(len(ROLES)), k=size)
+            descriptions = rng.choices(self.descriptions, k=size)
+            expiries = rng.choices(EXPIRY_DAYS, k=size)
+            salaries = {level: rng.choices(pool, cum_weights=weights, k=size)
+                        for level, (pool, weights) in self._salaries.items()}
+            listed = rng.choices("tf", cum_weights=(95, 100), k=size)
+            yield "".join(
+                f"{titles[level][role]}\t{description}\t{company_id}\t{city}\t{salaries[level][n]}\t"
+                f"{job_type}\t{level.value}\t{remote}\t{dates[day]} {clock}\t{dates[day + expiry]} {clock}\t"
+                f"{listed[n] if day + expiry >= self.days else 'f'}\t{dates[day]} {clock}\t{dates[day]} {clock}\t0\t"
+                f"{search_vector(titles[level][role], company_id, city, description)}\n"
+                for n, (company_id, job_type, level, remote, city, role, description, expiry, (day, clock))
+                in enumerate(zip(
+                    companies, types, row_levels, remotes, cities, roles, descriptions, expiries,
+                    self._timestamps(size),
+                ))
+            )
+
+
+class SearchVectors:
+    """job.search_vector values equal to what the job_search_vector() SQL function returns.
+
+    The trigger that normally fills the column runs to_tsvector() on every
+    row, which costs more than the COPY itself. Here Postgres parses each
+    distinct title, company name, location and description once, and a
+    row's vector is those pieces weighted A to D with their positions
+    shifted the way tsvector ``||`` shifts them; the tsvector input function
+    sorts and merges the lexemes.
+    """
+
+    _LEXEME = re.compile(r"('(?:[^']|'')*')(?::([0-9,]+))?")
+
+    def __init__(self, vectors: Dict[str, str], company_names: Dict[int, str]):
+        self._lexemes = {
+            piece: [
+                (lexeme, [int(position) for position in positions.split(",")] if positions else [])
+                for lexeme, positions in self._LEXEME.findall(vector)
+            ]
+            for piece, vector in vectors.items()
+        }
+        self._company_names = company_names
+        self._rendered: Dict[Tuple[str, str, int], Tuple[str, int]] = {}
+
+    def _piece(self, piece: str, weight: str, offset: int) -> Tuple[str, int]:
+        """``piece`` rendered with ``weight`` and shifted by ``offset``, and its highest position."""
+        key = (piece, weight, offset)
+        if key not in self._rendered:
+            lexemes = self._lexemes[piece]
+            self._rendered[key] = (
+                " ".join(
+                    f"{lexeme}:{','.join(f'{offset + position}{weight}' for position in positions)}"
+                    for lexeme, positions in lexemes
+                ),
+                max((max(positions) for _, positions in lexemes if positions), default=0),
+            )
+        return self._rendered[key]
+
+    def __call__(self, title: str, company_id: int, location: str, description: str) -> str:
+        parts, offset = [], 0
+        for piece, weight in (
+            (title, "A"), (self._company_names[company_id], "B"), (location, "C"), (description, "D")
+        ):
+            rendered, width = self._piece(piece, weight, offset)
+            if rendered:
+                parts.append(rendered)
+            offset += width
+        return " ".join(parts)
+
+
+def _prefetched(chunks: Iterable[str], depth: int = 2) -> Iterator[str]:
+    """Generate the next chunks in a thread while the current one is sent.
+
+    psycopg2 releases the GIL while it writes COPY data, so on more than
+    one core generation overlaps with the server's work.
+    """
+    queue: Queue = Queue(maxsize=depth)
+    stopped = threading.Event()
+    done = object()
+
+    def produce() -> None:
+        try:
+            for item in chunks:
+                while not stopped.is_set():
+                    try:
+                        queue.put(item, timeout=0.1)
+                        break
+                    except Full:
+                        continue
+            queue.put(done)
+        except BaseException as exc:  # re-raised in the consumer
+            queue.put(exc)
+
+    thread = threading.Thread(target=produce, name="seed-generator", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = queue.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+        try:
+            while True:
+                queue.get_nowait()  # unblock a final put()
+        except Empty:
+            pass
+        thread.join()
+
+
+class CopyStream:
+    """Read-only file over an iterator of text chunks, for ``cursor.copy_expert``."""
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+        self._position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if self._position >= len(self._buffer):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return b""
+            self._buffer, self._position = chunk.encode(), 0
+        end = len(self._buffer) if size is None or size < 0 else self._position + size
+        data = self._buffer[self._position:end]
+        self._position += len(data)
+        return data
+
+
+def copy_rows(table: str, columns: Sequence[str], chunks: Iterable[str]) -> None:
+    """COPY text-format ``chunks`` into ``table`` within the session's transaction."""
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN", CopyStream(_prefetched(chunks)), size=1 << 16
+        )
+    finally:
+        cursor.close()
+
+
+def load(
+    companies: int,
+    jobs: int,
+    seed: int,
+    as_of: date,
+    truncate: bool = False,
+    tail: float = 1.16,
+) -> Dict[str, int]:
+    """Insert ``companies`` new companies and ``jobs`` jobs spread over them, in one transaction.
+
+    The job search_vector trigger is disabled while the jobs are copied
+    (SearchVectors fills the column instead), which needs ownership of the
+    job table and blocks writes to it until the caller commits. Returns
+    the number of rows written per table.
+    """
+    data = SyntheticData(seed, as_of, tail=tail)
+    if truncate:
+        db.session.execute(text("TRUNCATE job, company, company_deletion RESTART IDENTITY CASCADE"))
+    last_id = db.session.execute(text("SELECT coalesce(max(id), 0) FROM company")).scalar_one()
+    copy_rows("company", COMPANY_COLUMNS, data.companies(companies, first_number=last_id + 1))
+    names = dict(db.session.execute(
+        text("SELECT id, name FROM company WHERE id > :last_id ORDER BY id"), {"last_id": last_id}
+    ).all())
+    if jobs and names:
+        vectors = dict(db.session.execute(
+            text(
+                "SELECT piece, CAST(to_tsvector('english', piece) AS text)"
+                " FROM unnest(CAST(:pieces AS text[])) AS piece"
+            ),
+            {"pieces": sorted(data.job_texts() | set(names.values()))},
+        ).all())
+        db.session.execute(text("ALTER TABLE job DISABLE TRIGGER job_search_vector_refresh"))
+        copy_rows("job", JOB_COLUMNS, data.jobs(jobs, list(names), SearchVectors(vectors, names)))
+        db.session.execute(text("ALTER TABLE job ENABLE TRIGGER job_search_vector_refresh"))
+    db.session.execute(text("ANALYZE company"))
+    db.session.execute(text("ANALYZE job"))
+    return {"company": len(names), "job": jobs if names else 0}
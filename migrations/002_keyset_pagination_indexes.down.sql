@@ -0,0 +1,5 @@
+CREATE INDEX IF NOT EXISTS idx_job_posted_date ON job(posted_date);
+DROP INDEX IF EXISTS idx_company_created_at_id;
+DROP INDEX IF EXISTS idx_company_name_id;
+DROP INDEX IF EXISTS idx_job_salary_min_id;
+DROP INDEX IF EXISTS idx_job_posted_date_id;
@@ -0,0 +1,12 @@
+-- Composite indexes backing keyset pagination on the list endpoints
+-- Migration: 002_keyset_pagination_indexes
+
+-- (sort column, id) indexes serve both sort directions and the
+-- (sort column, id) < (:value, :id) cursor predicate as one index range.
+CREATE INDEX IF NOT EXISTS idx_job_posted_date_id ON job(posted_date, id);
+CREATE INDEX IF NOT EXISTS idx_job_salary_min_id ON job(salary_min, id) WHERE salary_min IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_company_name_id ON company(name, id);
+CREATE INDEX IF NOT EXISTS idx_company_created_at_id ON company(created_at, id);
+
+-- Superseded by idx_job_posted_date_id
+DROP INDEX IF EXISTS idx_job_posted_date;
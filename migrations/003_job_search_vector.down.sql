@@ -0,0 +1,7 @@
+DROP INDEX IF EXISTS idx_job_search;
+DROP TRIGGER IF EXISTS company_search_vector_refresh ON company;
+DROP TRIGGER IF EXISTS job_search_vector_refresh ON job;
+DROP FUNCTION IF EXISTS company_search_vector_refresh();
+DROP FUNCTION IF EXISTS job_search_vector_refresh();
+DROP FUNCTION IF EXISTS job_search_vector(TEXT, TEXT, TEXT, TEXT);
+ALTER TABLE job DROP COLUMN IF EXISTS search_vector;
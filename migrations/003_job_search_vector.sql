@@ -0,0 +1,62 @@
+-- Full-text search over job title, company name, location and description
+-- Migration: 003_job_search_vector
+--
+-- search_vector is maintained by triggers rather than a generated column
+-- because it includes the company name, which lives in another table.
+-- The create_all section (functions and triggers) also runs after
+-- db.create_all() builds job (tests; see app/models/migration_ddl.py).
+
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+ALTER TABLE job ADD COLUMN IF NOT EXISTS search_vector TSVECTOR;
+
+-- create_all: begin
+CREATE OR REPLACE FUNCTION job_search_vector(title TEXT, description TEXT, location TEXT, company_name TEXT)
+RETURNS TSVECTOR LANGUAGE sql IMMUTABLE AS $$
+    SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(company_name, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(location, '')), 'C')
+        || setweight(to_tsvector('english', coalesce(description, '')), 'D')
+$$;
+
+CREATE OR REPLACE FUNCTION job_search_vector_refresh() RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := job_search_vector(
+        NEW.title, NEW.description, NEW.location,
+        (SELECT name FROM company WHERE id = NEW.company_id)
+    );
+    RETURN NEW;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION company_search_vector_refresh() RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE job
+    SET search_vector = job_search_vector(title, description, location, NEW.name)
+    WHERE company_id = NEW.id;
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS job_search_vector_refresh ON job;
+CREATE TRIGGER job_search_vector_refresh
+    BEFORE INSERT OR UPDATE OF title, description, location, company_id ON job
+    FOR EACH ROW EXECUTE FUNCTION job_search_vector_refresh();
+
+DROP TRIGGER IF EXISTS company_search_vector_refresh ON company;
+CREATE TRIGGER company_search_vector_refresh
+    AFTER UPDATE OF name ON company
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION company_search_vector_refresh();
+-- create_all: end
+
+-- Backfill existing rows
+UPDATE job
+SET search_vector = job_search_vector(job.title, job.description, job.location, company.name)
+FROM company
+WHERE company.id = job.company_id;
+
+-- btree_gin lets the enum filters live in the same GIN index as the
+-- tsvector, so a filtered search is answered by a single bitmap index scan.
+CREATE INDEX IF NOT EXISTS idx_job_search
+    ON job USING GIN (search_vector, job_type, experience_level, remote_option);
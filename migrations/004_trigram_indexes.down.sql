@@ -0,0 +1,3 @@
+DROP INDEX IF EXISTS idx_company_location_trgm;
+DROP INDEX IF EXISTS idx_job_title_trgm;
+DROP INDEX IF EXISTS idx_job_location_trgm;
@@ -0,0 +1,11 @@
+-- Trigram indexes for substring and fuzzy matching on free-text columns
+-- Migration: 004_trigram_indexes
+--
+-- gin_trgm_ops indexes serve ILIKE '%term%' as well as the pg_trgm
+-- similarity operators (%, <%) used for fuzzy filters and suggestions.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_job_location_trgm ON job USING GIN (location gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_job_title_trgm ON job USING GIN (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_company_location_trgm ON company USING GIN (location gin_trgm_ops);
@@ -0,0 +1,2 @@
+DROP INDEX IF EXISTS uq_company_normalized_name;
+ALTER TABLE company DROP COLUMN IF EXISTS normalized_name;
@@ -0,0 +1,35 @@
+-- Unique normalized company name backing set-based company upserts
+-- Migration: 005_company_normalized_name
+
+-- Case- and whitespace-insensitive key; must match
+-- app.models.company.NORMALIZED_NAME_SQL and normalized_name_expression().
+ALTER TABLE company
+    ADD COLUMN IF NOT EXISTS normalized_name VARCHAR(255)
+    GENERATED ALWAYS AS (lower(btrim(regexp_replace(name, '\s+', ' ', 'g')))) STORED;
+
+-- The unique index cannot be built while companies collide on the key.
+-- Which of them to keep is a data decision, not a schema one: list the
+-- collisions and stop, so they are renamed or merged by hand first.
+DO $$
+DECLARE
+    conflicts TEXT;
+BEGIN
+    SELECT string_agg(format('%s: %s', normalized_name, companies), E'\n' ORDER BY normalized_name)
+    INTO conflicts
+    FROM (
+        SELECT normalized_name,
+               string_agg(format('id=%s name=%L', id, name), ', ' ORDER BY id) AS companies
+        FROM company
+        GROUP BY normalized_name
+        HAVING count(*) > 1
+    ) duplicates;
+
+    IF conflicts IS NOT NULL THEN
+        RAISE EXCEPTION 'companies whose names differ only in case or whitespace'
+            USING DETAIL = conflicts,
+                  HINT = 'Rename or merge these companies, then run the migration again.';
+    END IF;
+END
+$$;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_company_normalized_name ON company(normalized_name);
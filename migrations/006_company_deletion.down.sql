@@ -0,0 +1,2 @@
+DROP INDEX IF EXISTS uq_company_deletion_active;
+DROP TABLE IF EXISTS company_deletion;
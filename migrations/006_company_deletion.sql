@@ -0,0 +1,18 @@
+-- Status table for background, chunked company deletion
+-- Migration: 006_company_deletion
+
+CREATE TABLE IF NOT EXISTS company_deletion (
+    id BIGSERIAL PRIMARY KEY,
+    -- No foreign key: the status row outlives the company it describes.
+    company_id BIGINT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'PENDING',
+    jobs_deleted INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP
+);
+
+-- At most one pending/running deletion per company.
+CREATE UNIQUE INDEX IF NOT EXISTS uq_company_deletion_active
+    ON company_deletion(company_id) WHERE status IN ('PENDING', 'RUNNING');
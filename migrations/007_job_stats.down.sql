@@ -0,0 +1,3 @@
+DROP TABLE IF EXISTS job_salary_stats;
+DROP TABLE IF EXISTS company_job_stats;
+DROP TABLE IF EXISTS job_daily_stats;
@@ -0,0 +1,44 @@
+-- Incrementally maintained job statistics rollups
+-- Migration: 007_job_stats
+
+-- Kept in step with job writes by app.repositories.job_stats_repository;
+-- `flask stats rebuild` recomputes them from the job table.
+CREATE TABLE IF NOT EXISTS job_daily_stats (
+    company_id BIGINT NOT NULL REFERENCES company(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    posted INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (company_id, day)
+);
+CREATE INDEX IF NOT EXISTS idx_job_daily_stats_day ON job_daily_stats(day);
+
+CREATE TABLE IF NOT EXISTS company_job_stats (
+    company_id BIGINT PRIMARY KEY REFERENCES company(id) ON DELETE CASCADE,
+    total_jobs INTEGER NOT NULL DEFAULT 0,
+    active_jobs INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS job_salary_stats (
+    company_id BIGINT NOT NULL REFERENCES company(id) ON DELETE CASCADE,
+    experience_level VARCHAR(50) NOT NULL,
+    -- Lower bound of a JOB_STATS_SALARY_BUCKET (default 5000) wide bucket.
+    salary_bucket NUMERIC(10, 2) NOT NULL,
+    jobs INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (company_id, experience_level, salary_bucket)
+);
+
+-- Backfill from existing jobs.
+INSERT INTO job_daily_stats (company_id, day, posted)
+SELECT company_id, posted_date::date, count(*)
+FROM job
+GROUP BY company_id, posted_date::date;
+
+INSERT INTO company_job_stats (company_id, total_jobs, active_jobs)
+SELECT company_id, count(*), count(*) FILTER (WHERE is_active)
+FROM job
+GROUP BY company_id;
+
+INSERT INTO job_salary_stats (company_id, experience_level, salary_bucket, jobs)
+SELECT company_id, experience_level, floor(salary_min / 5000) * 5000, count(*)
+FROM job
+WHERE is_active AND salary_min IS NOT NULL
+GROUP BY company_id, experience_level, floor(salary_min / 5000) * 5000;
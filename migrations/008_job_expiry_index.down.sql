@@ -0,0 +1 @@
+DROP INDEX IF EXISTS idx_job_active_expiry_date;
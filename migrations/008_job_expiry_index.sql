@@ -0,0 +1,7 @@
+-- Partial index for the expiry sweeper (JobService.expire_jobs)
+-- Migration: 008_job_expiry_index
+
+-- Only active jobs are ever swept, and they are the small share of the
+-- table; the index stays small and serves
+-- WHERE is_active AND expiry_date <= :now ORDER BY expiry_date LIMIT :n.
+CREATE INDEX IF NOT EXISTS idx_job_active_expiry_date ON job(expiry_date, id) WHERE is_active;
@@ -0,0 +1,5 @@
+-- migrate: no-transaction
+-- An interrupted concurrent build leaves an INVALID index behind; drop it first.
+DROP INDEX CONCURRENTLY IF EXISTS idx_job_is_active;
+CREATE INDEX CONCURRENTLY idx_job_is_active ON job(is_active);
+DROP INDEX CONCURRENTLY IF EXISTS idx_job_active_feed;
@@ -0,0 +1,16 @@
+-- migrate: no-transaction
+-- Partial covering index for the active-jobs feed (GET /api/jobs/active)
+-- Migration: 009_job_active_feed_index
+
+-- Keyed in feed order, restricted to active jobs, and carrying every column
+-- of the feed projection, so a page is one index-only range scan. Built
+-- CONCURRENTLY: job stays writable during the build.
+-- An interrupted concurrent build leaves an INVALID index behind; drop it first.
+DROP INDEX CONCURRENTLY IF EXISTS idx_job_active_feed;
+CREATE INDEX CONCURRENTLY idx_job_active_feed ON job(posted_date DESC, id DESC)
+    INCLUDE (title, company_id, location, salary_min, salary_max, job_type,
+             experience_level, remote_option, expiry_date, version, updated_at)
+    WHERE is_active;
+
+-- Too unselective for the planner to use; the partial index replaces it
+DROP INDEX CONCURRENTLY IF EXISTS idx_job_is_active;
@@ -0,0 +1,34 @@
+-- Fails while archive.job holds partitions: reattach or drop them first.
+DROP TABLE archive.job;
+DROP SCHEMA archive;
+
+ALTER SEQUENCE job_id_seq OWNED BY NONE;
+ALTER TABLE job RENAME TO job_partitioned;
+CREATE TABLE job (
+    LIKE job_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+);
+INSERT INTO job SELECT * FROM job_partitioned;
+DROP TABLE job_partitioned;
+ALTER SEQUENCE job_id_seq OWNED BY job.id;
+ALTER TABLE job ADD CONSTRAINT job_pkey PRIMARY KEY (id);
+ALTER TABLE job ADD CONSTRAINT job_company_id_fkey
+    FOREIGN KEY (company_id) REFERENCES company(id) ON DELETE CASCADE;
+
+DROP FUNCTION IF EXISTS job_create_partition(DATE);
+DROP FUNCTION IF EXISTS job_archive_partition(TEXT);
+
+CREATE INDEX idx_job_company_id ON job(company_id);
+CREATE INDEX idx_job_posted_date_id ON job(posted_date, id);
+CREATE INDEX idx_job_salary_min_id ON job(salary_min, id) WHERE salary_min IS NOT NULL;
+CREATE INDEX idx_job_search ON job USING GIN (search_vector, job_type, experience_level, remote_option);
+CREATE INDEX idx_job_location_trgm ON job USING GIN (location gin_trgm_ops);
+CREATE INDEX idx_job_title_trgm ON job USING GIN (title gin_trgm_ops);
+CREATE INDEX idx_job_active_expiry_date ON job(expiry_date, id) WHERE is_active;
+CREATE INDEX idx_job_active_feed ON job(posted_date DESC, id DESC)
+    INCLUDE (title, company_id, location, salary_min, salary_max, job_type,
+             experience_level, remote_option, expiry_date, version, updated_at)
+    WHERE is_active;
+
+CREATE TRIGGER job_search_vector_refresh
+    BEFORE INSERT OR UPDATE OF title, description, location, company_id ON job
+    FOR EACH ROW EXECUTE FUNCTION job_search_vector_refresh();
@@ -0,0 +1,109 @@
+-- Monthly range partitioning of job on posted_date, with an archive tier
+-- Migration: 010_job_partitioning
+--
+-- job becomes a partitioned table with one partition per month (job_pYYYYMM)
+-- and a default partition for rows no monthly partition covers yet. Old
+-- months are detached into archive.job, a partitioned table of the same
+-- shape in the archive schema. job_create_partition and
+-- job_archive_partition are called by `flask partitions ...` (PartitionService).
+-- The create_all sections (schema, default partition, functions, archive
+-- table) also run after db.create_all() builds job (tests; see
+-- app/models/migration_ddl.py).
+--
+-- The conversion copies every row, holding an exclusive lock on job for
+-- the duration: run it in a maintenance window.
+
+-- create_all: begin
+CREATE SCHEMA IF NOT EXISTS archive;
+-- create_all: end
+
+ALTER SEQUENCE job_id_seq OWNED BY NONE;
+ALTER TABLE job RENAME TO job_unpartitioned;
+CREATE TABLE job (
+    LIKE job_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+) PARTITION BY RANGE (posted_date);
+-- create_all: begin
+CREATE TABLE job_default PARTITION OF job DEFAULT;
+
+CREATE OR REPLACE FUNCTION job_create_partition(month DATE) RETURNS BOOLEAN LANGUAGE plpgsql AS $$
+DECLARE
+    partition_name TEXT := 'job_p' || to_char(month, 'YYYYMM');
+    lower_bound TIMESTAMP := date_trunc('month', month);
+    upper_bound TIMESTAMP := date_trunc('month', month) + interval '1 month';
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL OR to_regclass('archive.' || partition_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+    EXECUTE format('CREATE TABLE %I (LIKE job INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition_name);
+    -- Rows of the month that landed in the default partition move over first;
+    -- ATTACH fails while the default partition holds any.
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM job_default WHERE posted_date >= %L AND posted_date < %L RETURNING *)'
+        ' INSERT INTO %I SELECT * FROM moved',
+        lower_bound, upper_bound, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE job ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, lower_bound, upper_bound
+    );
+    RETURN TRUE;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION job_archive_partition(partition_name TEXT) RETURNS VOID LANGUAGE plpgsql AS $$
+DECLARE
+    bound TEXT;
+BEGIN
+    SELECT pg_get_expr(c.relpartbound, c.oid) INTO bound
+    FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'job'::regclass AND c.relname = partition_name;
+    IF bound IS NULL OR bound = 'DEFAULT' THEN
+        RAISE EXCEPTION 'job has no monthly partition %', partition_name;
+    END IF;
+    EXECUTE format('ALTER TABLE job DETACH PARTITION %I', partition_name);
+    EXECUTE format('ALTER TABLE %I SET SCHEMA archive', partition_name);
+    EXECUTE format('ALTER TABLE archive.job ATTACH PARTITION archive.%I %s', partition_name, bound);
+END
+$$;
+-- create_all: end
+
+-- Every month with data, through three months ahead
+SELECT job_create_partition(month::date)
+FROM generate_series(
+    date_trunc('month', coalesce((SELECT min(posted_date) FROM job_unpartitioned), now())),
+    date_trunc('month', now()) + interval '3 months',
+    interval '1 month'
+) AS month;
+
+INSERT INTO job SELECT * FROM job_unpartitioned;
+DROP TABLE job_unpartitioned;
+ALTER SEQUENCE job_id_seq OWNED BY job.id;
+-- A partitioned table's primary key must include the partition key.
+ALTER TABLE job ADD CONSTRAINT job_pkey PRIMARY KEY (id, posted_date);
+ALTER TABLE job ADD CONSTRAINT job_company_id_fkey
+    FOREIGN KEY (company_id) REFERENCES company(id) ON DELETE CASCADE;
+
+-- Indexes and triggers of migrations 001-009, built once over the copied rows
+CREATE INDEX idx_job_company_id ON job(company_id);
+CREATE INDEX idx_job_posted_date_id ON job(posted_date, id);
+CREATE INDEX idx_job_salary_min_id ON job(salary_min, id) WHERE salary_min IS NOT NULL;
+CREATE INDEX idx_job_search ON job USING GIN (search_vector, job_type, experience_level, remote_option);
+CREATE INDEX idx_job_location_trgm ON job USING GIN (location gin_trgm_ops);
+CREATE INDEX idx_job_title_trgm ON job USING GIN (title gin_trgm_ops);
+CREATE INDEX idx_job_active_expiry_date ON job(expiry_date, id) WHERE is_active;
+CREATE INDEX idx_job_active_feed ON job(posted_date DESC, id DESC)
+    INCLUDE (title, company_id, location, salary_min, salary_max, job_type,
+             experience_level, remote_option, expiry_date, version, updated_at)
+    WHERE is_active;
+
+CREATE TRIGGER job_search_vector_refresh
+    BEFORE INSERT OR UPDATE OF title, description, location, company_id ON job
+    FOR EACH ROW EXECUTE FUNCTION job_search_vector_refresh();
+
+-- Same columns and indexes, so detached partitions attach without a rebuild
+-- create_all: begin
+CREATE TABLE IF NOT EXISTS archive.job (LIKE job INCLUDING CONSTRAINTS INCLUDING INDEXES)
+    PARTITION BY RANGE (posted_date);
+-- create_all: end
+
+ANALYZE job;
@@ -1,5 +1,11 @@
 """API tests for Company routes (require test DB)."""
+import json
+
 import pytest
+from sqlalchemy import text
+
+from app.models.company import Company
+from app.repositories.job_repository import JobRepository
 
 
 def test_get_companies_returns_200_and_list(client):
@@ -9,6 +15,126 @@ def test_get_companies_returns_200_and_list(client):
     assert isinstance(data, list)
 
 
+def test_get_companies_paginates_by_name(client, db_session):
+    db_session.add_all([Company(name=name, location="City") for name in "EDCBA"])
+    db_session.commit()
+    first = client.get("/api/companies/?per_page=3")
+    pagination = json.loads(first.headers["X-Pagination"])
+    assert [c["name"] for c in first.get_json()] == ["A", "B", "C"]
+    assert pagination["has_next"]
+    second = client.get(f"/api/companies/?per_page=3&cursor={pagination['next_cursor']}")
+    assert [c["name"] for c in second.get_json()] == ["D", "E"]
+    assert json.loads(second.headers["X-Pagination"])["has_next"] is False
+
+
+def test_get_companies_fast_read_path_matches_orm_path(app, client, db_session, monkeypatch):
+    db_session.add_all(
+        Company(name=f'Company {i} "q"', location="City", website="https://example.com" if i % 2 else None)
+        for i in range(5)
+    )
+    db_session.commit()
+    orm = client.get("/api/companies/?per_page=3&sort=-name")
+    monkeypatch.setitem(app.config, "FAST_READ_PATH", True)
+    fast = client.get("/api/companies/?per_page=3&sort=-name")
+    assert fast.status_code == 200
+    assert fast.get_data() == orm.get_data()
+    for header in ("ETag", "Last-Modified", "X-Pagination"):
+        assert fast.headers[header] == orm.headers[header]
+
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_get_companies_sparse_fieldset(app, client, sample_company, monkeypatch, fast):
+    monkeypatch.setitem(app.config, "FAST_READ_PATH", fast)
+    response = client.get("/api/companies/?fields=id,name")
+    assert response.status_code == 200
+    assert response.get_json() == [{"id": sample_company.id, "name": "Test Company"}]
+    assert client.get("/api/companies/?fields=id,jobs").status_code == 422
+
+
+def test_get_company_by_id_with_sparse_fieldset(client, sample_company):
+    response = client.get(f"/api/companies/{sample_company.id}?fields=website")
+    assert response.get_json() == {"website": "https://example.com"}
+
+
+def test_bulk_upsert_companies_returns_name_to_id_mapping(client, sample_company):
+    payload = [
+        {"name": "  test   COMPANY", "location": "Moved City"},
+        {"name": "Fresh Co", "location": "Somewhere"},
+    ]
+    response = client.put("/api/companies/bulk", json=payload)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["ids"]["  test   COMPANY"] == sample_company.id
+    assert (data["created"], data["updated"]) == (1, 1)
+
+    existing = client.get(f"/api/companies/{sample_company.id}").get_json()
+    assert existing["name"] == "Test Company"
+    assert existing["location"] == "Moved City"
+    assert existing["description"] == "Test description"
+    assert existing["version"] == 2
+
+    again = client.put("/api/companies/bulk", json=payload).get_json()
+    assert again["ids"] == data["ids"]
+    assert client.get(f"/api/companies/{sample_company.id}").get_json()["version"] == 2
+
+
+def test_bulk_upsert_companies_keys_names_the_way_postgres_normalizes_them(client, db_session):
+    # Distinct in Postgres, though str.split() would fold both to "acme corp".
+    payload = [{"name": "ACME\x1cCorp", "location": "A"}, {"name": "Acme Corp", "location": "B"}]
+    data = client.put("/api/companies/bulk", json=payload).get_json()
+    assert data["created"] == 2
+    assert None not in data["ids"].values()
+    assert data["ids"]["ACME\x1cCorp"] != data["ids"]["Acme Corp"]
+
+
+def _job_payload(title):
+    return {
+        "title": title,
+        "description": "Desc",
+        "location": "City",
+        "job_type": "FULL_TIME",
+        "experience_level": "MID",
+        "remote_option": "REMOTE",
+    }
+
+
+def test_post_company_with_jobs_commits_once(app, client, db_session):
+    from app.extensions import db
+    from sqlalchemy import event
+
+    commits = []
+    with app.app_context():
+        engine = db.engine
+    listener = lambda conn: commits.append(1)  # noqa: E731
+    event.listen(engine, "commit", listener)
+    try:
+        response = client.post(
+            "/api/companies/with-jobs",
+            json={"name": "Jobs Co", "location": "City", "jobs": [_job_payload("A"), _job_payload("B")]},
+        )
+    finally:
+        event.remove(engine, "commit", listener)
+    assert response.status_code == 201
+    data = response.get_json()
+    assert [job["title"] for job in data["jobs"]] == ["A", "B"]
+    assert all(job["company_id"] == data["company"]["id"] for job in data["jobs"])
+    assert len(commits) == 1
+
+
+def test_post_company_with_jobs_rolls_back_everything_on_conflict(client, sample_company):
+    response = client.post(
+        "/api/companies/with-jobs",
+        json={"name": "Test Company", "location": "City", "jobs": [_job_payload("A")]},
+    )
+    assert response.status_code == 409
+    assert client.get("/api/jobs/").get_json() == []
+
+
+def test_post_company_with_existing_normalized_name_returns_409(client, sample_company):
+    response = client.post("/api/companies/", json={"name": "TEST company", "location": "X"})
+    assert response.status_code == 409
+
+
 def test_get_company_by_id_returns_200_and_company_data(client, sample_company):
     response = client.get(f"/api/companies/{sample_company.id}")
     assert response.status_code == 200
@@ -18,6 +144,22 @@ def test_get_company_by_id_returns_200_and_company_data(client, sample_company):
     assert data["location"] == sample_company.location
 
 
+def test_get_company_by_id_answers_304_until_company_changes(client, sample_company):
+    url = f"/api/companies/{sample_company.id}"
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    client.patch(url, json={"location": "Elsewhere"})
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_get_companies_answers_304_for_unchanged_page(client, sample_company):
+    first = client.get("/api/companies/")
+    assert first.headers["ETag"].startswith('W/"')
+    cached = client.get("/api/companies/", headers={"If-None-Match": first.headers["ETag"]})
+    assert cached.status_code == 304
+    assert "X-Pagination" not in cached.headers
+
+
 def test_get_company_by_invalid_id_returns_404(client):
     response = client.get("/api/companies/99999")
     assert response.status_code == 404
@@ -90,6 +232,21 @@ def test_patch_company_updates_only_provided_fields(client, sample_company):
     assert data["location"] == original_location
 
 
+def test_patch_company_with_stale_if_match_returns_412(client, sample_company):
+    url = f"/api/companies/{sample_company.id}"
+    etag = client.get(url).headers["ETag"]
+    assert client.patch(url, json={"name": "One"}, headers={"If-Match": etag}).status_code == 200
+    assert client.patch(url, json={"name": "Two"}, headers={"If-Match": etag}).status_code == 412
+
+
+def test_patch_company_with_weak_if_match_returns_412(client, sample_company):
+    url = f"/api/companies/{sample_company.id}"
+    etag = client.get(url).headers["ETag"]
+    response = client.patch(url, json={"name": "One"}, headers={"If-Match": f"W/{etag}"})
+    assert response.status_code == 412
+    assert response.get_json()["status"] == 412
+
+
 def test_patch_company_invalid_id_returns_404(client):
     response = client.patch(
         "/api/companies/99999",
@@ -107,3 +264,79 @@ def test_delete_company_returns_204(client, sample_company):
 def test_delete_company_invalid_id_returns_404(client):
     response = client.delete("/api/companies/99999")
     assert response.status_code == 404
+
+
+def test_delete_company_cascades_to_jobs(client, sample_job, db_session):
+    company_id = sample_job.company_id
+    response = client.delete(f"/api/companies/{company_id}")
+    assert response.status_code == 204
+    remaining = db_session.execute(text("SELECT count(*) FROM job WHERE company_id = :id"), {"id": company_id})
+    assert remaining.scalar() == 0
+
+
+def test_delete_company_async_returns_202_and_status_resource(client, sample_job, db_session):
+    company_id = sample_job.company_id
+    response = client.delete(f"/api/companies/{company_id}?async=true")
+    assert response.status_code == 202
+    body = response.get_json()
+    assert body["company_id"] == company_id
+    assert response.headers["Location"].endswith(f"/api/companies/deletions/{body['id']}")
+
+    # Celery runs eagerly under TestingConfig, so the deletion has already finished.
+    status = client.get(f"/api/companies/deletions/{body['id']}")
+    assert status.status_code == 200
+    assert status.get_json()["status"] == "COMPLETED"
+    assert status.get_json()["jobs_deleted"] == 1
+    # The task ran in its own app context and session; drop this session's copies.
+    db_session.expire_all()
+    assert client.get(f"/api/companies/{company_id}").status_code == 404
+
+
+def test_failed_async_delete_leaves_stats_counting_the_remaining_jobs(app, client, db_session, monkeypatch):
+    payload = {"name": "Half Gone", "location": "City", "jobs": [_job_payload(t) for t in "ABC"]}
+    company_id = client.post("/api/companies/with-jobs", json=payload).get_json()["company"]["id"]
+    monkeypatch.setitem(app.config, "COMPANY_DELETE_CHUNK_SIZE", 1)
+    delete_many = JobRepository.delete_many
+    calls = []
+
+    def fail_second_chunk(self, job_ids):
+        calls.append(job_ids)
+        if len(calls) == 2:
+            raise RuntimeError("boom")
+        return delete_many(self, job_ids)
+
+    monkeypatch.setattr(JobRepository, "delete_many", fail_second_chunk)
+    body = client.delete(f"/api/companies/{company_id}?async=true").get_json()
+
+    status = client.get(f"/api/companies/deletions/{body['id']}").get_json()
+    assert (status["status"], status["jobs_deleted"]) == ("FAILED", 1)
+    db_session.expire_all()
+    stats = client.get(f"/api/companies/{company_id}/stats?days=1&weeks=1").get_json()
+    assert (stats["total_jobs"], stats["active_jobs"]) == (2, 2)
+    assert stats["postings_per_day"][0]["count"] == 2
+
+
+def test_get_unknown_company_deletion_returns_404(client, db_session):
+    response = client.get("/api/companies/deletions/99999")
+    assert response.status_code == 404
+
+
+def test_company_stats_cover_jobs_created_with_the_company(client, db_session):
+    payload = {"name": "Stats Co", "location": "City", "jobs": [_job_payload("A"), _job_payload("B")]}
+    company_id = client.post("/api/companies/with-jobs", json=payload).get_json()["company"]["id"]
+
+    response = client.get(f"/api/companies/{company_id}/stats?days=1&weeks=1")
+    assert response.status_code == 200
+    stats = response.get_json()
+    assert stats["company_id"] == company_id
+    assert (stats["total_jobs"], stats["active_jobs"]) == (2, 2)
+    assert stats["postings_per_day"][0]["count"] == 2
+
+    # The rollups cascade with the company.
+    assert client.delete(f"/api/companies/{company_id}").status_code == 204
+    assert client.get("/api/jobs/stats").get_json()["total_jobs"] == 0
+
+
+def test_company_stats_for_unknown_company_returns_404(client, db_session):
+    assert client.get("/api/companies/999/stats").status_code == 404
+
@@ -1,7 +1,15 @@
 """API tests for Job routes (require test DB)."""
+import json
 from datetime import datetime, timezone, timedelta
+from decimal import Decimal
 
 import pytest
+from sqlalchemy import text
+
+from app.extensions import entity_cache
+from app.models.enums import ExperienceLevel, JobType, RemoteOption
+from app.models.job import Job
+from app.utils.sql_instrumentation import capture_queries
 
 
 def _valid_job_payload(company_id: int):
@@ -28,6 +36,271 @@ def test_get_jobs_returns_200_and_list_with_company_data(client, sample_job, sam
     assert job["company"]["name"] == sample_company.name
 
 
+def _add_jobs(db_session, company_id, count):
+    base = datetime(2024, 1, 1)
+    jobs = [
+        Job(
+            title=f"Job {i}",
+            description="Desc",
+            company_id=company_id,
+            location="City",
+            salary_min=Decimal(50000 + 1000 * (i % 3)) if i % 4 else None,
+            job_type=JobType.FULL_TIME,
+            experience_level=ExperienceLevel.MID,
+            remote_option=RemoteOption.REMOTE,
+            posted_date=base + timedelta(days=i // 2),
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(jobs)
+    db_session.commit()
+    return [job.id for job in jobs]
+
+
+def _walk_pages(client, url):
+    ids, cursor = [], None
+    while True:
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == 200
+        ids.extend(j["id"] for j in response.get_json())
+        pagination = json.loads(response.headers["X-Pagination"])
+        cursor = pagination["next_cursor"]
+        if not pagination["has_next"]:
+            return ids
+
+
+def test_get_jobs_paginates_newest_first_without_gaps(client, db_session, sample_company):
+    job_ids = _add_jobs(db_session, sample_company.id, 7)
+    ids = _walk_pages(client, "/api/jobs/?per_page=3")
+    assert sorted(ids) == sorted(job_ids)
+    posted = {j.id: (j.posted_date, j.id) for j in db_session.query(Job).all()}
+    assert ids == sorted(ids, key=lambda i: posted[i], reverse=True)
+
+
+@pytest.mark.parametrize("sort", ["salary_min", "-salary_min"])
+@pytest.mark.parametrize("per_page", [2, 4])
+def test_get_jobs_sorted_by_salary_lists_jobs_without_salary_last(client, db_session, sample_company, sort, per_page):
+    job_ids = _add_jobs(db_session, sample_company.id, 9)
+    salaries = {j.id: j.salary_min for j in db_session.query(Job).all()}
+    descending = sort.startswith("-")
+    with_salary = sorted(
+        (i for i in job_ids if salaries[i] is not None), key=lambda i: (salaries[i], i), reverse=descending
+    )
+    without_salary = sorted((i for i in job_ids if salaries[i] is None), reverse=descending)
+
+    ids = _walk_pages(client, f"/api/jobs/?sort={sort}&per_page={per_page}")
+    assert ids == with_salary + without_salary
+
+
+@pytest.mark.parametrize("query", ["?per_page=3", "?sort=salary_min&per_page=2&location=city"])
+def test_get_jobs_fast_read_path_matches_orm_path(app, client, db_session, sample_company, monkeypatch, query):
+    _add_jobs(db_session, sample_company.id, 7)
+    sample_company.name = 'Acme "Quoted" \\ Ltd'
+    db_session.commit()
+    orm = client.get(f"/api/jobs/{query}")
+    monkeypatch.setitem(app.config, "FAST_READ_PATH", True)
+    fast = client.get(f"/api/jobs/{query}")
+    assert fast.status_code == 200
+    assert fast.get_data() == orm.get_data()
+    for header in ("Content-Type", "ETag", "Last-Modified", "X-Pagination"):
+        assert fast.headers[header] == orm.headers[header]
+    assert client.get(f"/api/jobs/{query}", headers={"If-None-Match": orm.headers["ETag"]}).status_code == 304
+
+    next_page = f"/api/jobs/{query}&cursor={json.loads(fast.headers['X-Pagination'])['next_cursor']}"
+    fast_next = client.get(next_page).get_data()
+    monkeypatch.setitem(app.config, "FAST_READ_PATH", False)
+    assert fast_next == client.get(next_page).get_data()
+
+
+def test_get_jobs_caps_per_page_at_max_page_size(client, app):
+    response = client.get("/api/jobs/?per_page=1000")
+    assert response.status_code == 200
+    pagination = json.loads(response.headers["X-Pagination"])
+    assert pagination["per_page"] == app.config["MAX_PAGE_SIZE"]
+
+
+def test_get_jobs_with_invalid_cursor_returns_400(client):
+    response = client.get("/api/jobs/?cursor=garbage")
+    assert response.status_code == 400
+
+
+def _add_search_jobs(db_session, company_id):
+    specs = [
+        ("Senior Python Engineer", "Build APIs", JobType.FULL_TIME),
+        ("Data Analyst", "SQL and some python scripting", JobType.FULL_TIME),
+        ("Python Contractor", "Short python migration project", JobType.CONTRACT),
+        ("Designer", "Figma work", JobType.FULL_TIME),
+    ]
+    jobs = [
+        Job(
+            title=title,
+            description=description,
+            company_id=company_id,
+            location="Berlin",
+            job_type=job_type,
+            experience_level=ExperienceLevel.MID,
+            remote_option=RemoteOption.REMOTE,
+        )
+        for title, description, job_type in specs
+    ]
+    db_session.add_all(jobs)
+    db_session.commit()
+    return {job.title: job.id for job in jobs}
+
+
+def test_search_jobs_with_facets_counts_each_facet_without_its_own_filter(client, db_session, sample_company):
+    _add_search_jobs(db_session, sample_company.id)
+    contractor = db_session.query(Job).filter_by(title="Python Contractor").one()
+    contractor.salary_min = Decimal("120000")
+    contractor.experience_level = ExperienceLevel.SENIOR
+    db_session.commit()
+
+    response = client.get("/api/jobs/search?q=python&job_type=CONTRACT&facets=true")
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [hit["job"]["title"] for hit in data["items"]] == ["Python Contractor"]
+    facets = data["facets"]
+    # job_type ignores its own filter: every python match is counted by type.
+    assert {b["value"]: b["count"] for b in facets["job_type"]} == {
+        "FULL_TIME": 2, "PART_TIME": 0, "CONTRACT": 1, "INTERNSHIP": 0,
+    }
+    # Other facets apply job_type=CONTRACT.
+    assert {b["value"]: b["count"] for b in facets["experience_level"]} == {"ENTRY": 0, "MID": 0, "SENIOR": 1}
+    bands = {b["value"]: (b["min"], b["max"], b["count"]) for b in facets["salary_band"]}
+    assert bands["100000-150000"] == (100000, 150000, 1)
+    assert bands["unspecified"] == (None, None, 0)
+    assert bands["<50000"][2] == 0
+
+
+def test_search_jobs_without_facets_omits_them(client, db_session, sample_company):
+    _add_search_jobs(db_session, sample_company.id)
+    assert "facets" not in client.get("/api/jobs/search?q=python").get_json()
+
+
+def test_bulk_create_jobs_from_json_array_reports_per_row_results(client, sample_company):
+    rows = [_valid_job_payload(sample_company.id), {"title": "incomplete"}, _valid_job_payload(99999)]
+    response = client.post("/api/jobs/bulk", json=rows)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert (data["created"], data["rejected"]) == (1, 2)
+    created_id = data["results"][0]["id"]
+    assert client.get(f"/api/jobs/{created_id}").get_json()["version"] == 1
+    assert "description" in data["results"][1]["errors"]
+    assert "company_id" in data["results"][2]["errors"]
+
+
+def test_bulk_create_jobs_from_ndjson(client, sample_company):
+    body = "\n".join(json.dumps(_valid_job_payload(sample_company.id)) for _ in range(3)) + "\n{oops\n"
+    response = client.post("/api/jobs/bulk", data=body, content_type="application/x-ndjson")
+    data = response.get_json()
+    assert (data["received"], data["created"], data["rejected"]) == (4, 3, 1)
+    assert len(client.get("/api/jobs/").get_json()) == 3
+
+
+def test_bulk_create_jobs_with_non_array_body_returns_400(client):
+    response = client.post("/api/jobs/bulk", json={"title": "x"})
+    assert response.status_code == 400
+
+
+def test_search_jobs_ranks_title_matches_first(client, db_session, sample_company):
+    ids = _add_search_jobs(db_session, sample_company.id)
+    response = client.get("/api/jobs/search?q=python")
+    assert response.status_code == 200
+    data = response.get_json()
+    hit_ids = [hit["job"]["id"] for hit in data["items"]]
+    assert set(hit_ids) == {ids["Senior Python Engineer"], ids["Data Analyst"], ids["Python Contractor"]}
+    assert hit_ids[-1] == ids["Data Analyst"]
+    assert data["pagination"]["total"] == 3
+    assert data["items"][0]["rank"] >= data["items"][-1]["rank"]
+
+
+def test_search_jobs_combines_enum_filters_and_highlights(client, db_session, sample_company):
+    ids = _add_search_jobs(db_session, sample_company.id)
+    response = client.get("/api/jobs/search?q=python&job_type=CONTRACT&highlight=true")
+    data = response.get_json()
+    assert [hit["job"]["id"] for hit in data["items"]] == [ids["Python Contractor"]]
+    assert "<mark>python</mark>" in data["items"][0]["highlight"]
+
+
+def test_search_jobs_matches_company_name(client, db_session, sample_company):
+    _add_search_jobs(db_session, sample_company.id)
+    sample_company.name = "Zeppelin Labs"
+    db_session.commit()
+    response = client.get("/api/jobs/search?q=zeppelin&per_page=2")
+    data = response.get_json()
+    assert data["pagination"]["total"] == 4
+    assert data["pagination"]["pages"] == 2
+    assert len(data["items"]) == 2
+
+
+def test_search_jobs_page_past_end_reports_total(client, db_session, sample_company):
+    _add_search_jobs(db_session, sample_company.id)
+    data = client.get("/api/jobs/search?q=python&page=5").get_json()
+    assert data["items"] == []
+    assert data["pagination"]["total"] == 3
+
+
+def test_get_jobs_filters_by_location_substring(client, db_session, sample_company):
+    db_session.add_all([
+        Job(
+            title=f"Job in {city}",
+            description="Desc",
+            company_id=sample_company.id,
+            location=city,
+            job_type=JobType.FULL_TIME,
+            experience_level=ExperienceLevel.MID,
+            remote_option=RemoteOption.ONSITE,
+        )
+        for city in ["San Francisco, CA", "New York, NY", "south san francisco"]
+    ])
+    db_session.commit()
+    response = client.get("/api/jobs/?location=San Fran")
+    assert sorted(j["location"] for j in response.get_json()) == [
+        "San Francisco, CA",
+        "south san francisco",
+    ]
+
+
+def test_get_jobs_fuzzy_location_and_suggestions(client, db_session, sample_company, pg_trgm):
+    for city in ["New York", "Newark", "Boston"]:
+        db_session.add(Job(
+            title="Engineer",
+            description="Desc",
+            company_id=sample_company.id,
+            location=city,
+            job_type=JobType.FULL_TIME,
+            experience_level=ExperienceLevel.MID,
+            remote_option=RemoteOption.ONSITE,
+        ))
+    db_session.commit()
+    jobs = client.get("/api/jobs/?location=Nwe York&fuzzy=true").get_json()
+    assert [j["location"] for j in jobs] == ["New York"]
+    suggestions = client.get("/api/jobs/suggest?q=Nwe York").get_json()
+    assert suggestions[0]["value"] == "New York"
+    assert 0 < suggestions[0]["score"] <= 1
+
+
+def test_export_jobs_streams_ndjson(client, db_session, sample_company):
+    job_ids = _add_jobs(db_session, sample_company.id, 3)
+    response = client.get("/api/jobs/export")
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert response.is_streamed
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row["id"] for row in rows] == sorted(job_ids)
+    assert rows[0]["company"]["name"] == sample_company.name
+
+
+def test_export_jobs_streams_csv(client, db_session, sample_company):
+    _add_jobs(db_session, sample_company.id, 2)
+    response = client.get("/api/jobs/export?format=csv")
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0].startswith("id,title,")
+    assert len(lines) == 3
+
+
 def test_get_job_by_id_returns_200_and_full_details(client, sample_job, sample_company):
     response = client.get(f"/api/jobs/{sample_job.id}")
     assert response.status_code == 200
@@ -38,6 +311,62 @@ def test_get_job_by_id_returns_200_and_full_details(client, sample_job, sample_c
     assert data["company"]["id"] == sample_company.id
 
 
+def test_get_job_by_id_is_cached_and_invalidated_by_company_update(
+    app, client, sample_job, sample_company, monkeypatch
+):
+    monkeypatch.setitem(app.config, "ENTITY_CACHE_BACKEND", "lru")
+    monkeypatch.setitem(app.extensions, "entity_cache", None)
+    entity_cache.init_app(app)
+
+    assert client.get(f"/api/jobs/{sample_job.id}").status_code == 200
+    cached = client.get(f"/api/jobs/{sample_job.id}").get_json()
+    assert cached["company"]["name"] == sample_company.name
+    stats = client.get("/api/system/cache").get_json()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    client.patch(f"/api/companies/{sample_company.id}", json={"name": "Renamed Co"})
+    refreshed = client.get(f"/api/jobs/{sample_job.id}").get_json()
+    assert refreshed["company"]["name"] == "Renamed Co"
+    assert client.get("/api/system/cache").get_json()["misses"] == 2
+
+
+def test_get_job_by_id_answers_304_until_job_or_company_changes(client, sample_job, sample_company):
+    url = f"/api/jobs/{sample_job.id}"
+    first = client.get(url)
+    etag = first.headers["ETag"]
+    assert "Last-Modified" in first.headers
+
+    cached = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+    assert cached.headers["ETag"] == etag
+    assert client.get(url, headers={"If-Modified-Since": first.headers["Last-Modified"]}).status_code == 304
+
+    client.patch(f"/api/companies/{sample_company.id}", json={"name": "Renamed Co"})
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert client.get(url, headers={"If-None-Match": changed.headers["ETag"]}).status_code == 304
+
+
+def test_conditional_get_for_missing_job_returns_404(client):
+    assert client.get("/api/jobs/99999", headers={"If-None-Match": '"x"'}).status_code == 404
+
+
+def test_get_jobs_and_search_answer_304_for_unchanged_pages(client, db_session, sample_company):
+    _add_search_jobs(db_session, sample_company.id)
+    for url in ("/api/jobs/?per_page=2", "/api/jobs/search?q=python"):
+        first = client.get(url)
+        etag = first.headers["ETag"]
+        assert etag.startswith('W/"')
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    list_etag = client.get("/api/jobs/?per_page=2").headers["ETag"]
+    newest = client.get("/api/jobs/?per_page=1").get_json()[0]
+    client.patch(f"/api/jobs/{newest['id']}", json={"title": "Rust Engineer"})
+    assert client.get("/api/jobs/?per_page=2", headers={"If-None-Match": list_etag}).status_code == 200
+
+
 def test_get_job_by_invalid_id_returns_404(client):
     response = client.get("/api/jobs/99999")
     assert response.status_code == 404
@@ -133,6 +462,27 @@ def test_patch_job_updates_only_provided_fields(client, sample_job):
     assert data["description"] == original_description
 
 
+def test_patch_job_with_if_match_bumps_version_and_rejects_stale_tag(client, sample_job):
+    url = f"/api/jobs/{sample_job.id}"
+    etag = client.get(url).headers["ETag"]
+    version = client.get(url).get_json()["version"]
+
+    updated = client.patch(url, json={"title": "First"}, headers={"If-Match": etag})
+    assert updated.status_code == 200
+    assert updated.get_json()["version"] == version + 1
+    assert updated.get_json()["company"]["id"] == sample_job.company_id
+    assert updated.headers["ETag"] == client.get(url).headers["ETag"]
+
+    stale = client.patch(url, json={"title": "Second"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+    assert client.get(url).get_json()["title"] == "First"
+
+
+def test_patch_job_with_unknown_company_returns_404(client, sample_job):
+    response = client.patch(f"/api/jobs/{sample_job.id}", json={"company_id": 99999})
+    assert response.status_code == 404
+
+
 def test_patch_job_invalid_id_returns_404(client):
     response = client.patch(
         "/api/jobs/99999",
@@ -150,3 +500,142 @@ def test_delete_job_returns_204(client, sample_job):
 def test_delete_job_invalid_id_returns_404(client):
     response = client.delete("/api/jobs/99999")
     assert response.status_code == 404
+
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_get_jobs_sparse_fieldset_narrows_payload_and_query(app, client, db_session, sample_job, monkeypatch, fast):
+    monkeypatch.setitem(app.config, "FAST_READ_PATH", fast)
+    db_session.expunge_all()
+    with capture_queries() as captured:
+        response = client.get("/api/jobs/?fields=id,title,location")
+    statements = captured.statements
+    assert response.status_code == 200
+    assert response.get_json() == [{"id": sample_job.id, "title": "Test Job", "location": "Test City"}]
+    select_sql = next(sql for sql in statements if sql.lstrip().startswith("SELECT"))
+    assert "description" not in select_sql
+    assert "company" not in select_sql.split("WHERE")[0].replace("company_id", "")
+    assert len(statements) == 1
+
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_get_jobs_sparse_fieldset_with_nested_company_field(app, client, db_session, sample_job, monkeypatch, fast):
+    monkeypatch.setitem(app.config, "FAST_READ_PATH", fast)
+    db_session.expunge_all()
+    with capture_queries() as captured:
+        response = client.get("/api/jobs/?fields=title,company.name")
+    statements = captured.statements
+    assert response.get_json() == [{"title": "Test Job", "company": {"name": "Test Company"}}]
+    assert len(statements) == 1
+    assert "company.website" not in statements[0]
+
+
+def test_get_jobs_sparse_fieldset_has_its_own_etag(client, sample_job):
+    full = client.get("/api/jobs/")
+    sparse = client.get("/api/jobs/?fields=id")
+    assert sparse.headers["ETag"] != full.headers["ETag"]
+    assert client.get("/api/jobs/?fields=id", headers={"If-None-Match": sparse.headers["ETag"]}).status_code == 304
+
+
+def test_get_active_jobs_pages_through_active_jobs_newest_first(client, db_session, sample_company):
+    job_ids = _add_jobs(db_session, sample_company.id, 7)
+    db_session.execute(text("UPDATE job SET is_active = false WHERE id IN (:a, :b)"), {"a": job_ids[1], "b": job_ids[6]})
+    db_session.commit()
+    active = [job_id for job_id in job_ids if job_id not in (job_ids[1], job_ids[6])]
+    posted = {j.id: (j.posted_date, j.id) for j in db_session.query(Job).all()}
+
+    ids = _walk_pages(client, "/api/jobs/active?per_page=2")
+    assert ids == sorted(active, key=lambda i: posted[i], reverse=True)
+
+    response = client.get("/api/jobs/active?per_page=1")
+    assert set(response.get_json()[0]) == {
+        "id", "title", "company_id", "location", "salary_min", "salary_max", "job_type",
+        "experience_level", "remote_option", "posted_date", "expiry_date", "version", "updated_at",
+    }
+    assert client.get(
+        "/api/jobs/active?per_page=1", headers={"If-None-Match": response.headers["ETag"]}
+    ).status_code == 304
+
+
+def test_get_jobs_with_unknown_field_returns_422(client):
+    response = client.get("/api/jobs/?fields=id,salary")
+    assert response.status_code == 422
+
+
+def test_get_job_by_id_with_sparse_fieldset(client, sample_job):
+    response = client.get(f"/api/jobs/{sample_job.id}?fields=title,company.id")
+    assert response.status_code == 200
+    assert response.get_json() == {"title": "Test Job", "company": {"id": sample_job.company_id}}
+    assert response.headers["ETag"]
+
+
+def test_job_stats_track_writes_and_match_a_rebuild(app, client, db_session, sample_company):
+    ids = []
+    for salary, level in [(40000, "ENTRY"), (60000, "MID"), (64000, "MID"), (80000, "MID")]:
+        payload = {**_valid_job_payload(sample_company.id), "salary_min": str(salary), "experience_level": level}
+        ids.append(client.post("/api/jobs/", json=payload).get_json()["id"])
+    client.post("/api/jobs/bulk", json=[_valid_job_payload(sample_company.id)])
+    assert client.patch(f"/api/jobs/{ids[3]}", json={"is_active": False}).status_code == 200
+    assert client.patch(f"/api/jobs/{ids[2]}", json={"title": "Renamed"}).status_code == 200
+    assert client.delete(f"/api/jobs/{ids[0]}").status_code == 204
+
+    response = client.get("/api/jobs/stats?days=2&weeks=1")
+    assert response.status_code == 200
+    stats = response.get_json()
+    assert (stats["total_jobs"], stats["active_jobs"]) == (4, 3)
+    assert [point["count"] for point in stats["postings_per_day"]] == [0, 4]
+    assert stats["postings_per_week"][0]["count"] == 4
+    assert stats["salary_percentiles"] == [
+        {"experience_level": "MID", "jobs": 2, "percentiles": {
+            "p25": "61250.00", "p50": "62500.00", "p75": "63750.00", "p90": "64500.00",
+        }},
+    ]
+
+    db_session.commit()
+    result = app.test_cli_runner().invoke(args=["stats", "rebuild"])
+    assert result.exit_code == 0 and "job_daily_stats: 1 rows" in result.output
+    db_session.expire_all()
+    assert client.get("/api/jobs/stats?days=2&weeks=1").get_json() == stats
+
+
+def test_job_stats_reject_out_of_range_window(client):
+    assert client.get("/api/jobs/stats?days=0").status_code == 422
+
+
+def test_job_endpoints_stay_within_query_budgets(client, db_session, sample_company, assert_max_queries):
+    job_ids = _add_jobs(db_session, sample_company.id, 5)
+    db_session.expunge_all()
+
+    # Companies are joined, not loaded per job.
+    with assert_max_queries(1):
+        response = client.get("/api/jobs/?per_page=5")
+    assert len(response.get_json()) == 5
+    assert 'desc="1 queries"' in response.headers["Server-Timing"]
+
+    with assert_max_queries(1):
+        client.get(f"/api/jobs/{job_ids[0]}")
+
+    # Company lookup, INSERT ... RETURNING and one upsert per statistics rollup.
+    with assert_max_queries(5):
+        assert client.post("/api/jobs/", json=_valid_job_payload(sample_company.id)).status_code == 201
+
+
+def test_expire_jobs_task_deactivates_expired_jobs(app, client, db_session, sample_company):
+    from app.tasks import expire_jobs
+
+    ids = [client.post("/api/jobs/", json=_valid_job_payload(sample_company.id)).get_json()["id"] for _ in range(3)]
+    # The create schema rejects past expiry dates; expire two jobs behind its back.
+    db_session.execute(
+        text("UPDATE job SET expiry_date = now() - interval '1 day' WHERE id IN (:a, :b)"),
+        {"a": ids[0], "b": ids[1]},
+    )
+    db_session.commit()
+    etag = client.get(f"/api/jobs/{ids[0]}").headers["ETag"]
+
+    result = expire_jobs.delay().get()  # eager in TestingConfig
+    db_session.expire_all()
+
+    assert result["deactivated"] == 2
+    assert [client.get(f"/api/jobs/{job_id}").get_json()["is_active"] for job_id in ids] == [False, False, True]
+    assert client.get(f"/api/jobs/{ids[0]}", headers={"If-None-Match": etag}).status_code == 200
+    assert client.get("/api/jobs/stats").get_json()["active_jobs"] == 1
+    assert expire_jobs.delay().get()["deactivated"] == 0
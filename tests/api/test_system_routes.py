@@ -0,0 +1,9 @@
+"""API tests for system introspection routes (require test DB)."""
+
+
+def test_get_pool_stats_reports_this_workers_pool(client, db_session):
+    client.get("/api/companies/")
+    stats = client.get("/api/system/pool").get_json()
+    assert stats["pool_class"] == "InstrumentedQueuePool"
+    assert stats["checkouts"] >= 1
+    assert stats["checked_out"] + stats["checked_in"] >= 1
@@ -0,0 +1,132 @@
+"""Compare the ORM + marshmallow list path with the FAST_READ_PATH row projection.
+
+Seeds the *test* database (TestingConfig; it is truncated first and last),
+then renders one page of jobs both ways through JobRepository.find_page and
+reports rows/sec (median, untraced) and peak traced memory per render:
+
+    PYTHONPATH=. python tests/benchmarks/bench_list_serialization.py --jobs 20000 --page 1000
+"""
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+from decimal import Decimal
+
+from flask import jsonify
+from sqlalchemy import insert, text
+
+from app import create_app
+from app.extensions import db
+from app.models.company import Company
+from app.models.job import Job
+from app.repositories.job_repository import JobRepository
+from app.schemas.job_schema import JobSchema
+from app.utils import fast_json
+from app.utils.datetime_utils import utc_now
+from app.utils.fast_json import rows_response
+
+
+def seed(jobs: int, companies: int) -> None:
+    db.session.execute(text("TRUNCATE job, company RESTART IDENTITY CASCADE"))
+    db.session.execute(
+        insert(Company.__table__),
+        [{"name": f"Company {i}", "location": "City", "version": 1} for i in range(companies)],
+    )
+    now = utc_now()
+    db.session.execute(
+        insert(Job.__table__),
+        [
+            {
+                "title": f"Engineer {i}",
+                "description": "Build and run services. " * 20,
+                "company_id": i % companies + 1,
+                "location": "Remote",
+                "salary_min": Decimal(40000 + i % 50 * 1000) if i % 3 else None,
+                "job_type": "FULL_TIME",
+                "experience_level": "MID",
+                "remote_option": "REMOTE",
+                "posted_date": now - timedelta(minutes=i),
+                "created_at": now,
+                "updated_at": now,
+                "is_active": True,
+                "version": 1,
+            }
+            for i in range(jobs)
+        ],
+    )
+    db.session.commit()
+
+
+def render_orm(page_size: int) -> bytes:
+    page = JobRepository().find_page(sort="-posted_date", per_page=page_size)
+    return jsonify(JobSchema(many=True).dump(page.items)).get_data()
+
+
+def render_rows(page_size: int) -> bytes:
+    page = JobRepository().find_page(sort="-posted_date", per_page=page_size, as_rows=True)
+    return rows_response(JobSchema(), page.items).get_data()
+
+
+def measure(render, page_size: int, repeat: int) -> dict:
+    render(page_size)  # warm up statement and serializer caches
+    timings = []
+    for _ in range(repeat):
+        db.session.remove()  # fresh identity map, as in a new request
+        gc.collect()
+        started = time.perf_counter()
+        render(page_size)
+        timings.append(time.perf_counter() - started)
+
+    # Memory is traced in a separate run: tracemalloc itself slows allocation.
+    db.session.remove()
+    gc.collect()
+    tracemalloc.start()
+    body = render(page_size)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    seconds = statistics.median(timings)
+    return {
+        "rows_per_sec": page_size / seconds,
+        "ms": seconds * 1000,
+        "peak_kib": peak / 1024,
+        "bytes": len(body),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--page", type=int, default=1000, help="rows rendered per call")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    with app.app_context():
+        seed(args.jobs, args.companies)
+        try:
+            results = {"orm + marshmallow": measure(render_orm, args.page, args.repeat)}
+            encoder, fast_json.orjson = fast_json.orjson, None
+            results["rows + stdlib json"] = measure(render_rows, args.page, args.repeat)
+            fast_json.orjson = encoder
+            if encoder is not None:
+                results["rows + orjson"] = measure(render_rows, args.page, args.repeat)
+        finally:
+            db.session.execute(text("TRUNCATE job, company RESTART IDENTITY CASCADE"))
+            db.session.commit()
+
+    baseline = results["orm + marshmallow"]["rows_per_sec"]
+    print(f"{args.page} rows per render, median of {args.repeat}")
+    print(f"{'path':<22}{'rows/sec':>12}{'ms':>9}{'peak KiB':>11}{'speed-up':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<22}{result['rows_per_sec']:>12,.0f}{result['ms']:>9.1f}"
+            f"{result['peak_kib']:>11,.0f}{result['rows_per_sec'] / baseline:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Seeding, timing and baseline comparison shared by the benchmark scripts."""
+import gc
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from app.extensions import db
+from app.repositories.job_stats_repository import JobStatsRepository
+from app.utils.sql_instrumentation import capture_queries
+
+TITLES = ["Backend Engineer", "Frontend Developer", "Data Scientist", "DevOps Engineer",
+          "Product Manager", "QA Analyst", "Mobile Developer", "Site Reliability Engineer"]
+LOCATIONS = ["Remote", "Berlin", "London", "New York", "Toronto", "Austin", "Paris", "Madrid"]
+
+# Rows are generated by Postgres itself: setseed() makes random() repeat the
+# same sequence, so equal parameters give the same data set on every run.
+_SEED_COMPANIES = """
+INSERT INTO company (name, description, location, created_at, updated_at, version)
+SELECT 'Company ' || i, 'Benchmark company ' || i,
+       (:locations)[1 + (i % array_length(:locations, 1))],
+       now() AT TIME ZONE 'UTC', now() AT TIME ZONE 'UTC', 1
+FROM generate_series(1, :companies) AS i
+"""
+
+# company_id = 1 + floor(companies * r^skew): skew 1 is uniform, higher
+# values pile the jobs onto the first (lowest id) companies.
+_SEED_JOBS = """
+INSERT INTO job (title, description, company_id, location, salary_min, salary_max,
+                 job_type, experience_level, remote_option, posted_date, expiry_date,
+                 is_active, created_at, updated_at, version)
+SELECT (:titles)[1 + (i % array_length(:titles, 1))] || ' ' || (i % 97),
+       repeat('Design, build and operate backend services. ', 6),
+       1 + floor(:companies * power(r1, :skew))::bigint,
+       (:locations)[1 + floor(r2 * array_length(:locations, 1))::int],
+       salary,
+       salary + 20000,
+       (ARRAY['FULL_TIME', 'FULL_TIME', 'PART_TIME', 'CONTRACT', 'INTERNSHIP'])[1 + (i % 5)]::{job_type},
+       (ARRAY['ENTRY', 'MID', 'MID', 'SENIOR'])[1 + floor(r3 * 4)::int]::{experience_level},
+       (ARRAY['REMOTE', 'HYBRID', 'ONSITE'])[1 + (i % 3)]::{remote_option},
+       posted, posted + interval '60 days',
+       r2 < 0.85, posted, posted, 1
+FROM (
+    SELECT i, random() AS r1, random() AS r2, random() AS r3,
+           (now() AT TIME ZONE 'UTC') - random() * interval '365 days' AS posted,
+           CASE WHEN random() < 0.8 THEN round(30 + random() * 150) * 1000 END AS salary
+    FROM generate_series(:start, :stop) AS i
+) AS generated
+"""
+
+
+def _column_type(connection, table: str, column: str) -> str:
+    # Native PG enums in create_all databases, VARCHAR in migrated ones.
+    return connection.execute(
+        text(
+            "SELECT format_type(atttypid, atttypmod) FROM pg_attribute"
+            " WHERE attrelid = CAST(:table AS regclass) AND attname = :column"
+        ),
+        {"table": table, "column": column},
+    ).scalar_one()
+
+
+def truncate() -> None:
+    db.session.execute(text("TRUNCATE job, company RESTART IDENTITY CASCADE"))
+    db.session.commit()
+
+
+def seed(jobs: int, companies: int, skew: float = 2.0, seed: float = 0.42, batch: int = 100_000) -> dict:
+    """Replace all jobs and companies with a generated, skewed data set.
+
+    Runs in one transaction on one connection (setseed() is per session),
+    then refreshes the statistics rollups and the planner statistics.
+    """
+    with db.engine.begin() as connection:
+        connection.execute(text("TRUNCATE job, company RESTART IDENTITY CASCADE"))
+        connection.execute(text("SELECT setseed(:seed)"), {"seed": seed})
+        connection.execute(
+            text(_SEED_COMPANIES), {"companies": companies, "locations": LOCATIONS}
+        )
+        seed_jobs = text(_SEED_JOBS.format(**{
+            column: _column_type(connection, "job", column)
+            for column in ("job_type", "experience_level", "remote_option")
+        }))
+        for start in range(1, jobs + 1, batch):
+            connection.execute(seed_jobs, {
+                "start": start,
+                "stop": min(start + batch - 1, jobs),
+                "companies": companies,
+                "skew": skew,
+                "titles": TITLES,
+                "locations": LOCATIONS,
+            })
+    JobStatsRepository().rebuild()
+    db.session.commit()
+    with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("ANALYZE company"))
+        connection.execute(text("ANALYZE job"))
+    return describe()
+
+
+def describe() -> dict:
+    """Size and skew of the data set currently in the database."""
+    largest = db.session.execute(text(
+        "SELECT company_id, count(*) FROM job GROUP BY company_id ORDER BY count(*) DESC, company_id LIMIT 1"
+    )).first()
+    return {
+        "jobs": db.session.execute(text("SELECT count(*) FROM job")).scalar_one(),
+        "companies": db.session.execute(text("SELECT count(*) FROM company")).scalar_one(),
+        "largest_company": largest[0] if largest else None,
+        "largest_company_jobs": largest[1] if largest else 0,
+    }
+
+
+def measure(call: Callable[[], int], repeat: int, warmup: int = 3) -> dict:
+    """Latency percentiles, queries per call, rows/sec and peak traced memory of ``call``.
+
+    ``call`` returns the number of rows it produced.
+    """
+    for _ in range(warmup):
+        call()  # statement, serializer and connection caches
+
+    with capture_queries() as queries:
+        rows = call()
+
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    # Memory is traced in a separate run: tracemalloc itself slows allocation.
+    gc.collect()
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    cuts = statistics.quantiles(timings, n=100, method="inclusive") if repeat > 1 else timings * 99
+    p50 = statistics.median(timings)
+    return {
+        "calls": repeat,
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(cuts[94], 3),
+        "p99_ms": round(cuts[98], 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "queries": queries.count,
+        "rows": rows,
+        "rows_per_sec": round(rows / p50 * 1000, 1) if rows and p50 else None,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def compare(
+    results: Dict[str, dict],
+    baseline: Dict[str, dict],
+    threshold: float,
+    metric: str = "p95_ms",
+    min_delta_ms: float = 1.0,
+) -> List[dict]:
+    """One verdict per scenario: ``regression``, ``improved``, ``ok`` or ``new``.
+
+    A scenario regresses when ``metric`` grows by more than ``threshold``
+    (a fraction) *and* by at least ``min_delta_ms``, or when it runs more
+    queries per call than in the baseline.
+    """
+    verdicts = []
+    for name, result in results.items():
+        before: Optional[dict] = baseline.get(name)
+        verdict = {"scenario": name, "current": result[metric], "baseline": None, "change": None}
+        if before is None:
+            verdicts.append({**verdict, "status": "new"})
+            continue
+        delta = result[metric] - before[metric]
+        change = delta / before[metric] if before[metric] else 0.0
+        if result["queries"] > before["queries"] or (change > threshold and delta >= min_delta_ms):
+            status = "regression"
+        elif change < -threshold and -delta >= min_delta_ms:
+            status = "improved"
+        else:
+            status = "ok"
+        verdicts.append({
+            **verdict,
+            "baseline": before[metric],
+            "change": round(change, 3),
+            "queries": (before["queries"], result["queries"]),
+            "status": status,
+        })
+    return verdicts
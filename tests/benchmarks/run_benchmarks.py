@@ -0,0 +1,232 @@
+"""Time repositories, services and HTTP endpoints against a seeded Postgres.
+
+Seeds the *test* database (TestingConfig; truncated first and, unless
+--keep, last) with --jobs jobs spread over --companies companies, skewed
+so a few companies own most of the jobs. Every scenario reports p50/p95/p99
+latency, queries per call, rows/sec and peak traced memory, and the run is
+written to a JSON file. With --baseline the run is compared against an
+earlier one and the script exits 1 when a scenario regressed:
+
+    PYTHONPATH=. python tests/benchmarks/run_benchmarks.py --jobs 10000 --output base.json
+    PYTHONPATH=. python tests/benchmarks/run_benchmarks.py --jobs 10000 --baseline base.json
+
+Baselines are only comparable on the same machine with the same volumes.
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Callable, Dict
+
+from app import create_app
+from app.extensions import db
+from app.repositories.company_repository import CompanyRepository
+from app.repositories.job_repository import JobRepository
+from app.services.company_service import CompanyService
+from app.services.job_service import JobService
+from app.services.stats_service import StatsService
+
+from harness import compare, describe, measure, seed, truncate
+
+PAGE = 100
+
+
+@contextmanager
+def _config(app, **overrides):
+    saved = {key: app.config[key] for key in overrides}
+    app.config.update(overrides)
+    try:
+        yield
+    finally:
+        app.config.update(saved)
+
+
+def scenarios(app, data: dict) -> Dict[str, Callable[[], int]]:
+    """Scenario name -> call returning the rows it produced.
+
+    Repository and service calls each get a fresh app context (a new
+    session and identity map, as in a request); HTTP calls go through the
+    test client with no context pushed, like a real request.
+    """
+    injector = app.extensions["injector"]
+    client = app.test_client()
+    ids = random.Random(7).sample(range(1, data["jobs"] + 1), min(data["jobs"], 1000))
+    next_id = iter(ids * 1000).__next__
+    big = data["largest_company"]
+
+    def in_context(function):
+        def call():
+            with app.app_context():
+                return function()
+        return call
+
+    def http(method: str, url: Callable[[], str], payload=None, **config):
+        def call():
+            with _config(app, **config):
+                response = client.open(url(), method=method, json=payload)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{method} {url()} -> {response.status_code}: {response.get_data(as_text=True)[:200]}")
+            body = response.get_json()
+            if isinstance(body, list):
+                return len(body)
+            return len(body["items"]) if isinstance(body, dict) and "items" in body else 1
+        return call
+
+    def service(cls):
+        return injector.get(cls)
+
+    def update_title():
+        job_id = next_id()
+        job = service(JobService).update_job(job_id, {"title": f"Backend Engineer {job_id}"})
+        return 1 if job else 0
+
+    return {
+        "repo.job.find_page": in_context(
+            lambda: len(JobRepository().find_page(sort="-posted_date", per_page=PAGE).items)),
+        "repo.job.find_page.rows": in_context(
+            lambda: len(JobRepository().find_page(sort="-posted_date", per_page=PAGE, as_rows=True).items)),
+        "repo.job.find_page.salary_filtered": in_context(
+            lambda: len(JobRepository().find_page(
+                sort="-salary_min", per_page=PAGE, location="Berlin", company_id=big).items)),
+        "repo.job.find_active_page": in_context(
+            lambda: len(JobRepository().find_active_page(per_page=PAGE).items)),
+        "repo.job.find_by_id": in_context(lambda: 1 if JobRepository().find_by_id(next_id()) else 0),
+        "repo.job.search": in_context(
+            lambda: len(JobRepository().search("engineer", page=1, per_page=PAGE)[0])),
+        "repo.job.facet_counts": in_context(
+            lambda: len(JobRepository().facet_counts(
+                "engineer", tuple(app.config["FACET_SALARY_BANDS"]))["job_type"])),
+        "repo.company.find_page": in_context(
+            lambda: len(CompanyRepository().find_page(sort="name", per_page=PAGE).items)),
+        "service.job.get_jobs_page": in_context(
+            lambda: len(service(JobService).get_jobs_page(per_page=PAGE).items)),
+        "service.job.search_jobs": in_context(
+            lambda: len(service(JobService).search_jobs("engineer", per_page=PAGE)["items"])),
+        "service.company.get_companies_page": in_context(
+            lambda: len(service(CompanyService).get_companies_page(per_page=PAGE).items)),
+        "service.stats.get_job_stats": in_context(
+            lambda: len(service(StatsService).get_job_stats(days=30, weeks=12)["postings_per_day"])),
+        "http.jobs.list": http("GET", lambda: f"/api/jobs/?per_page={PAGE}"),
+        "http.jobs.list.fast": http("GET", lambda: f"/api/jobs/?per_page={PAGE}", FAST_READ_PATH=True),
+        "http.jobs.active": http("GET", lambda: f"/api/jobs/active?per_page={PAGE}"),
+        "http.jobs.detail": http("GET", lambda: f"/api/jobs/{next_id()}"),
+        "http.jobs.search": http("GET", lambda: f"/api/jobs/search?q=engineer&per_page={PAGE}"),
+        "http.jobs.search.facets": http("GET", lambda: f"/api/jobs/search?q=engineer&facets=true&per_page={PAGE}"),
+        "http.jobs.stats": http("GET", lambda: "/api/jobs/stats"),
+        "http.companies.list": http("GET", lambda: f"/api/companies/?per_page={PAGE}"),
+        "http.companies.stats": http("GET", lambda: f"/api/companies/{big}/stats"),
+        "service.job.update_job": in_context(update_title),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _print_results(results: Dict[str, dict]) -> None:
+    print(f"{'scenario':<38}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}{'rows/sec':>12}{'peak KiB':>10}")
+    for name, result in results.items():
+        rows_per_sec = f"{result['rows_per_sec']:,.0f}" if result["rows_per_sec"] else "-"
+        print(
+            f"{name:<38}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+            f"{result['queries']:>9}{rows_per_sec:>12}{result['peak_kib']:>10,.0f}"
+        )
+
+
+def _print_verdicts(verdicts, metric: str) -> None:
+    print(f"\n{'scenario':<38}{'baseline':>10}{'current':>10}{'change':>9}  status ({metric})")
+    for verdict in verdicts:
+        baseline = f"{verdict['baseline']:.2f}" if verdict["baseline"] is not None else "-"
+        change = f"{verdict['change']:+.0%}" if verdict["change"] is not None else "-"
+        status = verdict["status"]
+        if "queries" in verdict and verdict["queries"][1] > verdict["queries"][0]:
+            status += " (queries {} -> {})".format(*verdict["queries"])
+        print(f"{verdict['scenario']:<38}{baseline:>10}{verdict['current']:>10.2f}{change:>9}  {status}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=10000, help="e.g. 10000 or 1000000")
+    parser.add_argument("--companies", type=int, default=500)
+    parser.add_argument("--skew", type=float, default=2.0, help="1 is uniform; higher favors a few companies")
+    parser.add_argument("--seed", type=float, default=0.42, help="Postgres setseed() value, -1..1")
+    parser.add_argument("--repeat", type=int, default=50, help="timed calls per scenario")
+    parser.add_argument("--only", action="append", default=[], help="run scenarios containing this text")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, as a fraction")
+    parser.add_argument("--metric", default="p95_ms", choices=["p50_ms", "p95_ms", "p99_ms", "mean_ms"])
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore smaller slowdowns")
+    parser.add_argument("--reuse", action="store_true", help="benchmark the rows already in the database")
+    parser.add_argument("--keep", action="store_true", help="do not truncate the tables afterwards")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    app = create_app("testing")
+    with app.app_context():
+        data = describe() if args.reuse else seed(args.jobs, args.companies, args.skew, args.seed)
+        db.session.remove()
+    if not data["jobs"]:
+        parser.error("no jobs to benchmark; drop --reuse to seed")
+    print("data: {jobs} jobs, {companies} companies, largest company {largest_company_jobs} jobs".format(**data))
+
+    try:
+        results = {}
+        for name, call in scenarios(app, data).items():
+            if args.only and not any(part in name for part in args.only):
+                continue
+            results[name] = measure(call, args.repeat)
+    finally:
+        if not args.keep:
+            with app.app_context():
+                truncate()
+
+    run = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "flask": metadata.version("flask"),
+            "sqlalchemy": metadata.version("sqlalchemy"),
+            "machine": platform.node(),
+            "params": {"skew": args.skew, "seed": args.seed, "repeat": args.repeat, "page": PAGE},
+            "data": data,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(run, file, indent=2)
+        file.write("\n")
+
+    _print_results(results)
+    print(f"\nwrote {args.output}")
+    if baseline is None:
+        return 0
+
+    if baseline["meta"]["data"] != data or baseline["meta"]["params"] != run["meta"]["params"]:
+        print("warning: the baseline was recorded with other volumes or parameters", file=sys.stderr)
+    verdicts = compare(results, baseline["results"], args.threshold, args.metric, args.min_delta_ms)
+    _print_verdicts(verdicts, args.metric)
+    regressions = [verdict["scenario"] for verdict in verdicts if verdict["status"] == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
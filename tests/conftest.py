@@ -3,15 +3,18 @@ Pytest fixtures for Phase I tests.
 Integration and API tests require PostgreSQL with database job_board_test (see context.md).
 If the test DB is unavailable, those tests are skipped; unit tests run without DB.
 """
+from contextlib import contextmanager
+
 import pytest
 from sqlalchemy import text
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import DBAPIError, OperationalError
 
 from app import create_app
 from app.extensions import db
 from app.models.company import Company
 from app.models.job import Job
 from app.models.enums import JobType, ExperienceLevel, RemoteOption
+from app.utils.sql_instrumentation import capture_queries
 
 # Session-wide: set by app fixture when DB connection fails (so db_session/client skip).
 _db_unavailable = False
@@ -46,16 +49,27 @@ def client(app, db_ready):
 
 @pytest.fixture(scope="function")
 def db_session(app):
-    """Clean database session: truncates company and job before each test (function scope)."""
+    """Clean database session: truncates company, job and company_deletion before each test (function scope)."""
     if _db_unavailable:
         pytest.skip("Test database unavailable (start Postgres, create job_board_test)")
     with app.app_context():
-        db.session.execute(text("TRUNCATE job, company RESTART IDENTITY CASCADE"))
+        db.session.execute(text("TRUNCATE job, company, company_deletion RESTART IDENTITY CASCADE"))
         db.session.commit()
         yield db.session
         db.session.rollback()
 
 
+@pytest.fixture
+def pg_trgm(db_session):
+    """Skip unless the pg_trgm extension can be enabled in the test database."""
+    try:
+        db_session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        db_session.commit()
+    except DBAPIError:
+        db_session.rollback()
+        pytest.skip("pg_trgm extension not available in the test database")
+
+
 @pytest.fixture
 def sample_company(db_session):
     """A test company (depends on db_session)."""
@@ -87,3 +101,22 @@ def sample_job(sample_company, db_session):
     db_session.commit()
     db_session.refresh(job)
     return job
+
+
+@pytest.fixture
+def assert_max_queries():
+    """Context manager failing the test when the block runs more than ``limit`` SQL statements.
+
+        with assert_max_queries(2):
+            client.get("/api/jobs/")
+    """
+
+    @contextmanager
+    def check(limit):
+        with capture_queries() as stats:
+            yield stats
+        assert stats.count <= limit, f"{stats.count} queries (at most {limit} expected):\n" + "\n".join(
+            stats.statements
+        )
+
+    return check
@@ -47,6 +47,42 @@ def test_find_by_name_returns_company(app, db_session, repo, sample_company):
         assert result.name == sample_company.name
 
 
+def test_find_by_name_ignores_case_and_whitespace(app, db_session, repo, sample_company):
+    with app.app_context():
+        result = repo.find_by_name("  test   COMPANY ")
+        assert result is not None
+        assert result.id == sample_company.id
+
+
+def test_normalize_names_matches_the_stored_normalized_name(app, db_session, repo):
+    # str.split() treats the \x1c separator as whitespace; Postgres' \s does not.
+    with app.app_context():
+        company = repo.save(Company(name="ACME\x1cCorp", location="City"))
+        db_session.refresh(company)
+        keys = repo.normalize_names(["ACME\x1cCorp", "  Acme   CORP "])
+        assert keys == {"ACME\x1cCorp": company.normalized_name, "  Acme   CORP ": "acme corp"}
+        assert keys["ACME\x1cCorp"] != "acme corp"
+        assert repo.find_by_name("acme\x1ccorp ").id == company.id
+        assert repo.find_by_name("Acme Corp") is None
+
+
+def test_upsert_many_inserts_new_and_updates_existing_in_one_statement(
+    app, db_session, repo, sample_company
+):
+    with app.app_context():
+        rows = [
+            {"name": "TEST COMPANY", "description": None, "website": None, "location": "Elsewhere"},
+            {"name": "Brand New", "description": None, "website": None, "location": "Here"},
+        ]
+        result = {key: (company_id, inserted) for company_id, key, inserted in repo.upsert_many(rows)}
+        assert result["test company"] == (sample_company.id, False)
+        assert result["brand new"][1] is True
+        stored = repo.find_by_id(sample_company.id)
+        db_session.refresh(stored)
+        assert stored.location == "Elsewhere"
+        assert stored.website == "https://example.com"
+
+
 def test_save_creates_new_company(app, db_session, repo):
     with app.app_context():
         company = Company(name="New Co", location="New City")
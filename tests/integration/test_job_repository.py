@@ -1,11 +1,15 @@
 """Integration tests for JobRepository (real DB, test config)."""
+from datetime import timedelta
+
 import pytest
+from sqlalchemy import event, text
 from sqlalchemy.exc import IntegrityError
 
 from app.extensions import db
 from app.models.job import Job
 from app.models.enums import JobType, ExperienceLevel, RemoteOption
 from app.repositories.job_repository import JobRepository
+from app.utils.datetime_utils import utc_now
 
 
 @pytest.fixture
@@ -107,3 +111,77 @@ def test_foreign_key_constraint_cannot_create_job_with_invalid_company_id(app, d
         )
         with pytest.raises(IntegrityError):
             repo.save(job)
+
+
+def _add_expiring_jobs(db_session, company_id, days):
+    now = utc_now()
+    jobs = [
+        Job(
+            title=f"Job {n}",
+            description="Desc",
+            company_id=company_id,
+            location="City",
+            job_type=JobType.FULL_TIME,
+            experience_level=ExperienceLevel.MID,
+            remote_option=RemoteOption.REMOTE,
+            expiry_date=now + timedelta(days=day),
+        )
+        for n, day in enumerate(days)
+    ]
+    db_session.add_all(jobs)
+    db_session.commit()
+    return [job.id for job in jobs]
+
+
+def test_lock_expired_skips_rows_locked_by_other_transactions(app, db_session, repo, sample_company):
+    ids = _add_expiring_jobs(db_session, sample_company.id, [-3, -2, -1, 1])
+    with db.engine.connect() as other:
+        other.execute(text("SELECT id FROM job WHERE id = :id FOR UPDATE"), {"id": ids[0]})
+        assert [job_id for job_id, _ in repo.lock_expired(utc_now(), 10)] == ids[1:3]
+        db_session.rollback()
+
+
+def test_deactivate_bumps_version_and_updated_at(app, db_session, repo, sample_job):
+    before = (sample_job.version, sample_job.updated_at)
+    assert repo.deactivate([(sample_job.id, sample_job.posted_date)], utc_now()) == 1
+    db_session.commit()
+    db_session.expire_all()
+    job = repo.find_by_id(sample_job.id)
+    assert job.is_active is False
+    assert job.version == before[0] + 1
+    assert job.updated_at > before[1]
+
+
+def _scans(plan):
+    """Leaf scan nodes of an EXPLAIN (FORMAT JSON) plan (one per partition read)."""
+    children = plan.get("Plans", [])
+    return [scan for child in children for scan in _scans(child)] if children else [plan]
+
+
+def test_active_feed_is_an_index_only_scan_of_the_partial_index(app, db_session, repo, sample_company):
+    _add_expiring_jobs(db_session, sample_company.id, [1, 2, 3])
+
+    executed = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        page = repo.find_active_page(2)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    assert len(page.items) == 2 and page.next_cursor
+
+    # Tiny tables favour a sequential scan; only the plan shape matters here.
+    connection = db_session.connection()
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    statement, parameters = executed[-1]
+    plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar_one()
+    scans = _scans(plan[0]["Plan"])
+    feed_indexes = set(connection.exec_driver_sql(
+        "SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = 'idx_job_active_feed'::regclass"
+    ).scalars())
+    assert scans and {(scan["Node Type"], scan["Index Name"] in feed_indexes) for scan in scans} == {
+        ("Index Only Scan", True)
+    }
@@ -0,0 +1,142 @@
+"""Integration tests for the migration runner's timeouts, retries and timings (real DB, test config)."""
+import importlib.util
+import threading
+from pathlib import Path
+
+import psycopg2
+import pytest
+from psycopg2 import errors
+
+_spec = importlib.util.spec_from_file_location(
+    "run_migrations", Path(__file__).resolve().parents[2] / "migrations" / "run_migrations.py"
+)
+run_migrations = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(run_migrations)
+
+
+@pytest.fixture
+def runner(app, db_session, tmp_path, monkeypatch):
+    """The runner pointed at an empty migrations directory; its tables and records are dropped afterwards."""
+    monkeypatch.setattr(run_migrations, "MIGRATIONS_DIR", tmp_path)
+    monkeypatch.setattr(run_migrations, "RETRY_DELAY", 0.1)
+    conn = psycopg2.connect(app.config["SQLALCHEMY_DATABASE_URI"])
+    run_migrations.ensure_migrations_table(conn)
+    yield conn
+    conn.rollback()
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM schema_migrations WHERE version LIKE '9__'")
+        cur.execute("DROP TABLE IF EXISTS migration_runner_test")
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def locked_table(app, runner):
+    """A second connection holding an ACCESS EXCLUSIVE lock on migration_runner_test."""
+    with runner.cursor() as cur:
+        cur.execute("CREATE TABLE migration_runner_test (id INT)")
+    runner.commit()
+    holder = psycopg2.connect(app.config["SQLALCHEMY_DATABASE_URI"])
+    with holder.cursor() as cur:
+        cur.execute("LOCK TABLE migration_runner_test IN ACCESS EXCLUSIVE MODE")
+    yield holder
+    holder.rollback()
+    holder.close()
+
+
+@pytest.fixture
+def old_snapshot(app, runner):
+    """A second connection holding a snapshot open, which CREATE INDEX CONCURRENTLY waits for."""
+    with runner.cursor() as cur:
+        cur.execute("CREATE TABLE migration_runner_test (id INT)")
+    runner.commit()
+    holder = psycopg2.connect(app.config["SQLALCHEMY_DATABASE_URI"])
+    holder.set_session(isolation_level="REPEATABLE READ")
+    with holder.cursor() as cur:
+        cur.execute("SELECT count(*) FROM company")
+    yield holder
+    holder.rollback()
+    holder.close()
+
+
+def _write(directory, name, sql):
+    path = directory / name
+    path.write_text(sql)
+    return path
+
+
+def _recorded(conn, version):
+    with conn.cursor() as cur:
+        cur.execute("SELECT duration_ms, statements FROM schema_migrations WHERE version = %s", (version,))
+        return cur.fetchone()
+
+
+def test_up_records_per_statement_timings(runner, tmp_path):
+    path = _write(tmp_path, "901_timed.sql", """
+CREATE TABLE migration_runner_test (id INT, note TEXT DEFAULT 'a;b');
+CREATE FUNCTION migration_runner_test_fn() RETURNS INT AS $$ BEGIN RETURN 1; END $$ LANGUAGE plpgsql;
+DROP FUNCTION migration_runner_test_fn();
+""")
+
+    assert run_migrations.run_migration(runner, "901", path.stem, path)
+
+    duration_ms, statements = _recorded(runner, "901")
+    assert [s["statement"] for s in statements] == [
+        "CREATE TABLE migration_runner_test (id INT, note TEXT DEFAULT 'a;b')",
+        "CREATE FUNCTION migration_runner_test_fn() RETURNS INT AS $$ BEGIN RETURN 1; END $$ LANGUAGE plpgsql",
+        "DROP FUNCTION migration_runner_test_fn()",
+    ]
+    assert float(duration_ms) == pytest.approx(sum(s["ms"] for s in statements), abs=0.5)
+
+
+def test_transactional_migration_retries_after_lock_timeout(runner, locked_table, tmp_path):
+    path = _write(tmp_path, "902_retry.sql", """-- migrate: lock_timeout=100ms, retries=5
+CREATE TABLE migration_runner_other (id INT);
+ALTER TABLE migration_runner_test ADD COLUMN note TEXT;
+DROP TABLE migration_runner_other;
+""")
+    threading.Timer(0.3, locked_table.rollback).start()
+
+    assert run_migrations.run_migration(runner, "902", path.stem, path)
+
+    assert _recorded(runner, "902") is not None
+    with runner.cursor() as cur:
+        cur.execute("SELECT note FROM migration_runner_test")
+        cur.execute("SELECT to_regclass('migration_runner_other')")
+        assert cur.fetchone() == (None,)
+
+
+def test_no_transaction_migration_gives_up_after_retries(runner, locked_table, tmp_path):
+    path = _write(tmp_path, "903_give_up.sql", """-- migrate: no-transaction
+-- migrate: lock_timeout=50ms, retries=1
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_migration_runner_test ON migration_runner_test (id);
+""")
+
+    with pytest.raises(errors.LockNotAvailable):
+        run_migrations.execute_migration(
+            runner, path, "INSERT INTO schema_migrations (version, name) VALUES ('903', 'x')", {}
+        )
+
+    assert _recorded(runner, "903") is None
+    assert not runner.autocommit
+    with runner.cursor() as cur:
+        cur.execute("SHOW lock_timeout")
+        assert cur.fetchone() == ("0",)
+
+
+def test_no_transaction_migration_retries_concurrent_index_build_from_the_top(runner, old_snapshot, tmp_path):
+    path = _write(tmp_path, "904_concurrent.sql", """-- migrate: no-transaction
+-- migrate: lock_timeout=100ms, retries=5
+DROP INDEX CONCURRENTLY IF EXISTS idx_migration_runner_test;
+CREATE INDEX CONCURRENTLY idx_migration_runner_test ON migration_runner_test (id);
+""")
+    threading.Timer(0.3, old_snapshot.rollback).start()
+
+    assert run_migrations.run_migration(runner, "904", path.stem, path)
+
+    assert _recorded(runner, "904") is not None
+    with runner.cursor() as cur:
+        cur.execute(
+            "SELECT indisvalid FROM pg_index WHERE indexrelid = 'idx_migration_runner_test'::regclass"
+        )
+        assert cur.fetchone() == (True,)
@@ -0,0 +1,127 @@
+"""Integration tests for monthly job partitions and the archive tier (real DB, test config)."""
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event, text
+
+from app.extensions import db
+from app.models.enums import ExperienceLevel, JobType, RemoteOption
+from app.models.job import Job
+from app.repositories.job_repository import JobRepository
+from app.repositories.partition_repository import PartitionRepository
+from app.services.partition_service import PartitionService
+
+
+@pytest.fixture
+def partitions(app, db_session):
+    """PartitionService; archived test partitions are dropped afterwards."""
+    yield app.extensions["injector"].get(PartitionService)
+    db_session.rollback()
+    for name, _ in PartitionRepository().find_partitions(archived=True):
+        db_session.execute(text(f"DROP TABLE archive.{name}"))
+    db_session.commit()
+
+
+def _add_job(db_session, company_id, posted_date):
+    job = Job(
+        title="Archivist",
+        description="Desc",
+        company_id=company_id,
+        location="City",
+        job_type=JobType.FULL_TIME,
+        experience_level=ExperienceLevel.MID,
+        remote_option=RemoteOption.REMOTE,
+        posted_date=posted_date,
+    )
+    db_session.add(job)
+    db_session.commit()
+    return job.id
+
+
+def _partition_of(db_session, job_id):
+    return db_session.execute(text("SELECT tableoid::regclass::text FROM job WHERE id = :id"), {"id": job_id}).scalar()
+
+
+def test_new_partition_takes_over_rows_from_the_default_partition(db_session, partitions, sample_company):
+    job_id = _add_job(db_session, sample_company.id, datetime(2001, 2, 14))
+    assert _partition_of(db_session, job_id) == "job_default"
+
+    assert partitions.ensure_partitions(date(2001, 1, 20), date(2001, 2, 1)) == ["job_p200101", "job_p200102"]
+    assert partitions.ensure_partitions(date(2001, 2, 1), date(2001, 2, 1)) == []
+    assert _partition_of(db_session, job_id) == "job_p200102"
+
+
+def test_archived_jobs_leave_job_but_stay_retrievable(app, client, db_session, partitions, sample_company):
+    old = _add_job(db_session, sample_company.id, datetime(2001, 3, 5))
+    recent = _add_job(db_session, sample_company.id, datetime(2001, 4, 5))
+    partitions.ensure_partitions(date(2001, 3, 1), date(2001, 4, 1))
+
+    result = app.test_cli_runner().invoke(args=["partitions", "archive", "--before", "2001-04-01", "--yes"])
+    assert result.exit_code == 0, result.output
+    assert "job_p200103" in result.output and "job_p200104" not in result.output
+    db_session.expire_all()
+
+    assert client.get(f"/api/jobs/{old}").status_code == 404
+    archived = client.get(f"/api/jobs/archive/{old}")
+    assert archived.status_code == 200
+    assert (archived.get_json()["title"], archived.get_json()["company"]["name"]) == ("Archivist", "Test Company")
+    assert client.get(f"/api/jobs/archive/{old}", headers={"If-None-Match": archived.headers["ETag"]}).status_code == 304
+    assert client.get(f"/api/jobs/{recent}").status_code == 200
+    assert client.get(f"/api/jobs/archive/{recent}").status_code == 404
+    assert ("job_p200103", date(2001, 3, 1)) in PartitionRepository().find_partitions(archived=True)
+
+
+def test_keyset_pages_read_only_the_partitions_they_can_reach(db_session, partitions, sample_company):
+    partitions.ensure_partitions(date(2001, 5, 1), date(2001, 7, 1))
+    for month in (5, 6, 7):
+        _add_job(db_session, sample_company.id, datetime(2001, month, 10))
+        _add_job(db_session, sample_company.id, datetime(2001, month, 20))
+    repository = JobRepository()
+    cursor = repository.find_page(sort="posted_date", per_page=3).next_cursor
+
+    executed = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        page = repository.find_page(sort="posted_date", per_page=2, cursor=cursor)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    assert [job.posted_date.month for job in page.items] == [6, 7]
+
+    # Ascending from a June cursor: the May partition is never read.
+    statement, parameters = executed[-1]
+    plan = "\n".join(db_session.connection().exec_driver_sql("EXPLAIN " + statement, parameters).scalars())
+    assert "job_p200106" in plan and "job_p200107" in plan
+    assert "job_p200105" not in plan
+
+
+def test_sweeper_update_reads_only_the_partitions_of_its_batch(db_session, partitions, sample_company):
+    partitions.ensure_partitions(date(2001, 8, 1), date(2001, 10, 1))
+    expired = [_add_job(db_session, sample_company.id, datetime(2001, month, 10)) for month in (8, 9)]
+    _add_job(db_session, sample_company.id, datetime(2001, 10, 10))
+    db_session.execute(
+        text("UPDATE job SET expiry_date = '2001-11-01' WHERE id IN (:a, :b)"), {"a": expired[0], "b": expired[1]}
+    )
+    db_session.commit()
+    repository = JobRepository()
+    locked = repository.lock_expired(datetime(2002, 1, 1), 10)
+    assert [job_id for job_id, _ in locked] == expired
+
+    executed = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        assert repository.deactivate(locked, datetime(2002, 1, 1)) == 2
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+
+    statement, parameters = next(item for item in executed if item[0].startswith("UPDATE job"))
+    plan = "\n".join(db_session.connection().exec_driver_sql("EXPLAIN " + statement, parameters).scalars())
+    assert "job_p200108" in plan and "job_p200109" in plan
+    assert "job_p200110" not in plan and "job_default" not in plan
@@ -0,0 +1,56 @@
+"""Integration tests for ``flask seed`` (real DB, test config)."""
+from sqlalchemy import text
+
+from app.models.company import Company
+from app.models.enums import ExperienceLevel, JobType, RemoteOption
+from app.models.job import Job
+
+
+def _seed(app, *args):
+    result = app.test_cli_runner().invoke(args=["seed", "--as-of", "2024-03-14", *args])
+    assert result.exit_code == 0, result.output
+    return result
+
+
+def test_seed_loads_companies_and_jobs_with_search_vectors(app, db_session):
+    result = _seed(app, "--companies", "20", "--jobs", "500", "--truncate", "--yes")
+    db_session.expire_all()
+
+    assert "company: 20 rows, job: 500 rows" in result.output
+    mismatched = db_session.execute(text(
+        "SELECT count(*) FROM job JOIN company ON company.id = job.company_id"
+        " WHERE job.search_vector IS DISTINCT FROM"
+        " job_search_vector(job.title, job.description, job.location, company.name)"
+    )).scalar_one()
+    assert mismatched == 0
+    assert db_session.execute(text("SELECT sum(total_jobs) FROM company_job_stats")).scalar_one() == 500
+
+
+def test_seed_is_deterministic_and_appends_without_truncate(app, db_session):
+    _seed(app, "--companies", "5", "--jobs", "50", "--truncate", "--yes")
+    first = db_session.execute(text("SELECT title, company_id, salary_min, posted_date FROM job ORDER BY id")).all()
+    _seed(app, "--companies", "5", "--jobs", "50")
+    db_session.expire_all()
+
+    assert db_session.query(Company).count() == 10
+    again = db_session.execute(text(
+        "SELECT title, company_id - 5, salary_min, posted_date FROM job WHERE id > 50 ORDER BY id"
+    )).all()
+    assert again == first
+
+
+def test_search_vector_trigger_is_enabled_after_seeding(app, db_session):
+    _seed(app, "--companies", "1", "--jobs", "1", "--truncate", "--yes")
+    db_session.add(Job(
+        title="Kayak Guide",
+        description="Paddle",
+        company_id=1,
+        location="Oslo",
+        job_type=JobType.FULL_TIME,
+        experience_level=ExperienceLevel.MID,
+        remote_option=RemoteOption.ONSITE,
+    ))
+    db_session.commit()
+    assert db_session.execute(text(
+        "SELECT search_vector @@ to_tsquery('english', 'kayak') FROM job WHERE title = 'Kayak Guide'"
+    )).scalar_one()
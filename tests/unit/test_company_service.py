@@ -1,8 +1,20 @@
 """Unit tests for CompanyService with mocked CompanyRepository."""
-import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
-from app.exceptions.custom_exceptions import CompanyNotFoundException
+import pytest
+
+from sqlalchemy.exc import IntegrityError
+
+from app.exceptions.custom_exceptions import (
+    CompanyDeletionNotFoundException,
+    CompanyNotFoundException,
+    DuplicateCompanyException,
+    InvalidPayloadException,
+    OptimisticLockException,
+    PreconditionFailedException,
+)
+from app.models.enums import DeletionStatus
 from app.services.company_service import CompanyService
 
 
@@ -12,8 +24,30 @@ def mock_company_repository():
 
 
 @pytest.fixture
-def company_service(mock_company_repository):
-    return CompanyService(company_repository=mock_company_repository)
+def mock_job_repository():
+    return MagicMock()
+
+
+@pytest.fixture
+def mock_deletion_repository():
+    return MagicMock()
+
+
+@pytest.fixture
+def mock_stats_repository():
+    return MagicMock()
+
+
+@pytest.fixture
+def company_service(
+    mock_company_repository, mock_job_repository, mock_deletion_repository, mock_stats_repository
+):
+    return CompanyService(
+        company_repository=mock_company_repository,
+        job_repository=mock_job_repository,
+        deletion_repository=mock_deletion_repository,
+        stats_repository=mock_stats_repository,
+    )
 
 
 @pytest.fixture
@@ -35,6 +69,21 @@ def test_get_all_companies_returns_list(company_service, mock_company_repository
     mock_company_repository.find_all.assert_called_once()
 
 
+def test_get_companies_page_uses_default_page_size(app, company_service, mock_company_repository):
+    with app.app_context():
+        company_service.get_companies_page()
+    mock_company_repository.find_page.assert_called_once_with(
+        sort="name",
+        per_page=app.config["DEFAULT_PAGE_SIZE"],
+        cursor=None,
+        location=None,
+        fuzzy=False,
+        similarity_threshold=app.config["TRGM_SIMILARITY_THRESHOLD"],
+        as_rows=False,
+        fieldset=None,
+    )
+
+
 def test_get_company_by_id_with_existing_company(
     company_service, mock_company_repository, sample_company_mock
 ):
@@ -71,34 +120,191 @@ def test_create_company_with_valid_data(company_service, mock_company_repository
     assert result is sample_company_mock
 
 
-def test_update_company_updates_only_provided_fields(
+def test_create_company_with_taken_name_raises_duplicate(company_service, mock_company_repository):
+    mock_company_repository.save.side_effect = IntegrityError("INSERT", {}, Exception())
+    with pytest.raises(DuplicateCompanyException) as exc_info:
+        company_service.create_company({"name": "Acme", "location": "NYC"})
+    assert exc_info.value.name == "Acme"
+
+
+def test_upsert_companies_dedupes_by_normalized_name_and_maps_every_name(
+    app, company_service, mock_company_repository, monkeypatch
+):
+    cache = MagicMock()
+    monkeypatch.setattr("app.services.company_service.entity_cache", cache)
+    mock_company_repository.normalize_names.side_effect = lambda names: {
+        name: " ".join(name.split()).lower() for name in names
+    }
+    mock_company_repository.upsert_many.return_value = [(7, "acme inc", False), (8, "globex", True)]
+    companies = [
+        {"name": "Acme Inc", "location": "Old"},
+        {"name": "Globex", "location": "Springfield"},
+        {"name": " ACME   inc ", "location": "New"},
+    ]
+    with app.app_context():
+        result = company_service.upsert_companies(companies)
+
+    mock_company_repository.normalize_names.assert_called_once_with(["Acme Inc", "Globex", " ACME   inc "])
+    rows = mock_company_repository.upsert_many.call_args.args[0]
+    assert [(row["name"], row["location"]) for row in rows] == [(" ACME   inc ", "New"), ("Globex", "Springfield")]
+    assert result == {
+        "ids": {"Acme Inc": 7, "Globex": 8, " ACME   inc ": 7},
+        "created": 1,
+        "updated": 1,
+    }
+    cache.invalidate.assert_called_once_with("company", 7)
+
+
+def test_upsert_companies_rejects_oversized_batches(app, company_service, monkeypatch):
+    monkeypatch.setitem(app.config, "COMPANY_UPSERT_MAX_ROWS", 1)
+    with app.app_context(), pytest.raises(InvalidPayloadException):
+        company_service.upsert_companies([{"name": "A", "location": "x"}] * 2)
+
+
+def test_update_company_issues_single_versioned_update(
     company_service, mock_company_repository, sample_company_mock
 ):
-    mock_company_repository.find_by_id.return_value = sample_company_mock
-    mock_company_repository.save.return_value = sample_company_mock
-    result = company_service.update_company(1, {"name": "Updated Name"})
-    assert sample_company_mock.name == "Updated Name"
-    mock_company_repository.save.assert_called_once_with(sample_company_mock)
+    mock_company_repository.update_versioned.return_value = sample_company_mock
+    result = company_service.update_company(1, {"name": "Updated Name"}, 2)
+    mock_company_repository.update_versioned.assert_called_once_with(1, {"name": "Updated Name"}, 2)
+    mock_company_repository.find_by_id.assert_not_called()
     assert result is sample_company_mock
 
 
 def test_update_company_raises_company_not_found_exception(
     company_service, mock_company_repository
 ):
-    mock_company_repository.find_by_id.return_value = None
+    mock_company_repository.update_versioned.return_value = None
+    mock_company_repository.exists.return_value = False
     with pytest.raises(CompanyNotFoundException):
         company_service.update_company(999, {"name": "X"})
 
 
+def test_update_company_with_stale_version_raises_precondition_failed(
+    company_service, mock_company_repository
+):
+    mock_company_repository.update_versioned.return_value = None
+    mock_company_repository.exists.return_value = True
+    with pytest.raises(PreconditionFailedException):
+        company_service.update_company(1, {"name": "X"}, expected_version=1)
+
+
+def test_update_company_without_version_that_matches_nothing_raises_optimistic_lock(
+    company_service, mock_company_repository
+):
+    mock_company_repository.update_versioned.return_value = None
+    mock_company_repository.exists.return_value = True
+    with pytest.raises(OptimisticLockException) as exc_info:
+        company_service.update_company(1, {"name": "X"})
+    assert not isinstance(exc_info.value, PreconditionFailedException)
+
+
+def test_update_company_reraises_integrity_error_when_name_was_not_updated(
+    company_service, mock_company_repository
+):
+    mock_company_repository.update_versioned.side_effect = IntegrityError("UPDATE", {}, Exception())
+    with pytest.raises(IntegrityError):
+        company_service.update_company(1, {"location": "Elsewhere"})
+
+
+def test_update_and_delete_company_invalidate_cached_entry(
+    app, company_service, mock_company_repository, mock_job_repository, sample_company_mock, monkeypatch
+):
+    cache = MagicMock()
+    monkeypatch.setattr("app.services.company_service.entity_cache", cache)
+    mock_company_repository.update_versioned.return_value = sample_company_mock
+    mock_company_repository.find_by_id.return_value = sample_company_mock
+    mock_job_repository.count_for_company.return_value = 0
+    with app.app_context():
+        company_service.update_company(1, {"name": "New"})
+        company_service.delete_company(1)
+    assert [c.args for c in cache.invalidate.call_args_list] == [("company", 1), ("company", 1)]
+
+
 def test_delete_company_calls_repository_delete(
-    company_service, mock_company_repository, sample_company_mock
+    app, company_service, mock_company_repository, mock_job_repository, sample_company_mock
 ):
     mock_company_repository.find_by_id.return_value = sample_company_mock
-    company_service.delete_company(1)
+    mock_job_repository.count_for_company.return_value = 3
+    with app.app_context():
+        assert company_service.delete_company(1) is None
+        limit = app.config["COMPANY_DELETE_SYNC_MAX_JOBS"]
     mock_company_repository.find_by_id.assert_called_once_with(1)
+    mock_job_repository.count_for_company.assert_called_once_with(1, limit + 1)
     mock_company_repository.delete.assert_called_once_with(sample_company_mock)
 
 
+def test_delete_large_company_starts_background_deletion(
+    app, company_service, mock_company_repository, mock_job_repository,
+    mock_deletion_repository, sample_company_mock, monkeypatch
+):
+    task = MagicMock()
+    monkeypatch.setattr("app.services.company_service.delete_company_in_chunks", task)
+    mock_company_repository.find_by_id.return_value = sample_company_mock
+    deletion = MagicMock(id=5)
+    mock_deletion_repository.start.side_effect = [(deletion, True), (deletion, False)]
+    with app.app_context():
+        mock_job_repository.count_for_company.return_value = app.config["COMPANY_DELETE_SYNC_MAX_JOBS"] + 1
+        assert company_service.delete_company(1) is deletion
+        assert company_service.delete_company(1) is deletion
+    mock_company_repository.delete.assert_not_called()
+    task.delay.assert_called_once_with(5)
+
+
+def _deletion(status=DeletionStatus.PENDING):
+    return SimpleNamespace(id=5, company_id=1, status=status, jobs_deleted=0, error=None, completed_at=None)
+
+
+def test_run_deletion_deletes_jobs_in_chunks_then_the_company(
+    app, company_service, mock_company_repository, mock_job_repository, mock_deletion_repository,
+    mock_stats_repository, monkeypatch
+):
+    monkeypatch.setitem(app.config, "COMPANY_DELETE_CHUNK_SIZE", 2)
+    monkeypatch.setattr("app.services.company_service.UnitOfWork", MagicMock())
+    deletion = _deletion()
+    mock_deletion_repository.find_by_id.return_value = deletion
+    chunks = [[1, 2], [3, 4], [5]]
+    mock_job_repository.lock_chunk_for_company.side_effect = chunks
+    mock_job_repository.delete_many.side_effect = len
+    with app.app_context():
+        company_service.run_deletion(5)
+    assert mock_job_repository.lock_chunk_for_company.call_count == 3
+    assert [c.args[0] for c in mock_stats_repository.remove_jobs.call_args_list] == chunks
+    assert [c.args[0] for c in mock_job_repository.delete_many.call_args_list] == chunks
+    mock_company_repository.delete_by_id.assert_called_once_with(1)
+    assert deletion.status == DeletionStatus.COMPLETED
+    assert deletion.jobs_deleted == 5
+    assert deletion.completed_at is not None
+
+
+def test_run_deletion_records_failure(
+    app, company_service, mock_job_repository, mock_deletion_repository, monkeypatch
+):
+    monkeypatch.setattr("app.services.company_service.UnitOfWork", MagicMock())
+    deletion = _deletion()
+    mock_deletion_repository.find_by_id.return_value = deletion
+    mock_job_repository.lock_chunk_for_company.side_effect = RuntimeError("boom")
+    with app.app_context():
+        company_service.run_deletion(5)
+    assert deletion.status == DeletionStatus.FAILED
+    assert deletion.error == "boom"
+
+
+def test_run_deletion_ignores_finished_deletions(
+    app, company_service, mock_job_repository, mock_deletion_repository
+):
+    mock_deletion_repository.find_by_id.return_value = _deletion(DeletionStatus.COMPLETED)
+    with app.app_context():
+        company_service.run_deletion(5)
+    mock_job_repository.lock_chunk_for_company.assert_not_called()
+
+
+def test_get_deletion_raises_when_missing(company_service, mock_deletion_repository):
+    mock_deletion_repository.find_by_id.return_value = None
+    with pytest.raises(CompanyDeletionNotFoundException):
+        company_service.get_deletion(9)
+
+
 def test_delete_company_raises_company_not_found_exception(
     company_service, mock_company_repository
 ):
@@ -0,0 +1,88 @@
+"""Unit tests for ETag / Last-Modified helpers."""
+from datetime import datetime, timezone
+
+import pytest
+
+from app.exceptions.custom_exceptions import PreconditionFailedException
+from app.utils.conditional import (
+    collection_validators,
+    conditional_response,
+    entity_validators,
+    expected_version,
+    is_conditional,
+)
+
+UPDATED = datetime(2024, 5, 1, 12, 30, 15, 123456)
+
+
+def test_entity_validators_are_strong_and_change_with_version():
+    first = entity_validators((1, 0, UPDATED))
+    assert first.headers["ETag"] == f'"{first.etag}"'
+    assert first.headers["Last-Modified"] == "Wed, 01 May 2024 12:30:15 GMT"
+    assert entity_validators((1, 1, UPDATED)).etag != first.etag
+
+
+def test_entity_validators_tag_is_the_version_chain():
+    assert entity_validators((1, 3, UPDATED), (9, 7, None)).headers["ETag"] == '"3-7"'
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [(None, None), ("*", None), ('"4"', 4), ('"4-7"', 4)],
+)
+def test_expected_version_reads_leading_part_of_if_match(app, header, expected):
+    headers = {"If-Match": header} if header else {}
+    with app.test_request_context(headers=headers):
+        assert expected_version() == expected
+
+
+@pytest.mark.parametrize("header", ['W/"4"', '"abc"', '"4", "5"'])
+def test_expected_version_rejects_tags_that_cannot_match(app, header):
+    with app.test_request_context(headers={"If-Match": header}):
+        with pytest.raises(PreconditionFailedException):
+            expected_version()
+
+
+def test_entity_validators_cover_embedded_rows():
+    later = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    job_only = entity_validators((1, 0, UPDATED))
+    with_company = entity_validators((1, 0, UPDATED), (9, 3, later))
+    assert with_company.etag != job_only.etag
+    assert with_company.last_modified == later
+
+
+def test_collection_validators_are_weak_and_keyed_by_query():
+    stamps = [(1, 0, UPDATED), (2, 0, UPDATED)]
+    validators = collection_validators(stamps, "sort=name")
+    assert validators.headers["ETag"].startswith('W/"')
+    assert collection_validators(stamps, "sort=-name").etag != validators.etag
+    assert collection_validators(stamps[:1], "sort=name").etag != validators.etag
+
+
+def test_collection_validators_for_empty_page_omit_last_modified():
+    validators = collection_validators([], "sort=name")
+    assert "Last-Modified" not in validators.headers
+
+
+def test_if_none_match_uses_weak_comparison(app):
+    validators = collection_validators([(1, 0, UPDATED)], "q")
+    with app.test_request_context(headers={"If-None-Match": validators.headers["ETag"]}):
+        assert is_conditional()
+        assert validators.matches()
+        assert conditional_response(validators, []).status_code == 304
+    with app.test_request_context(headers={"If-None-Match": '"stale"'}):
+        body, status, headers = conditional_response(validators, [], {"X-Pagination": "{}"})
+        assert status == 200
+        assert headers["ETag"] == validators.headers["ETag"]
+        assert headers["X-Pagination"] == "{}"
+
+
+def test_if_modified_since_compares_at_second_resolution(app):
+    validators = entity_validators((1, 0, UPDATED))
+    with app.test_request_context(headers={"If-Modified-Since": "Wed, 01 May 2024 12:30:15 GMT"}):
+        assert validators.matches()
+    with app.test_request_context(headers={"If-Modified-Since": "Wed, 01 May 2024 12:30:14 GMT"}):
+        assert not validators.matches()
+    with app.test_request_context():
+        assert not is_conditional()
+        assert not validators.matches()
@@ -0,0 +1,176 @@
+"""Unit tests for the entity cache (LRU backend, generations, read-through)."""
+import pytest
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.cache.backends import CacheBackend, LRUCacheBackend, NullCacheBackend
+from app.cache.entity_cache import EntityCache
+from app.extensions import db
+from app.models.company import Company
+from app.models.enums import ExperienceLevel, JobType, RemoteOption
+from app.models.job import Job
+
+
+def test_backend_must_implement_every_operation():
+    class Partial(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_lru_backend_evicts_least_recently_used():
+    backend = LRUCacheBackend(max_size=2, ttl=60)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    assert backend.get("a") == 1
+    backend.set("c", 3)
+    assert backend.get("b") is None
+    assert backend.get("a") == 1
+    assert backend.stats()["evictions"] == 1
+
+
+def test_lru_backend_expires_entries_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.cache.backends.time.monotonic", lambda: now[0])
+    backend = LRUCacheBackend(max_size=10, ttl=30)
+    backend.set("a", 1)
+    now[0] += 29
+    assert backend.get("a") == 1
+    now[0] += 2
+    assert backend.get("a") is None
+    assert backend.stats()["expirations"] == 1
+
+
+def test_lru_backend_counters_survive_eviction():
+    backend = LRUCacheBackend(max_size=1, ttl=60)
+    assert backend.incr("gen:job:1") == 1
+    backend.set("x", 1)
+    backend.set("y", 2)
+    assert backend.get_counter("gen:job:1") == 1
+
+
+
+def test_lru_backend_drops_counters_idle_for_two_ttls(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.cache.backends.time.monotonic", lambda: now[0])
+    backend = LRUCacheBackend(max_size=10, ttl=30)
+    backend.incr("gen:job:1")
+    backend.incr("gen:job:2")
+    now[0] += 59
+    assert backend.get_counter("gen:job:1") == 1  # read keeps it
+    now[0] += 2
+    backend.incr("gen:job:3")
+    assert backend.stats()["counters"] == 2
+    assert backend.get_counter("gen:job:2") == 0
+    assert backend.get_counter("gen:job:1") == 1
+
+def _clean_detached(cls, **values):
+    """An instance that looks freshly loaded from the database, then detached."""
+    instance = cls()
+    for key, value in values.items():
+        set_committed_value(instance, key, value)
+    make_transient_to_detached(instance)
+    return instance
+
+
+def _detached_job(job_id=1, company_id=7, title="Engineer"):
+    company = _clean_detached(Company, id=company_id, name="Acme", location="NYC", version=0)
+    return _clean_detached(
+        Job,
+        id=job_id,
+        title=title,
+        description="Desc",
+        company_id=company_id,
+        location="NYC",
+        job_type=JobType.FULL_TIME,
+        experience_level=ExperienceLevel.MID,
+        remote_option=RemoteOption.REMOTE,
+        version=3,
+        company=company,
+    )
+
+
+@pytest.fixture
+def cache(app, monkeypatch):
+    monkeypatch.setitem(app.config, "ENTITY_CACHE_BACKEND", "lru")
+    cache = EntityCache()
+    with app.app_context():
+        monkeypatch.setitem(app.extensions, "entity_cache", None)
+        cache.init_app(app)
+        yield cache
+        db.session.rollback()
+
+
+def _job_loader(calls, **job_kwargs):
+    def loader(job_id):
+        calls.append(job_id)
+        return _detached_job(job_id, **job_kwargs)
+    return loader
+
+
+def _company_dependency(job):
+    return [("company", job.company_id)]
+
+
+def test_get_or_load_serves_second_read_from_cache(cache):
+    calls = []
+    loader = _job_loader(calls)
+    first = cache.get_or_load("job", 1, loader, _company_dependency)
+    second = cache.get_or_load("job", 1, loader, _company_dependency)
+    assert calls == [1]
+    assert second is not first
+    assert second.title == "Engineer"
+    assert second.company.name == "Acme"
+    assert second in db.session
+    assert cache.get_entry("job", 1)["version"] == 3
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_invalidate_entity_forces_reload(cache):
+    calls = []
+    loader = _job_loader(calls)
+    cache.get_or_load("job", 1, loader, _company_dependency)
+    cache.invalidate("job", 1)
+    cache.get_or_load("job", 1, loader, _company_dependency)
+    assert calls == [1, 1]
+
+
+def test_invalidating_company_makes_embedding_jobs_stale(cache):
+    calls = []
+    loader = _job_loader(calls, company_id=7)
+    cache.get_or_load("job", 1, loader, _company_dependency)
+    cache.invalidate("company", 7)
+    assert cache.get_entry("job", 1) is None
+    cache.get_or_load("job", 1, loader, _company_dependency)
+    assert calls == [1, 1]
+
+
+def test_missing_entities_are_not_cached(cache):
+    calls = []
+
+    def loader(job_id):
+        calls.append(job_id)
+        return None
+
+    assert cache.get_or_load("job", 5, loader) is None
+    assert cache.get_or_load("job", 5, loader) is None
+    assert calls == [5, 5]
+
+
+def test_cache_outside_app_context_is_a_passthrough():
+    cache = EntityCache()
+    assert isinstance(cache.backend, NullCacheBackend)
+    assert cache.get_or_load("job", 1, lambda job_id: "loaded") == "loaded"
+    assert cache.stats()["hits"] == 0
+
+
+def test_backend_can_be_given_as_dotted_path(app, monkeypatch):
+    monkeypatch.setitem(app.config, "ENTITY_CACHE_BACKEND", "app.cache.backends:NullCacheBackend")
+    monkeypatch.setitem(app.extensions, "entity_cache", None)
+    cache = EntityCache(app)
+    with app.app_context():
+        assert isinstance(cache.backend, NullCacheBackend)
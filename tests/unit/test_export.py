@@ -0,0 +1,63 @@
+"""Unit tests for the streaming NDJSON/CSV export serializers."""
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.models.enums import ExperienceLevel, JobType, RemoteOption
+from app.schemas.job_schema import JobSchema
+from app.utils.export import csv_columns, iter_csv, iter_ndjson
+
+
+def _job(job_id):
+    company = SimpleNamespace(id=1, name="Acme, Inc.", location="NYC")
+    return SimpleNamespace(
+        id=job_id,
+        title=f"Job {job_id}",
+        description="Line one\nline two",
+        company_id=1,
+        location="Remote",
+        salary_min=Decimal("100.00"),
+        salary_max=None,
+        job_type=JobType.FULL_TIME,
+        experience_level=ExperienceLevel.MID,
+        remote_option=RemoteOption.REMOTE,
+        posted_date=datetime(2024, 1, 1),
+        expiry_date=None,
+        is_active=True,
+        application_url=None,
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 1),
+        version=0,
+        company=company,
+    )
+
+
+def test_iter_ndjson_emits_one_schema_dump_per_line_in_chunks():
+    chunks = list(iter_ndjson((_job(i) for i in range(5)), JobSchema(), chunk_size=2))
+    assert len(chunks) == 3
+    lines = "".join(chunks).splitlines()
+    assert [json.loads(line) for line in lines] == [JobSchema().dump(_job(i)) for i in range(5)]
+
+
+def test_iter_ndjson_with_no_items_yields_nothing():
+    assert list(iter_ndjson([], JobSchema(), chunk_size=10)) == []
+
+
+def test_csv_columns_flatten_nested_company():
+    columns = csv_columns(JobSchema())
+    assert "company" not in columns
+    assert {"company.id", "company.name", "company.location"} <= set(columns)
+
+
+def test_iter_csv_yields_header_first_and_quotes_values():
+    chunks = list(iter_csv((_job(i) for i in range(3)), JobSchema(), chunk_size=2))
+    assert chunks[0].startswith("id,")
+    assert len(chunks) == 3
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert [row["id"] for row in rows] == ["0", "1", "2"]
+    assert rows[0]["company.name"] == "Acme, Inc."
+    assert rows[0]["description"] == "Line one\nline two"
+    assert rows[0]["salary_max"] == ""
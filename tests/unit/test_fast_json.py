@@ -0,0 +1,127 @@
+"""Unit tests for the row serializer and JSON encoder behind the fast list path."""
+from collections import namedtuple
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from flask import jsonify
+from marshmallow import Schema, fields
+
+from app.models.enums import ExperienceLevel, JobType, RemoteOption
+from app.schemas.company_schema import CompanySchema
+from app.schemas.job_schema import JobSchema
+from app.utils import fast_json
+from app.utils.fast_json import compile_row_serializer, dumps, rows_response
+
+JobRow = namedtuple(
+    "JobRow",
+    "id title description company_id location salary_min salary_max job_type experience_level "
+    "remote_option posted_date expiry_date is_active application_url created_at updated_at version "
+    "company__id company__name company__location company__version company__updated_at",
+)
+
+
+def _job_row(**overrides):
+    values = dict(
+        id=7,
+        title="Backend Engineer",
+        description='Line one\nline "two" \\ \u00e9t\u00e9 \x7f',
+        company_id=3,
+        location="Z\u00fcrich",
+        salary_min=Decimal("50000.00"),
+        salary_max=None,
+        job_type=JobType.FULL_TIME,
+        experience_level=ExperienceLevel.MID,
+        remote_option=RemoteOption.HYBRID,
+        posted_date=datetime(2024, 1, 2, 3, 4, 5, 678901),
+        expiry_date=None,
+        is_active=True,
+        application_url=None,
+        created_at=datetime(2024, 1, 2, 3, 4, 5),
+        updated_at=datetime(2024, 1, 3),
+        version=2,
+        company__id=3,
+        company__name="Acme \u2028 Ltd",
+        company__location="Berlin",
+        company__version=1,
+        company__updated_at=datetime(2024, 1, 1),
+    )
+    values.update(overrides)
+    return JobRow(**values)
+
+
+def _as_entity(row):
+    """The ORM-shaped object the marshmallow path would dump for ``row``."""
+    data = row._asdict()
+    company = SimpleNamespace(**{key[len("company__"):]: data.pop(key) for key in list(data) if key.startswith("company__")})
+    return SimpleNamespace(**data, company=company)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_rows_response_is_byte_identical_to_schema_dump(app, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(fast_json, "orjson", None)
+    rows = [_job_row(), _job_row(id=8, title="Plain ascii", description="d", location="Paris", company__name="Acme")]
+    with app.app_context():
+        expected = jsonify(JobSchema(many=True).dump([_as_entity(row) for row in rows])).get_data()
+        assert rows_response(JobSchema(), rows).get_data() == expected
+
+
+def test_rows_response_honours_debug_indentation(app, monkeypatch):
+    rows = [_job_row()]
+    monkeypatch.setattr(app, "debug", True)
+    with app.app_context():
+        expected = jsonify(JobSchema(many=True).dump([_as_entity(row) for row in rows])).get_data()
+        assert rows_response(JobSchema(), rows).get_data() == expected
+
+
+def test_rows_response_for_empty_page(app):
+    with app.app_context():
+        response = rows_response(JobSchema(), [])
+        assert response.get_data() == b"[]\n"
+        assert response.mimetype == "application/json"
+
+
+def test_serializer_ignores_extra_columns_and_follows_schema_only():
+    CompanyRow = namedtuple("CompanyRow", "id name description website location created_at updated_at version extra")
+    row = CompanyRow(1, "Acme", None, None, "Berlin", datetime(2024, 1, 1), None, 1, "ignored")
+    serialize = compile_row_serializer(CompanySchema(only=("id", "name")), CompanyRow._fields)
+    assert serialize(row) == {"id": 1, "name": "Acme"}
+
+
+def test_serializer_nested_value_is_none_without_a_joined_row():
+    row = _job_row(company__id=None, company__name=None, company__location=None)
+    serialize = compile_row_serializer(JobSchema(), JobRow._fields)
+    assert serialize(row)["company"] is None
+
+
+def test_serializer_rejects_missing_columns():
+    with pytest.raises(TypeError, match="company__name"):
+        compile_row_serializer(JobSchema(), [f for f in JobRow._fields if f != "company__name"])
+
+
+def test_serializer_rejects_fields_without_a_row_equivalent():
+    class RatedSchema(Schema):
+        rating = fields.Float()
+
+    with pytest.raises(TypeError, match="Float field 'rating'"):
+        compile_row_serializer(RatedSchema(), ["rating"])
+
+
+def test_dumps_falls_back_when_orjson_output_would_differ(app):
+    with app.app_context():
+        assert dumps({"name": "caf\u00e9"}) == b'{"name":"caf\\u00e9"}\n'
+        assert dumps(["\x7f"]) == b'["\\u007f"]\n'
+
+
+def test_row_serializer_cache_is_bounded_and_keeps_recent_entries(app, monkeypatch):
+    monkeypatch.setattr(fast_json, "SERIALIZER_CACHE_SIZE", 2)
+    monkeypatch.setattr(fast_json, "_serializers", fast_json.OrderedDict())
+    with app.app_context():
+        first = fast_json.row_serializer(CompanySchema(only=("id",)), ("id",))
+        fast_json.row_serializer(CompanySchema(only=("name",)), ("name",))
+        assert fast_json.row_serializer(CompanySchema(only=("id",)), ("id",)) is first
+        fast_json.row_serializer(CompanySchema(only=("location",)), ("location",))
+    assert len(fast_json._serializers) == 2
+    assert [key[1] for key in fast_json._serializers] == [("id",), ("location",)]
@@ -0,0 +1,32 @@
+"""Unit tests for sparse fieldset helpers and the columns they pull into a query."""
+from app.repositories.job_repository import SORT_KEYS, fieldset_columns
+from app.utils.fieldsets import includes, nested, top_level
+
+
+def test_includes_and_nested_selection():
+    fieldset = ("id", "company.name")
+    assert includes(None, "company")
+    assert includes(fieldset, "company")
+    assert not includes(("id", "title"), "company")
+    assert top_level(fieldset) == {"id", "company"}
+    assert nested(fieldset, "company") == {"name"}
+    assert nested(("company", "company.name"), "company") is None
+
+
+def test_fieldset_columns_skip_company_when_not_requested():
+    job_columns, company_columns = fieldset_columns(("title",), SORT_KEYS["-posted_date"])
+    assert job_columns == {"id", "version", "updated_at", "posted_date", "title"}
+    assert company_columns == set()
+
+
+def test_fieldset_columns_load_requested_company_columns_and_stamp():
+    job_columns, company_columns = fieldset_columns(("id", "company.name"), SORT_KEYS["salary_min"])
+    assert {"company_id", "salary_min"} <= job_columns
+    assert "description" not in job_columns
+    assert company_columns == {"id", "version", "updated_at", "name"}
+
+
+def test_fieldset_columns_without_fieldset_load_everything():
+    job_columns, company_columns = fieldset_columns(None, SORT_KEYS["-posted_date"])
+    assert "description" in job_columns and "search_vector" not in job_columns
+    assert {"name", "location"} <= company_columns
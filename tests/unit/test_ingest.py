@@ -0,0 +1,44 @@
+"""Unit tests for streamed JSON array / NDJSON request parsing."""
+import io
+import json
+
+import pytest
+
+from app.exceptions.custom_exceptions import InvalidPayloadException
+from app.utils.ingest import MalformedRecord, iter_json_array, iter_ndjson_records
+
+RECORDS = [{"title": "Engineer", "tags": ["a", "b"]}, 12345, "café", None, {"nested": {"x": 1.5}}]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1024])
+def test_iter_json_array_handles_elements_split_across_chunks(chunk_size):
+    body = io.BytesIO(json.dumps(RECORDS, ensure_ascii=False).encode("utf-8"))
+    assert list(iter_json_array(body, chunk_size)) == RECORDS
+
+
+def test_iter_json_array_accepts_empty_array_and_whitespace():
+    assert list(iter_json_array(io.BytesIO(b"  [ \n ]  "))) == []
+
+
+@pytest.mark.parametrize("body", [b'{"a": 1}', b"[1, 2", b"[1 2]", b"[1,]", b""])
+def test_iter_json_array_rejects_malformed_bodies(body):
+    with pytest.raises(InvalidPayloadException):
+        list(iter_json_array(io.BytesIO(body), 2))
+
+
+def test_iter_json_array_yields_rows_before_a_syntax_error():
+    records = iter_json_array(io.BytesIO(b'[{"a": 1}, {"b": 2}, oops]'))
+    assert next(records) == {"a": 1}
+    assert next(records) == {"b": 2}
+    with pytest.raises(InvalidPayloadException):
+        next(records)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1024])
+def test_iter_ndjson_records_parses_lines_and_flags_bad_ones(chunk_size):
+    body = io.BytesIO(b'{"a": 1}\n\nnot json\n{"b": "\xc3\xa9"}')
+    records = list(iter_ndjson_records(body, chunk_size))
+    assert records[0] == {"a": 1}
+    assert isinstance(records[1], MalformedRecord)
+    assert records[2] == {"b": "é"}
+    assert len(records) == 3
@@ -0,0 +1,64 @@
+"""Unit tests for JobRepository statement building, with the session mocked out."""
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.enums import JobType
+from app.repositories import job_repository
+from app.repositories.job_repository import JobRepository
+
+
+@pytest.fixture
+def session(monkeypatch):
+    db = MagicMock()
+    monkeypatch.setattr(job_repository, "db", db)
+    return db.session
+
+
+def _sql(session) -> str:
+    statement = session.execute.call_args.args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_facet_counts_use_one_filter_aggregate_query(session):
+    # 4 job types + 3 levels + 3 remote options + 3 bands + unspecified
+    session.execute.return_value.one.return_value = tuple(range(14))
+    facets = JobRepository().facet_counts("python", [50000, 100000], job_type=JobType.CONTRACT, location=None)
+
+    sql = _sql(session)
+    session.execute.assert_called_once()
+    assert sql.count("count(*) FILTER (WHERE") == 14
+    assert "@@ websearch_to_tsquery" in sql
+    assert [bucket["value"] for bucket in facets["job_type"]] == ["FULL_TIME", "PART_TIME", "CONTRACT", "INTERNSHIP"]
+    assert [bucket["count"] for bucket in facets["remote_option"]] == [7, 8, 9]
+    assert facets["salary_band"] == [
+        {"value": "<50000", "min": None, "max": 50000, "count": 10},
+        {"value": "50000-100000", "min": 50000, "max": 100000, "count": 11},
+        {"value": "100000+", "min": 100000, "max": None, "count": 12},
+        {"value": "unspecified", "min": None, "max": None, "count": 13},
+    ]
+
+
+@pytest.mark.parametrize("as_rows", [False, True])
+def test_find_page_with_fieldset_selects_only_needed_columns(session, as_rows):
+    session.execute.return_value.all.return_value = []
+    session.execute.return_value.unique.return_value.scalars.return_value.all.return_value = []
+    JobRepository().find_page(sort="-posted_date", per_page=5, as_rows=as_rows, fieldset=("title",))
+
+    columns = _sql(session).split(" FROM ")[0]
+    assert "job.title" in columns and "job.posted_date" in columns
+    assert "job.description" not in columns
+    assert "company" not in _sql(session).replace("company_id", "")
+
+
+@pytest.mark.parametrize("as_rows", [False, True])
+def test_find_page_joins_company_for_nested_fields(session, as_rows):
+    session.execute.return_value.all.return_value = []
+    session.execute.return_value.unique.return_value.scalars.return_value.all.return_value = []
+    JobRepository().find_page(sort="-posted_date", per_page=5, as_rows=as_rows, fieldset=("company.name",))
+
+    sql = _sql(session)
+    assert "JOIN company" in sql
+    assert "company.name" in sql or "company_1.name" in sql
+    assert "website" not in sql
@@ -1,10 +1,20 @@
 """Unit tests for JobService with mocked JobRepository and CompanyRepository."""
+from datetime import datetime
+
 import pytest
 from unittest.mock import MagicMock
 
-from app.exceptions.custom_exceptions import CompanyNotFoundException, JobNotFoundException
+from sqlalchemy.exc import IntegrityError
+
+from app.exceptions.custom_exceptions import (
+    CompanyNotFoundException,
+    JobNotFoundException,
+    OptimisticLockException,
+    PreconditionFailedException,
+)
 from app.models.enums import ExperienceLevel, JobType, RemoteOption
 from app.services.job_service import JobService
+from app.utils.ingest import MalformedRecord
 
 
 @pytest.fixture
@@ -18,11 +28,19 @@ def mock_company_repository():
 
 
 @pytest.fixture
-def job_service(mock_job_repository, mock_company_repository):
-    return JobService(
-        job_repository=mock_job_repository,
-        company_repository=mock_company_repository,
-    )
+def mock_stats_repository():
+    return MagicMock()
+
+
+@pytest.fixture
+def job_service(app, mock_job_repository, mock_company_repository, mock_stats_repository):
+    # Writes run in a UnitOfWork, which needs an application context.
+    with app.app_context():
+        yield JobService(
+            job_repository=mock_job_repository,
+            company_repository=mock_company_repository,
+            stats_repository=mock_stats_repository,
+        )
 
 
 @pytest.fixture
@@ -54,6 +72,90 @@ def test_get_all_jobs_returns_list(job_service, mock_job_repository, sample_job_
     mock_job_repository.find_all.assert_called_once()
 
 
+def test_get_jobs_page_clamps_per_page_and_delegates(app, job_service, mock_job_repository):
+    job_service.get_jobs_page(sort="salary_min", cursor="abc", per_page=1000)
+    mock_job_repository.find_page.assert_called_once_with(
+        sort="salary_min",
+        per_page=app.config["MAX_PAGE_SIZE"],
+        cursor="abc",
+        similarity_threshold=app.config["TRGM_SIMILARITY_THRESHOLD"],
+        as_rows=False,
+        fieldset=None,
+        location=None,
+        title=None,
+        fuzzy=False,
+    )
+
+
+def test_get_active_jobs_page_clamps_per_page(app, job_service, mock_job_repository):
+    job_service.get_active_jobs_page(cursor="abc", per_page=1000)
+    mock_job_repository.find_active_page.assert_called_once_with(app.config["MAX_PAGE_SIZE"], "abc")
+
+
+def test_suggest_formats_repository_matches(app, job_service, mock_job_repository):
+    mock_job_repository.suggest_values.return_value = [("New York", 0.6)]
+    result = job_service.suggest("Nwe York", field="location", limit=3)
+    assert result == [{"value": "New York", "score": 0.6}]
+    mock_job_repository.suggest_values.assert_called_once_with(
+        "location", "Nwe York", 3, app.config["TRGM_SIMILARITY_THRESHOLD"]
+    )
+
+
+def test_search_jobs_converts_enum_filters_and_builds_pagination(
+    app, job_service, mock_job_repository, sample_job_mock
+):
+    mock_job_repository.search.return_value = (["hit"], 41)
+    result = job_service.search_jobs(
+        "python", job_type="CONTRACT", remote_option="HYBRID", page=2, per_page=20
+    )
+    mock_job_repository.search.assert_called_once_with(
+        "python",
+        page=2,
+        per_page=20,
+        highlight=False,
+        similarity_threshold=app.config["TRGM_SIMILARITY_THRESHOLD"],
+        location=None,
+        title=None,
+        fuzzy=False,
+        company_id=None,
+        job_type=JobType.CONTRACT,
+        experience_level=None,
+        remote_option=RemoteOption.HYBRID,
+    )
+    assert result["items"] == ["hit"]
+    assert result["pagination"]["total"] == 41
+    assert result["pagination"]["pages"] == 3
+
+
+def test_search_jobs_with_facets_caches_counts_across_pages(
+    app, job_service, mock_job_repository, monkeypatch
+):
+    from app.extensions import facet_cache
+
+    mock_job_repository.search.return_value = ([], 0)
+    mock_job_repository.facet_counts.return_value = {"job_type": [{"value": "CONTRACT", "count": 2}]}
+    monkeypatch.setitem(app.config, "FACET_CACHE_TTL", 30)
+    monkeypatch.setitem(app.extensions, "facet_cache", None)
+    facet_cache.init_app(app)
+    first = job_service.search_jobs("python", job_type="CONTRACT", facets=True)
+    second = job_service.search_jobs("python", job_type="CONTRACT", facets=True, page=2)
+    plain = job_service.search_jobs("python", job_type="CONTRACT")
+    assert first["facets"] == second["facets"] == mock_job_repository.facet_counts.return_value
+    assert "facets" not in plain
+    mock_job_repository.facet_counts.assert_called_once_with(
+        "python",
+        tuple(app.config["FACET_SALARY_BANDS"]),
+        similarity_threshold=app.config["TRGM_SIMILARITY_THRESHOLD"],
+        location=None,
+        title=None,
+        fuzzy=False,
+        company_id=None,
+        job_type=JobType.CONTRACT,
+        experience_level=None,
+        remote_option=None,
+    )
+
+
 def test_get_job_by_id_with_existing_job(
     job_service, mock_job_repository, sample_job_mock
 ):
@@ -119,22 +221,118 @@ def test_create_job_raises_company_not_found_for_invalid_company_id(
     assert exc_info.value.company_id == 999
 
 
-def test_update_job_updates_only_provided_fields(
+def _bulk_row(company_id, title="Job"):
+    return {
+        "title": title,
+        "description": "Desc",
+        "company_id": company_id,
+        "location": "City",
+        "job_type": "FULL_TIME",
+        "experience_level": "MID",
+        "remote_option": "REMOTE",
+    }
+
+
+def test_bulk_create_jobs_reports_each_row_and_chunks_inserts(
+    app, job_service, mock_job_repository, mock_company_repository, monkeypatch
+):
+    monkeypatch.setitem(app.config, "BULK_CHUNK_SIZE", 2)
+    mock_company_repository.find_existing_ids.side_effect = lambda ids: set(ids) & {1}
+    mock_job_repository.insert_many.side_effect = lambda rows: list(range(100, 100 + len(rows)))
+    records = [
+        _bulk_row(1, "A"),
+        {"title": "missing fields"},
+        _bulk_row(2, "unknown company"),
+        MalformedRecord("Invalid JSON"),
+        _bulk_row(1, "B"),
+    ]
+    result = job_service.bulk_create_jobs(records)
+
+    assert (result["received"], result["created"], result["rejected"]) == (5, 2, 3)
+    assert [r["status"] for r in result["results"]] == [
+        "created", "rejected", "rejected", "rejected", "created"
+    ]
+    assert result["results"][0]["id"] == 100
+    assert "company_id" in result["results"][2]["errors"]
+    # Company 1 is resolved once and remembered for later chunks.
+    assert [c.args[0] for c in mock_company_repository.find_existing_ids.call_args_list] == [{1, 2}, set()]
+    inserted = mock_job_repository.insert_many.call_args_list[0].args[0]
+    assert inserted[0]["job_type"] == JobType.FULL_TIME
+
+
+def test_bulk_create_jobs_counts_each_inserted_chunk_into_stats(
+    app, job_service, mock_job_repository, mock_company_repository, mock_stats_repository, monkeypatch
+):
+    monkeypatch.setitem(app.config, "BULK_CHUNK_SIZE", 2)
+    mock_company_repository.find_existing_ids.side_effect = lambda ids: set(ids)
+    mock_job_repository.insert_many.side_effect = lambda rows: list(range(100, 100 + len(rows)))
+    job_service.bulk_create_jobs([_bulk_row(1, title) for title in "ABC"])
+
+    assert [c.args[0] for c in mock_stats_repository.add_jobs.call_args_list] == [[100, 101], [100]]
+
+
+def test_bulk_create_jobs_stops_at_max_rows(app, job_service, mock_job_repository, mock_company_repository, monkeypatch):
+    monkeypatch.setitem(app.config, "BULK_MAX_ROWS", 2)
+    mock_company_repository.find_existing_ids.return_value = {1}
+    mock_job_repository.insert_many.side_effect = lambda rows: list(range(len(rows)))
+    result = job_service.bulk_create_jobs(_bulk_row(1) for _ in range(5))
+    assert result["truncated"] is True
+    assert result["created"] == 2
+
+
+def test_update_job_issues_single_versioned_update(
     job_service, mock_job_repository, sample_job_mock
 ):
-    mock_job_repository.find_by_id.return_value = sample_job_mock
-    mock_job_repository.save.return_value = sample_job_mock
-    result = job_service.update_job(1, {"title": "Updated Title"})
-    assert sample_job_mock.title == "Updated Title"
-    mock_job_repository.save.assert_called_once_with(sample_job_mock)
+    mock_job_repository.update_versioned.return_value = sample_job_mock
+    result = job_service.update_job(1, {"title": "Updated Title", "job_type": "CONTRACT"}, 3)
+    mock_job_repository.update_versioned.assert_called_once_with(
+        1, {"title": "Updated Title", "job_type": JobType.CONTRACT}, 3
+    )
+    mock_job_repository.find_by_id.assert_not_called()
     assert result is sample_job_mock
 
 
-def test_update_job_validates_new_company_id(
-    job_service, mock_job_repository, mock_company_repository, sample_job_mock
+def test_create_job_counts_new_job_into_stats(
+    job_service, mock_job_repository, mock_company_repository, mock_stats_repository, sample_job_mock
 ):
-    mock_job_repository.find_by_id.return_value = sample_job_mock
-    mock_company_repository.find_by_id.return_value = None
+    mock_job_repository.save.return_value = sample_job_mock
+    job_service.create_job({
+        "title": "Job", "description": "Desc", "company_id": 1, "location": "City",
+        "job_type": "FULL_TIME", "experience_level": "MID", "remote_option": "REMOTE",
+    })
+    mock_stats_repository.add_jobs.assert_called_once_with([sample_job_mock.id])
+
+
+def test_update_job_moves_stats_only_for_counted_fields(
+    job_service, mock_job_repository, mock_stats_repository, sample_job_mock
+):
+    calls = MagicMock()
+    calls.attach_mock(mock_stats_repository, "stats")
+    calls.attach_mock(mock_job_repository.update_versioned, "update")
+    mock_job_repository.update_versioned.return_value = sample_job_mock
+
+    job_service.update_job(1, {"title": "Renamed"})
+    mock_stats_repository.remove_jobs.assert_not_called()
+
+    job_service.update_job(1, {"is_active": False})
+    assert [name for name, *_ in calls.mock_calls[-3:]] == ["stats.remove_jobs", "update", "stats.add_jobs"]
+
+
+def test_update_job_leaves_stats_alone_when_nothing_was_updated(
+    job_service, mock_job_repository, mock_stats_repository
+):
+    mock_job_repository.update_versioned.return_value = None
+    mock_job_repository.exists.return_value = True
+    with pytest.raises(OptimisticLockException):
+        job_service.update_job(1, {"salary_min": 1}, 2)
+    # The subtraction is rolled back with the unit of work.
+    mock_stats_repository.add_jobs.assert_not_called()
+
+
+def test_update_job_maps_foreign_key_violation_to_company_not_found(
+    job_service, mock_job_repository
+):
+    mock_job_repository.update_versioned.side_effect = IntegrityError("UPDATE", {}, Exception())
     with pytest.raises(CompanyNotFoundException) as exc_info:
         job_service.update_job(1, {"company_id": 999})
     assert exc_info.value.company_id == 999
@@ -143,18 +341,42 @@ def test_update_job_validates_new_company_id(
 def test_update_job_raises_job_not_found_exception(
     job_service, mock_job_repository
 ):
-    mock_job_repository.find_by_id.return_value = None
+    mock_job_repository.update_versioned.return_value = None
+    mock_job_repository.exists.return_value = False
     with pytest.raises(JobNotFoundException):
         job_service.update_job(999, {"title": "X"})
 
 
+def test_update_job_with_stale_version_raises_precondition_failed(
+    job_service, mock_job_repository
+):
+    mock_job_repository.update_versioned.return_value = None
+    mock_job_repository.exists.return_value = True
+    with pytest.raises(PreconditionFailedException):
+        job_service.update_job(1, {"title": "X"}, expected_version=1)
+
+
+def test_update_and_delete_job_invalidate_cached_entry(
+    job_service, mock_job_repository, sample_job_mock, monkeypatch
+):
+    cache = MagicMock()
+    monkeypatch.setattr("app.services.job_service.entity_cache", cache)
+    mock_job_repository.update_versioned.return_value = sample_job_mock
+    mock_job_repository.find_by_id.return_value = sample_job_mock
+    job_service.update_job(1, {"title": "New"})
+    job_service.delete_job(1)
+    assert [c.args for c in cache.invalidate.call_args_list] == [("job", 1), ("job", 1)]
+    cache.get_or_load.assert_not_called()
+
+
 def test_delete_job_calls_repository_delete(
-    job_service, mock_job_repository, sample_job_mock
+    job_service, mock_job_repository, mock_stats_repository, sample_job_mock
 ):
     mock_job_repository.find_by_id.return_value = sample_job_mock
     job_service.delete_job(1)
     mock_job_repository.find_by_id.assert_called_once_with(1)
     mock_job_repository.delete.assert_called_once_with(sample_job_mock)
+    mock_stats_repository.remove_jobs.assert_called_once_with([1])
 
 
 def test_delete_job_raises_job_not_found_exception(
@@ -163,3 +385,35 @@ def test_delete_job_raises_job_not_found_exception(
     mock_job_repository.find_by_id.return_value = None
     with pytest.raises(JobNotFoundException):
         job_service.delete_job(999)
+
+
+def test_expire_jobs_works_in_batches_and_invalidates_each_job(
+    app, job_service, mock_job_repository, mock_stats_repository, monkeypatch
+):
+    monkeypatch.setitem(app.config, "JOB_EXPIRY_BATCH_SIZE", 2)
+    cache = MagicMock()
+    monkeypatch.setattr("app.services.job_service.entity_cache", cache)
+    posted = datetime(2024, 1, 1)
+    batches = [[(1, posted), (2, posted)], [(3, posted), (4, posted)], [(5, posted)]]
+    mock_job_repository.lock_expired.side_effect = batches
+    result = job_service.expire_jobs()
+    assert (result["deactivated"], result["batches"]) == (5, 3)
+    assert [c.args[0] for c in mock_job_repository.deactivate.call_args_list] == batches
+    assert [c.args[0] for c in mock_stats_repository.remove_jobs.call_args_list] == [[1, 2], [3, 4], [5]]
+    assert mock_stats_repository.remove_jobs.call_count == mock_stats_repository.add_jobs.call_count == 3
+    assert [c.args for c in cache.invalidate.call_args_list] == [("job", n) for n in range(1, 6)]
+
+
+def test_expire_jobs_stops_at_max_batches(app, job_service, mock_job_repository, monkeypatch):
+    monkeypatch.setitem(app.config, "JOB_EXPIRY_BATCH_SIZE", 1)
+    monkeypatch.setitem(app.config, "JOB_EXPIRY_MAX_BATCHES", 2)
+    posted = datetime(2024, 1, 1)
+    mock_job_repository.lock_expired.side_effect = [[(1, posted)], [(2, posted)], [(3, posted)]]
+    assert job_service.expire_jobs()["deactivated"] == 2
+
+
+def test_expire_jobs_with_nothing_expired_writes_nothing(job_service, mock_job_repository, mock_stats_repository):
+    mock_job_repository.lock_expired.return_value = []
+    assert job_service.expire_jobs()["deactivated"] == 0
+    mock_job_repository.deactivate.assert_not_called()
+    mock_stats_repository.remove_jobs.assert_not_called()
@@ -0,0 +1,56 @@
+"""Unit tests for JobStatsRepository statement building, with the session mocked out."""
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.repositories import job_stats_repository
+from app.repositories.job_stats_repository import JobStatsRepository
+
+
+@pytest.fixture
+def session(app, monkeypatch):
+    db = MagicMock()
+    monkeypatch.setattr(job_stats_repository, "db", db)
+    with app.app_context():
+        yield db.session
+
+
+def _statements(session):
+    return [
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in session.execute.call_args_list
+    ]
+
+
+def test_remove_jobs_subtracts_locked_rows_from_every_rollup(session):
+    JobStatsRepository().remove_jobs([4, 5])
+
+    statements = _statements(session)
+    assert len(statements) == 3
+    for sql in statements:
+        assert "FOR UPDATE" in sql
+        assert "job.id IN" in sql
+        assert "ON CONFLICT" in sql and "DO UPDATE SET" in sql
+        assert "-count(*)" in sql
+    assert "job_salary_stats.jobs + excluded.jobs" in statements[2]
+    assert "floor(jobs.salary_min / " in statements[2]
+
+
+def test_add_jobs_without_ids_does_nothing(session):
+    JobStatsRepository().add_jobs([])
+    session.execute.assert_not_called()
+
+
+def test_rebuild_locks_then_replaces_every_rollup(session):
+    session.execute.return_value.rowcount = 2
+    written = JobStatsRepository().rebuild()
+
+    statements = _statements(session)
+    assert statements[0] == (
+        "LOCK TABLE job_daily_stats, company_job_stats, job_salary_stats IN EXCLUSIVE MODE"
+    )
+    assert statements[1] == "DELETE FROM job_daily_stats"
+    assert statements[2].startswith("INSERT INTO job_daily_stats")
+    assert "FOR UPDATE" not in statements[2] and "ON CONFLICT" not in statements[2]
+    assert written == {"job_daily_stats": 2, "company_job_stats": 2, "job_salary_stats": 2}
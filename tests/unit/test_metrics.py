@@ -0,0 +1,108 @@
+"""Unit tests for the Prometheus metrics (no database needed)."""
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+from prometheus_client import REGISTRY, Counter
+
+from app.utils import metrics
+from app.utils.metrics import _sync_counter
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def test_requests_are_counted_and_timed_per_endpoint(client):
+    labels = {"method": "GET", "blueprint": "system", "endpoint": "system.CacheStats"}
+    before = _sample("http_requests_total", status="200", **labels)
+    timed_before = _sample("http_request_duration_seconds_count", **labels)
+
+    assert client.get("/api/system/cache").status_code == 200
+
+    assert _sample("http_requests_total", status="200", **labels) == before + 1
+    assert _sample("http_request_duration_seconds_count", **labels) == timed_before + 1
+    assert _sample("http_requests_in_flight", blueprint="system") == 0
+
+
+def test_unmatched_routes_share_one_label(client):
+    labels = {"method": "GET", "blueprint": "none", "endpoint": "none", "status": "404"}
+    before = _sample("http_requests_total", **labels)
+    client.get("/no/such/page")
+    client.get("/another/missing/page")
+    assert _sample("http_requests_total", **labels) == before + 2
+
+
+def test_metrics_endpoint_serves_text_exposition_format(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    body = response.get_data(as_text=True)
+    for name in ("http_request_duration_seconds", "db_pool_connections_in_use", "cache_hits_total"):
+        assert f"# TYPE {name}" in body
+    assert 'endpoint="metrics"' not in body
+
+
+def test_sync_counter_adds_growth_and_survives_resets(monkeypatch):
+    monkeypatch.setattr(metrics, "_synced", {})
+    counter = Counter("test_synced_total", "Test counter.", registry=None)
+    _sync_counter("key", 5, counter)
+    _sync_counter("key", 7, counter)
+    _sync_counter("key", 3, counter)  # source restarted
+    assert counter._value.get() == 10
+
+
+
+def test_sync_counter_counts_growth_once_across_threads(monkeypatch):
+    monkeypatch.setattr(metrics, "_synced", {})
+    counter = Counter("test_synced_threads_total", "Test counter.", registry=None)
+    inc = counter.inc
+
+    def slow_inc(amount):
+        time.sleep(0.01)  # widen the read-modify-write window
+        inc(amount)
+
+    monkeypatch.setattr(counter, "inc", slow_inc)
+    threads = [threading.Thread(target=_sync_counter, args=("key", 5, counter)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter._value.get() == 5
+
+WORKER = textwrap.dedent("""
+    import sys
+    from app import create_app
+
+    client = create_app("testing").test_client()
+    for _ in range(int(sys.argv[1])):
+        client.get("/api/system/cache")
+    if len(sys.argv) > 2:
+        sys.stdout.write(client.get("/metrics").get_data(as_text=True))
+""")
+
+
+def test_multiprocess_mode_aggregates_across_workers(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "PYTHONPATH": os.getcwd()}
+
+    def worker(*args):
+        return subprocess.run(
+            [sys.executable, "-c", WORKER, *args], env=env, capture_output=True, text=True, check=True
+        ).stdout
+
+    worker("2")
+    body = worker("3", "scrape")
+    line = next(
+        line for line in body.splitlines()
+        if line.startswith("http_requests_total{") and 'endpoint="system.CacheStats"' in line
+    )
+    assert line.endswith(" 5.0")
@@ -0,0 +1,32 @@
+"""Unit tests for reading create_all sections out of the SQL migrations."""
+import pytest
+
+from app.models import migration_ddl as module
+from app.models.migration_ddl import migration_ddl
+
+
+def test_migration_ddl_reads_only_the_marked_sections():
+    statement = migration_ddl("003_job_search_vector.sql").statement
+
+    assert statement.startswith("CREATE OR REPLACE FUNCTION job_search_vector(")
+    assert "CREATE TRIGGER company_search_vector_refresh" in statement
+    assert "btree_gin" not in statement
+    assert "Backfill" not in statement
+
+
+
+def test_migration_ddl_joins_marked_sections_and_escapes_percent():
+    statement = migration_ddl("010_job_partitioning.sql").statement
+
+    assert statement.startswith("CREATE SCHEMA IF NOT EXISTS archive;")
+    assert "FUNCTION job_archive_partition" in statement
+    assert "CREATE TABLE IF NOT EXISTS archive.job" in statement
+    assert "job_unpartitioned" not in statement
+    assert "format('CREATE TABLE %%I" in statement
+
+def test_migration_ddl_rejects_unterminated_section(tmp_path, monkeypatch):
+    (tmp_path / "999_broken.sql").write_text("-- create_all: begin\nSELECT 1;\n")
+    monkeypatch.setattr(module, "MIGRATIONS_DIR", tmp_path)
+
+    with pytest.raises(ValueError):
+        migration_ddl("999_broken.sql")
@@ -0,0 +1,130 @@
+"""Unit tests for keyset pagination helpers (cursor encoding, page assembly)."""
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.exceptions.custom_exceptions import InvalidCursorException
+from app.models.job import Job
+from app.repositories.job_repository import SORT_KEYS
+from app.repositories.pagination import build_page, fetch_keyset_rows, keyset_paginate, keyset_segments
+from app.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    offset_pagination,
+    resolve_per_page,
+)
+from sqlalchemy import select
+
+
+def test_cursor_round_trip_preserves_value_and_id():
+    posted = datetime(2024, 5, 1, 12, 30)
+    cursor = encode_cursor("-posted_date", posted, 42)
+    raw_value, row_id = decode_cursor(cursor, "-posted_date")
+    assert row_id == 42
+    assert SORT_KEYS["-posted_date"].parse(raw_value, cursor) == posted
+
+
+def test_cursor_round_trip_for_decimal_sort():
+    cursor = encode_cursor("salary_min", Decimal("85000.50"), 7)
+    raw_value, row_id = decode_cursor(cursor, "salary_min")
+    assert SORT_KEYS["salary_min"].parse(raw_value, cursor) == Decimal("85000.50")
+    assert row_id == 7
+
+
+def test_cursor_issued_for_other_sort_is_rejected():
+    cursor = encode_cursor("posted_date", datetime(2024, 1, 1), 1)
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(cursor, "-posted_date")
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", "e30", "WzEsMiwzXQ"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(cursor, "-posted_date")
+
+
+def test_cursor_with_unparseable_value_is_rejected():
+    cursor = encode_cursor("-posted_date", "yesterday", 1)
+    raw_value, _ = decode_cursor(cursor, "-posted_date")
+    with pytest.raises(InvalidCursorException):
+        SORT_KEYS["-posted_date"].parse(raw_value, cursor)
+
+
+def test_resolve_per_page_uses_config_bounds(app):
+    with app.app_context():
+        assert resolve_per_page(None) == app.config["DEFAULT_PAGE_SIZE"]
+        assert resolve_per_page(5) == 5
+        assert resolve_per_page(10_000) == app.config["MAX_PAGE_SIZE"]
+
+
+def test_build_page_trims_lookahead_row_and_sets_next_cursor():
+    rows = [
+        SimpleNamespace(id=i, posted_date=datetime(2024, 1, 10 - i)) for i in range(1, 4)
+    ]
+    page = build_page(rows, SORT_KEYS["-posted_date"], per_page=2)
+    assert page.items == rows[:2]
+    assert page.has_next
+    raw_value, row_id = decode_cursor(page.next_cursor, "-posted_date")
+    assert row_id == 2
+    assert raw_value == rows[1].posted_date.isoformat()
+
+
+def test_build_page_without_lookahead_row_is_last_page():
+    rows = [SimpleNamespace(id=1, posted_date=datetime(2024, 1, 1))]
+    page = build_page(rows, SORT_KEYS["-posted_date"], per_page=2)
+    assert not page.has_next
+    assert page.metadata["next_cursor"] is None
+
+
+def test_keyset_paginate_uses_row_comparison_and_lookahead_limit():
+    cursor = encode_cursor("-posted_date", datetime(2024, 1, 1), 10)
+    stmt = keyset_paginate(select(Job), SORT_KEYS["-posted_date"], 20, cursor)
+    sql = str(stmt)
+    assert "(job.posted_date, job.id) < (" in sql
+    assert "ORDER BY job.posted_date DESC, job.id DESC" in sql
+    assert stmt._limit == 21
+
+
+def test_keyset_segments_list_null_salaries_after_the_others():
+    present, nulls = keyset_segments(select(Job), SORT_KEYS["-salary_min"])
+    assert "job.salary_min IS NOT NULL" in str(present)
+    assert "ORDER BY job.salary_min DESC, job.id DESC" in str(present)
+    assert "job.salary_min IS NULL" in str(nulls)
+    assert "ORDER BY job.id DESC" in str(nulls)
+
+
+def test_keyset_segments_cursor_in_the_null_segment_skips_the_others():
+    cursor = encode_cursor("salary_min", None, 10)
+    (nulls,) = keyset_segments(select(Job), SORT_KEYS["salary_min"], cursor)
+    assert "job.salary_min IS NULL AND job.id > " in str(nulls)
+
+
+def test_fetch_keyset_rows_reads_later_segments_only_when_short():
+    fetched = []
+
+    def fetch(segment):
+        fetched.append(segment._limit)
+        return ["row"] * min(segment._limit, 3)
+
+    segments = keyset_segments(select(Job), SORT_KEYS["salary_min"])
+    assert len(fetch_keyset_rows(segments, 2, fetch)) == 3
+    assert fetched == [3]
+    fetched.clear()
+    assert len(fetch_keyset_rows(segments, 4, fetch)) == 5
+    assert fetched == [5, 2]
+
+
+def test_offset_pagination_metadata_for_middle_page():
+    meta = offset_pagination(page=2, per_page=10, total=25)
+    assert meta["pages"] == 3
+    assert meta["has_prev"] and meta["has_next"]
+    assert (meta["prev_num"], meta["next_num"]) == (1, 3)
+
+
+def test_offset_pagination_metadata_for_no_results():
+    meta = offset_pagination(page=1, per_page=10, total=0)
+    assert meta["pages"] == 0
+    assert not meta["has_prev"] and not meta["has_next"]
+    assert meta["next_num"] is None
@@ -0,0 +1,58 @@
+"""Unit tests for PartitionService with a mocked PartitionRepository."""
+from datetime import date, datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services import partition_service
+from app.services.partition_service import PartitionService, add_months
+
+
+@pytest.fixture
+def mock_partition_repository():
+    repository = MagicMock()
+    repository.create_partition.return_value = True
+    return repository
+
+
+@pytest.fixture
+def service(app, mock_partition_repository, monkeypatch):
+    monkeypatch.setattr(partition_service, "utc_now", lambda: datetime(2024, 11, 14, 9, tzinfo=timezone.utc))
+    with app.app_context():
+        yield PartitionService(partition_repository=mock_partition_repository)
+
+
+def test_add_months_crosses_year_boundaries():
+    assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+
+
+def test_maintain_creates_this_month_through_months_ahead(app, service, mock_partition_repository):
+    mock_partition_repository.create_partition.side_effect = [False, True, True, True]
+    assert service.maintain() == ["job_p202412", "job_p202501", "job_p202502"]
+    assert [c.args[0] for c in mock_partition_repository.create_partition.call_args_list] == [
+        date(2024, 11, 1), date(2024, 12, 1), date(2025, 1, 1), date(2025, 2, 1),
+    ]
+
+
+def test_archive_moves_months_that_ended_before_the_cutoff(service, mock_partition_repository, monkeypatch):
+    cache = MagicMock()
+    monkeypatch.setattr(partition_service, "entity_cache", cache)
+    mock_partition_repository.find_partitions.return_value = [
+        ("job_p202401", date(2024, 1, 1)),
+        ("job_p202402", date(2024, 2, 1)),
+        ("job_p202403", date(2024, 3, 1)),
+    ]
+    assert service.archive(date(2024, 3, 1)) == ["job_p202401", "job_p202402"]
+    assert [c.args[0] for c in mock_partition_repository.archive_partition.call_args_list] == [
+        "job_p202401", "job_p202402",
+    ]
+    cache.clear.assert_called_once_with()
+
+
+def test_archive_with_nothing_old_enough_keeps_the_cache(service, mock_partition_repository, monkeypatch):
+    cache = MagicMock()
+    monkeypatch.setattr(partition_service, "entity_cache", cache)
+    mock_partition_repository.find_partitions.return_value = [("job_p202403", date(2024, 3, 1))]
+    assert service.archive(date(2024, 3, 31)) == []
+    cache.clear.assert_not_called()
@@ -0,0 +1,77 @@
+"""Unit tests for the instrumented connection pool and engine options."""
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Flask
+from sqlalchemy import exc
+from sqlalchemy.pool import NullPool
+
+from app.utils.pool_metrics import InstrumentedQueuePool, pool_stats, use_instrumented_pool
+from config import Config, engine_options
+
+
+@pytest.fixture
+def pool():
+    return InstrumentedQueuePool(MagicMock, pool_size=1, max_overflow=1, timeout=0.01)
+
+
+def test_pool_counts_checkouts_connects_overflow_and_timeouts(pool):
+    first = pool.connect()
+    second = pool.connect()
+    stats = pool_stats(pool)
+    assert (stats["checked_out"], stats["overflow"], stats["connects"]) == (2, 1, 2)
+
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    first.close()
+    second.close()
+    pool.connect().close()
+
+    stats = pool_stats(pool)
+    assert stats["pool_class"] == "InstrumentedQueuePool"
+    assert (stats["checkouts"], stats["waits"], stats["timeouts"]) == (3, 1, 1)
+    assert (stats["checked_out"], stats["checked_in"], stats["overflow"]) == (0, 1, 0)
+    assert sum(bucket["count"] for bucket in stats["checkout_ms_buckets"]) == 3
+    assert stats["checkout_ms_buckets"][-1]["le"] is None
+    assert stats["checkout_ms_max"] >= stats["checkout_ms_avg"] > 0
+
+
+def test_recreated_pool_keeps_instrumentation(pool):
+    pool.connect().close()
+    recreated = pool.recreate()
+    assert isinstance(recreated, InstrumentedQueuePool)
+    assert recreated.metrics()["checkouts"] == 0
+
+
+def test_pool_stats_of_other_pool_classes():
+    stats = pool_stats(NullPool(MagicMock))
+    assert stats["pool_class"] == "NullPool" and "checkouts" not in stats
+
+
+def test_use_instrumented_pool_copies_config_options():
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    use_instrumented_pool(app)
+    assert app.config["SQLALCHEMY_ENGINE_OPTIONS"]["poolclass"] is InstrumentedQueuePool
+    assert "poolclass" not in Config.SQLALCHEMY_ENGINE_OPTIONS
+
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"poolclass": NullPool}
+    use_instrumented_pool(app)
+    assert app.config["SQLALCHEMY_ENGINE_OPTIONS"]["poolclass"] is NullPool
+
+
+def test_engine_options_from_environment(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    options = engine_options("postgresql://localhost/db", pool_size=5, max_overflow=3)
+    assert options["pool_size"] == 20 and options["max_overflow"] == 3
+    assert options["pool_pre_ping"] is False
+    assert "connect_args" not in options
+
+
+def test_pgbouncer_mode_disables_psycopg_prepared_statements(monkeypatch):
+    monkeypatch.setenv("DB_PGBOUNCER", "true")
+    options = engine_options("postgresql+psycopg://localhost/db")
+    assert options["connect_args"] == {"prepare_threshold": None}
+    # psycopg2 never prepares statements server-side.
+    assert "connect_args" not in engine_options("postgresql+psycopg2://localhost/db")
@@ -0,0 +1,56 @@
+"""Unit tests for the short-lived QueryCache."""
+from unittest.mock import MagicMock
+
+from flask import Flask
+
+from app.cache.backends import LRUCacheBackend, NullCacheBackend
+from app.cache.query_cache import QueryCache
+
+
+def _app(ttl):
+    app = Flask(__name__)
+    app.config.update(TEST_CACHE_TTL=ttl, TEST_CACHE_MAX_SIZE=10)
+    return app
+
+
+def test_get_or_compute_caches_results_per_key():
+    app = _app(30)
+    cache = QueryCache("test_cache", "TEST_CACHE", app)
+    compute = MagicMock(side_effect=[{"count": 1}, {"count": 2}])
+    with app.app_context():
+        assert isinstance(cache.backend, LRUCacheBackend)
+        assert cache.get_or_compute(("a", 1), compute) == {"count": 1}
+        assert cache.get_or_compute(("a", 1), compute) == {"count": 1}
+        assert cache.get_or_compute(("a", 2), compute) == {"count": 2}
+        stats = cache.stats()
+    assert compute.call_count == 2
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 2)
+
+
+def test_cached_results_are_copies():
+    app = _app(30)
+    cache = QueryCache("test_cache", "TEST_CACHE", app)
+    with app.app_context():
+        first = cache.get_or_compute("key", lambda: {"items": [1]})
+        first["items"].append(2)
+        assert cache.get_or_compute("key", lambda: None) == {"items": [1]}
+
+
+def test_zero_ttl_disables_caching():
+    app = _app(0)
+    cache = QueryCache("test_cache", "TEST_CACHE", app)
+    compute = MagicMock(return_value=5)
+    with app.app_context():
+        assert isinstance(cache.backend, NullCacheBackend)
+        cache.get_or_compute("key", compute)
+        cache.get_or_compute("key", compute)
+    assert compute.call_count == 2
+
+
+def test_outside_app_context_computes_every_time():
+    cache = QueryCache("test_cache", "TEST_CACHE")
+    compute = MagicMock(return_value=5)
+    assert cache.get_or_compute("key", compute) == 5
+    assert cache.get_or_compute("key", compute) == 5
+    assert compute.call_count == 2
+    assert cache.stats()["hits"] == 0
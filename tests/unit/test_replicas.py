@@ -0,0 +1,95 @@
+"""Unit tests for replica selection and bind registration (no database)."""
+from flask import Flask
+from sqlalchemy.exc import OperationalError
+
+from app.utils import replicas
+from app.utils.replicas import ReplicaSet, Replicas
+
+
+class FakeEngine:
+    def __init__(self, lag=0.0, fail=False):
+        self.lag = lag
+        self.fail = fail
+        self.checks = 0
+
+    def connect(self):
+        self.checks += 1
+        if self.fail:
+            raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement):
+        return self
+
+    def scalar_one(self):
+        return self.lag
+
+
+def _replica_set(**overrides):
+    options = {"max_lag": 5, "check_interval": 10, "retry_after": 30}
+    options.update(overrides)
+    return ReplicaSet(["replica_0", "replica_1"], **options)
+
+
+def test_choose_alternates_between_healthy_replicas():
+    engines = {"replica_0": FakeEngine(), "replica_1": FakeEngine()}
+    replica_set = _replica_set()
+    assert [replica_set.choose(engines) for _ in range(4)] == [
+        "replica_0", "replica_1", "replica_0", "replica_1",
+    ]
+    # Lag is checked once per check_interval, not on every choice.
+    assert engines["replica_0"].checks == 1
+
+
+def test_lagging_replica_is_skipped():
+    engines = {"replica_0": FakeEngine(lag=12.5), "replica_1": FakeEngine(lag=0.2)}
+    replica_set = _replica_set()
+    assert {replica_set.choose(engines) for _ in range(3)} == {"replica_1"}
+    assert replica_set.status()[0] == {"bind": "replica_0", "up": True, "lag_seconds": 12.5}
+
+
+def test_unreachable_replica_sits_out_until_retry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(replicas.time, "monotonic", lambda: now[0])
+    engines = {"replica_0": FakeEngine(fail=True), "replica_1": FakeEngine(fail=True)}
+    replica_set = _replica_set()
+
+    assert replica_set.choose(engines) is None
+    assert [status["up"] for status in replica_set.status()] == [False, False]
+
+    engines["replica_0"].fail = False
+    now[0] += 10
+    assert replica_set.choose(engines) is None  # still sitting out
+    now[0] += 30
+    assert replica_set.choose(engines) == "replica_0"
+
+
+def test_init_app_registers_replicas_as_binds_with_primary_options():
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_REPLICAS=["postgresql://replica-a/db", "postgresql://replica-b/db"],
+        SQLALCHEMY_ENGINE_OPTIONS={"pool_size": 3},
+        REPLICA_MAX_LAG=2,
+        REPLICA_CHECK_INTERVAL=10,
+        REPLICA_RETRY_AFTER=30,
+    )
+    Replicas(app)
+    assert app.config["SQLALCHEMY_BINDS"] == {
+        "replica_0": {"pool_size": 3, "url": "postgresql://replica-a/db"},
+        "replica_1": {"pool_size": 3, "url": "postgresql://replica-b/db"},
+    }
+    assert app.extensions["replicas"].keys == ["replica_0", "replica_1"]
+
+
+def test_init_app_without_replicas_changes_nothing():
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_REPLICAS=[])
+    Replicas(app)
+    assert "SQLALCHEMY_BINDS" not in app.config
+    assert "replicas" not in app.extensions
@@ -0,0 +1,65 @@
+"""Unit tests for the migration runner's statement splitter and directives."""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "run_migrations", Path(__file__).resolve().parents[2] / "migrations" / "run_migrations.py"
+)
+run_migrations = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(run_migrations)
+
+
+def test_split_statements_ignores_semicolons_in_strings_comments_and_dollar_quotes():
+    sql = """
+-- leading comment; not a statement
+CREATE TABLE t (note TEXT DEFAULT 'a;b''c;');
+/* block; /* nested; */ still a comment; */
+CREATE FUNCTION f() RETURNS trigger AS $$
+BEGIN
+    NEW.note := 'x;y';
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+DO $body$ BEGIN PERFORM 1; END $body$;
+SELECT "odd;name" FROM t
+"""
+    statements = run_migrations.split_statements(sql)
+
+    assert len(statements) == 4
+    assert statements[0].endswith("DEFAULT 'a;b''c;')")
+    assert statements[1].startswith("/* block;")
+    assert statements[1].endswith("$$ LANGUAGE plpgsql")
+    assert statements[2] == "DO $body$ BEGIN PERFORM 1; END $body$"
+    assert statements[3] == 'SELECT "odd;name" FROM t'
+
+
+def test_split_statements_drops_comment_only_chunks():
+    assert run_migrations.split_statements("-- only a comment\n;\n/* and this */;") == []
+
+
+def test_split_statements_rejects_unterminated_dollar_quote():
+    with pytest.raises(run_migrations.MigrationError):
+        run_migrations.split_statements("DO $$ BEGIN PERFORM 1; END;")
+
+
+def test_parse_directives_defaults():
+    assert run_migrations.parse_directives("CREATE TABLE t (id INT);") == run_migrations.DEFAULT_OPTIONS
+
+
+def test_parse_directives_reads_leading_comment_lines_only():
+    sql = """-- migrate: no-transaction
+-- Builds an index without blocking writes.
+-- migrate: lock_timeout=2s, statement_timeout=30min, retries=5
+CREATE INDEX CONCURRENTLY idx ON t (id);
+-- migrate: retries=9
+"""
+    options = run_migrations.parse_directives(sql)
+
+    assert options == {"transaction": False, "lock_timeout": "2s", "statement_timeout": "30min", "retries": 5}
+
+
+def test_parse_directives_rejects_unknown_directive():
+    with pytest.raises(run_migrations.MigrationError, match="lock_timout"):
+        run_migrations.parse_directives("-- migrate: lock_timout=2s\nSELECT 1;")
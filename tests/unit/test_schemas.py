@@ -7,7 +7,8 @@ from marshmallow import ValidationError
 from app.models.company import Company
 from app.models.job import Job
 from app.schemas.company_schema import CompanyCreateSchema, CompanyUpdateSchema
-from app.schemas.job_schema import JobCreateSchema, JobUpdateSchema
+from app.schemas.fieldset_schema import field_paths
+from app.schemas.job_schema import JobCreateSchema, JobFieldsArgsSchema, JobSchema, JobUpdateSchema
 
 
 def test_models_import():
@@ -87,3 +88,22 @@ def test_job_update_schema_salary_validators():
     schema = JobUpdateSchema()
     with pytest.raises(ValidationError):
         schema.load({"salary_min": 100, "salary_max": 50})
+
+
+def test_job_fields_args_parse_sparse_fieldset():
+    result = JobFieldsArgsSchema().load({"fields": "id, title,company.name,title"})
+    assert result == {"fieldset": ("id", "title", "company.name")}
+    assert JobFieldsArgsSchema().load({}) == {}
+
+
+@pytest.mark.parametrize("value", ["id,salary", "company.website", ","])
+def test_job_fields_args_reject_unknown_or_empty_fields(value):
+    with pytest.raises(ValidationError) as exc_info:
+        JobFieldsArgsSchema().load({"fields": value})
+    assert "fields" in exc_info.value.messages
+
+
+def test_field_paths_include_nested_fields():
+    paths = field_paths(JobSchema())
+    assert {"description", "company", "company.name"} <= paths
+    assert "company.website" not in paths
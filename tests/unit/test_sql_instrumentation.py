@@ -0,0 +1,94 @@
+"""Unit tests for per-request SQL instrumentation, against an in-memory SQLite engine."""
+import logging
+
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, text
+
+from app.utils.sql_instrumentation import (
+    QueryStats,
+    SqlInstrumentation,
+    capture_queries,
+    statement_shape,
+)
+
+
+@pytest.fixture
+def engine():
+    return create_engine("sqlite://")
+
+
+@pytest.fixture
+def client(engine):
+    app = Flask(__name__)
+    app.config.update(SQL_INSTRUMENTATION=True, SERVER_TIMING_HEADER=True, SQL_N_PLUS_ONE_THRESHOLD=3)
+    SqlInstrumentation(app)
+
+    @app.route("/items/<int:count>")
+    def items(count):
+        with engine.connect() as connection:
+            for item_id in range(count):
+                connection.execute(text("SELECT :id"), {"id": item_id})
+        return "ok"
+
+    return app.test_client()
+
+
+def test_statement_shape_collapses_whitespace_and_in_lists():
+    assert statement_shape("SELECT *\n  FROM job WHERE id IN (%(id_1_1)s, %(id_1_2)s)") == (
+        "SELECT * FROM job WHERE id IN (?)"
+    )
+    assert statement_shape("SELECT * FROM job WHERE id IN (%(id_1_1)s)") == "SELECT * FROM job WHERE id IN (?)"
+
+
+def test_query_stats_track_slowest_and_repeated_selects():
+    stats = QueryStats()
+    for elapsed_ms in (1.0, 3.0, 2.0):
+        stats.record("SELECT 1", elapsed_ms)
+    stats.record("UPDATE job SET title = 'x'", 0.5)
+
+    assert stats.count == 4 and stats.total_ms == 6.5
+    assert stats.slowest == (3.0, "SELECT 1")
+    assert stats.repeated(3) == [("SELECT 1", 3)]
+    assert stats.repeated(4) == []
+    assert stats.server_timing() == 'db;dur=6.50;desc="4 queries", db-slowest;dur=3.00'
+
+
+def test_request_gets_server_timing_header_and_log_line(client, caplog):
+    with caplog.at_level(logging.INFO, logger="app.sql"):
+        response = client.get("/items/2")
+
+    assert response.headers["Server-Timing"].startswith('db;dur=')
+    assert 'desc="2 queries"' in response.headers["Server-Timing"]
+    record = caplog.records[-1]
+    assert record.levelno == logging.INFO
+    assert "path=/items/2" in record.getMessage() and "queries=2" in record.getMessage()
+    assert record.sql["n_plus_one"] == 0
+
+
+def test_repeated_select_shape_is_logged_as_likely_n_plus_one(client, caplog):
+    with caplog.at_level(logging.INFO, logger="app.sql"):
+        client.get("/items/4")
+
+    record = caplog.records[-1]
+    assert record.levelno == logging.WARNING
+    assert "likely N+1" in record.getMessage()
+    assert record.sql["repeated_sql"] == [{"sql": "SELECT ?", "runs": 4}]
+
+
+def test_capture_queries_counts_statements_outside_requests(engine, client):
+    with capture_queries() as stats:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        client.get("/items/2")
+    assert stats.count == 3
+    assert stats.statements[0] == "SELECT 1"
+
+
+def test_failed_statement_does_not_skew_later_timings(engine, client):
+    with capture_queries() as stats, engine.connect() as connection:
+        with pytest.raises(Exception):
+            connection.execute(text("SELECT * FROM missing_table"))
+        connection.execute(text("SELECT 1"))
+        assert connection.info["query_started"] == []
+    assert stats.count == 1
@@ -0,0 +1,100 @@
+"""Unit tests for StatsService with a mocked JobStatsRepository."""
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.exceptions.custom_exceptions import CompanyNotFoundException
+from app.models.enums import ExperienceLevel
+from app.services import stats_service
+from app.services.stats_service import StatsService, histogram_percentiles
+
+
+@pytest.fixture
+def mock_stats_repository():
+    repository = MagicMock()
+    repository.job_counts.return_value = (0, 0)
+    repository.postings_per_day.return_value = []
+    repository.postings_per_week.return_value = []
+    repository.salary_histogram.return_value = []
+    return repository
+
+
+@pytest.fixture
+def mock_company_repository():
+    return MagicMock()
+
+
+@pytest.fixture
+def service(app, mock_stats_repository, mock_company_repository, monkeypatch):
+    # Thursday 2024-03-14
+    monkeypatch.setattr(stats_service, "utc_now", lambda: datetime(2024, 3, 14, 9, tzinfo=timezone.utc))
+    with app.app_context():
+        yield StatsService(
+            stats_repository=mock_stats_repository, company_repository=mock_company_repository
+        )
+
+
+def test_histogram_percentiles_interpolate_within_buckets():
+    buckets = [(Decimal("50000"), 2), (Decimal("60000"), 6), (Decimal("90000"), 2)]
+    assert histogram_percentiles(buckets, 10000, [10, 50, 90, 100]) == {
+        "p10": Decimal("55000.00"),
+        "p50": Decimal("65000.00"),
+        "p90": Decimal("95000.00"),
+        "p100": Decimal("100000.00"),
+    }
+
+
+def test_job_stats_fill_empty_periods(service, mock_stats_repository):
+    mock_stats_repository.job_counts.return_value = (7, 5)
+    mock_stats_repository.postings_per_day.return_value = [(date(2024, 3, 12), 3)]
+    mock_stats_repository.postings_per_week.return_value = [(date(2024, 3, 4), 4)]
+
+    stats = service.get_job_stats(days=3, weeks=2)
+
+    mock_stats_repository.postings_per_day.assert_called_once_with(date(2024, 3, 12), None)
+    mock_stats_repository.postings_per_week.assert_called_once_with(date(2024, 3, 4), None)
+    assert (stats["total_jobs"], stats["active_jobs"]) == (7, 5)
+    assert stats["postings_per_day"] == [
+        {"period": date(2024, 3, 12), "count": 3},
+        {"period": date(2024, 3, 13), "count": 0},
+        {"period": date(2024, 3, 14), "count": 0},
+    ]
+    assert stats["postings_per_week"] == [
+        {"period": date(2024, 3, 4), "count": 4},
+        {"period": date(2024, 3, 11), "count": 0},
+    ]
+
+
+def test_salary_percentiles_per_experience_level(app, service, mock_stats_repository, monkeypatch):
+    monkeypatch.setitem(app.config, "JOB_STATS_PERCENTILES", [50])
+    mock_stats_repository.salary_histogram.return_value = [
+        (ExperienceLevel.ENTRY, Decimal("40000"), 4),
+        (ExperienceLevel.MID, Decimal("60000"), 1),
+        (ExperienceLevel.MID, Decimal("70000"), 1),
+    ]
+    stats = service.get_job_stats(days=1, weeks=1)
+    assert stats["salary_percentiles"] == [
+        {"experience_level": ExperienceLevel.ENTRY, "jobs": 4, "percentiles": {"p50": Decimal("42500.00")}},
+        {"experience_level": ExperienceLevel.MID, "jobs": 2, "percentiles": {"p50": Decimal("65000.00")}},
+    ]
+
+
+def test_company_stats_are_scoped_to_the_company(service, mock_stats_repository, mock_company_repository):
+    mock_company_repository.exists.return_value = True
+    stats = service.get_company_stats(3, days=1, weeks=1)
+    assert stats["company_id"] == 3
+    mock_stats_repository.job_counts.assert_called_once_with(3)
+    mock_stats_repository.salary_histogram.assert_called_once_with(3)
+
+
+def test_company_stats_for_unknown_company_raise(service, mock_company_repository):
+    mock_company_repository.exists.return_value = False
+    with pytest.raises(CompanyNotFoundException):
+        service.get_company_stats(99, days=1, weeks=1)
+
+
+def test_rebuild_delegates_to_repository(service, mock_stats_repository):
+    mock_stats_repository.rebuild.return_value = {"job_daily_stats": 2}
+    assert service.rebuild() == {"job_daily_stats": 2}
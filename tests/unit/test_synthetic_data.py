@@ -0,0 +1,92 @@
+"""Unit tests for the synthetic data generator behind ``flask seed`` (no database)."""
+from collections import Counter
+from datetime import date
+
+import pytest
+
+from app.models.enums import ExperienceLevel, JobType, RemoteOption
+from app.utils.synthetic_data import (
+    COMPANY_COLUMNS,
+    JOB_COLUMNS,
+    CopyStream,
+    SearchVectors,
+    SyntheticData,
+    _prefetched,
+)
+
+AS_OF = date(2024, 3, 14)
+
+
+def _jobs(seed=7, count=2000, companies=50):
+    data = SyntheticData(seed, AS_OF)
+    rows = "".join(data.jobs(count, list(range(1, companies + 1)), lambda *_: "'x':1"))
+    return [dict(zip(JOB_COLUMNS, line.split("\t"))) for line in rows.splitlines()]
+
+
+def test_same_seed_gives_the_same_rows():
+    assert _jobs(seed=7) == _jobs(seed=7)
+    assert _jobs(seed=7) != _jobs(seed=8)
+
+
+def test_companies_have_unique_numbered_names():
+    rows = "".join(SyntheticData(1, AS_OF).companies(3, first_number=41)).splitlines()
+    assert len(rows) == 3
+    fields = [row.split("\t") for row in rows]
+    assert all(len(row) == len(COMPANY_COLUMNS) for row in fields)
+    assert [row[0].rsplit(" ", 1)[1] for row in fields] == ["41", "42", "43"]
+
+
+def test_job_rows_satisfy_the_create_schema_rules():
+    for row in _jobs():
+        assert len(row) == len(JOB_COLUMNS)
+        JobType(row["job_type"])
+        ExperienceLevel(row["experience_level"])
+        RemoteOption(row["remote_option"])
+        if row["salary_min"] == "\\N":
+            assert row["salary_max"] == "\\N"
+        else:
+            assert 0 < int(row["salary_min"]) <= int(row["salary_max"])
+        assert row["posted_date"] < row["expiry_date"]
+        assert row["posted_date"] < AS_OF.isoformat()
+        if row["expiry_date"] < AS_OF.isoformat():
+            assert row["is_active"] == "f"
+
+
+def test_jobs_per_company_are_heavy_tailed():
+    per_company = Counter(row["company_id"] for row in _jobs(count=5000, companies=100)).most_common()
+    top_tenth = sum(jobs for _, jobs in per_company[:10])
+    assert top_tenth > 5000 * 0.3
+
+
+def test_enum_distributions_follow_their_weights():
+    job_types = Counter(row["job_type"] for row in _jobs(count=5000))
+    assert job_types["FULL_TIME"] > job_types["CONTRACT"] > job_types["INTERNSHIP"]
+
+
+def test_search_vectors_weight_and_shift_each_piece():
+    vectors = SearchVectors(
+        {
+            "Senior Data Engineer": "'data':2 'engin':3 'senior':1",
+            "Acme Labs": "'acm':1 'lab':2",
+            "Berlin": "'berlin':1",
+            "We ship.": "'ship':2",
+        },
+        {5: "Acme Labs"},
+    )
+    assert vectors("Senior Data Engineer", 5, "Berlin", "We ship.") == (
+        "'data':2A 'engin':3A 'senior':1A 'acm':4B 'lab':5B 'berlin':6C 'ship':8D"
+    )
+
+
+def test_copy_stream_reads_chunks_in_pieces():
+    stream = CopyStream(iter(["ab", "cde"]))
+    assert [stream.read(2), stream.read(2), stream.read(2), stream.read(2)] == [b"ab", b"cd", b"e", b""]
+
+
+def test_prefetched_passes_generator_errors_to_the_consumer():
+    def chunks():
+        yield "a"
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        list(_prefetched(chunks()))
@@ -0,0 +1,31 @@
+"""Unit tests for the Celery worker entry point (no database needed)."""
+from types import SimpleNamespace
+
+import pytest
+
+import app
+import app.tasks
+
+
+@pytest.fixture
+def built_configs(monkeypatch):
+    names = []
+
+    def fake_create_app(config_name="development"):
+        names.append(config_name)
+        return SimpleNamespace(extensions={"celery": "celery-app"})
+
+    monkeypatch.setattr(app, "create_app", fake_create_app)
+    return names
+
+
+def test_worker_app_defaults_to_production_config(built_configs, monkeypatch):
+    monkeypatch.delenv("FLASK_CONFIG", raising=False)
+    assert app.tasks.celery == "celery-app"
+    assert built_configs == ["production"]
+
+
+def test_worker_app_config_comes_from_flask_config(built_configs, monkeypatch):
+    monkeypatch.setenv("FLASK_CONFIG", "development")
+    app.tasks.celery
+    assert built_configs == ["development"]
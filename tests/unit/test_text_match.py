@@ -0,0 +1,34 @@
+"""Unit tests for substring/trigram match expressions."""
+from sqlalchemy.dialects import postgresql
+
+from app.models.company import Company
+from app.models.job import Job
+from app.repositories.job_repository import job_filter_clauses
+from app.repositories.text_match import contains, escape_like, fuzzy_match
+
+
+def _sql(clause):
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+def test_escape_like_escapes_wildcards_and_escape_char():
+    assert escape_like("50%_off\\") == "50\\%\\_off\\\\"
+
+
+def test_contains_is_case_insensitive_substring_match():
+    clause = contains(Company.location, "san fran")
+    assert "company.location ILIKE" in _sql(clause)
+    assert clause.right.value == "%san fran%"
+
+
+def test_fuzzy_match_puts_indexed_column_on_the_left():
+    sql = _sql(fuzzy_match(Job.location, "Nwe York"))
+    assert sql.startswith("job.location %")
+    assert "%>" in sql
+
+
+def test_job_filter_clauses_switch_to_fuzzy_matching():
+    substring = job_filter_clauses(location="York", title="Eng")
+    fuzzy = job_filter_clauses(location="York", title="Eng", fuzzy=True)
+    assert all("ILIKE" in _sql(clause) for clause in substring)
+    assert all("%>" in _sql(clause) for clause in fuzzy)
@@ -0,0 +1,81 @@
+"""Unit tests for the UnitOfWork transaction boundary (session mocked)."""
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.repositories import unit_of_work
+from app.repositories.unit_of_work import (
+    UnitOfWork,
+    commit,
+    in_unit_of_work,
+    on_commit,
+    rollback,
+    transactional,
+)
+
+
+@pytest.fixture
+def session(app, monkeypatch):
+    db = MagicMock()
+    db.session.info = {}
+    monkeypatch.setattr(unit_of_work, "db", db)
+    with app.app_context():
+        yield db.session
+
+
+def test_repository_commit_outside_unit_of_work_commits(session):
+    commit()
+    rollback()
+    session.commit.assert_called_once()
+    session.rollback.assert_called_once()
+    session.flush.assert_not_called()
+
+
+def test_nested_units_flush_and_commit_once_at_the_outermost_exit(session):
+    with UnitOfWork():
+        with UnitOfWork():
+            assert in_unit_of_work()
+            commit()
+            rollback()
+        session.commit.assert_not_called()
+        commit()
+    assert session.flush.call_count == 2
+    session.commit.assert_called_once()
+    session.rollback.assert_not_called()
+    assert not in_unit_of_work()
+
+
+def test_on_commit_callbacks_run_after_commit_and_are_dropped_on_error(session):
+    calls = []
+    with UnitOfWork():
+        on_commit(lambda: calls.append(session.commit.called))
+    assert calls == [True]
+
+    with pytest.raises(ValueError):
+        with UnitOfWork():
+            on_commit(lambda: calls.append("never"))
+            raise ValueError
+    session.rollback.assert_called_once()
+    assert calls == [True]
+    on_commit(lambda: calls.append("now"))
+    assert calls == [True, "now"]
+
+
+def test_transactional_wraps_call_in_unit_of_work(session):
+    @transactional
+    def operation():
+        assert in_unit_of_work()
+        return 42
+
+    assert operation() == 42
+    session.commit.assert_called_once()
+
+
+def test_savepoint_uses_nested_transaction(session):
+    with UnitOfWork() as uow:
+        uow.savepoint()
+    session.begin_nested.assert_called_once()
+
+
+def test_in_unit_of_work_is_false_without_app_context():
+    assert not in_unit_of_work()